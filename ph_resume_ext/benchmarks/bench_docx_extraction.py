@@ -0,0 +1,106 @@
+"""Benchmark DOCX ingestion: docx2pdf + PDF reading and python-docx vs the streaming OOXML extractor.
+
+Run with: python benchmarks/bench_docx_extraction.py [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from docx import Document
+
+from ph_resume_ext.tools.doc_extractor_tool import iter_docx_text
+from ph_resume_ext.tools.pdf_reader_tool import PDFReaderTool
+
+TEMPLATES = os.path.join(os.path.dirname(__file__), "..", "src", "ph_resume_ext", "resume", "templates")
+
+
+def python_docx_text(file_path):
+    """The previous ExtractTextTool implementation, built on the python-docx object model"""
+    doc = Document(file_path)
+    texts = []
+    for para in doc.paragraphs:
+        if para.text.strip():
+            texts.append(para.text.strip())
+    for table in doc.tables:
+        for row in table.rows:
+            row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+            if row_text:
+                texts.append(" | ".join(row_text))
+    return "\n".join(texts)
+
+
+def docx2pdf_text(file_path):
+    """The previous flow: convert through a word processor, then read the PDF"""
+    from docx2pdf import convert
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "converted.pdf")
+        convert(file_path, pdf_path)
+        return PDFReaderTool()._run(pdf_path)
+
+
+def streaming_text(file_path):
+    return "\n".join(iter_docx_text(file_path))
+
+
+def synthetic_docx(path, paragraphs, table_rows):
+    doc = Document()
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Paragraph {i}: led a team of engineers delivering data pipelines in Python and SQL.")
+    table = doc.add_table(rows=table_rows, cols=3)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"cell {r}.{c}"
+    doc.save(path)
+    return path
+
+
+def measure(fn, file_path, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(file_path)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = sorted(
+            os.path.join(TEMPLATES, f) for f in os.listdir(TEMPLATES) if f.endswith(".docx")
+        )
+        files.append(synthetic_docx(os.path.join(tmp, "synthetic-2k.docx"), 2000, 200))
+        files.append(synthetic_docx(os.path.join(tmp, "synthetic-20k.docx"), 20000, 2000))
+
+        engines = {"python-docx": python_docx_text, "streaming": streaming_text}
+        try:
+            import docx2pdf  # noqa: F401
+            engines = {"docx2pdf+pdf": docx2pdf_text, **engines}
+        except ImportError:
+            print("docx2pdf is not installed; the conversion path is not measured on this machine")
+
+        header = f"{'file':45} {'size KB':>8} " + " ".join(f"{name:>14}" for name in engines) + f" {'speedup':>8}"
+        print(header)
+        print("-" * len(header))
+        for file_path in files:
+            results = {}
+            for name, fn in engines.items():
+                try:
+                    results[name] = measure(fn, file_path, args.repeat)
+                except Exception as e:
+                    print(f"{name} failed on {os.path.basename(file_path)}: {e}")
+                    results[name] = float("nan")
+            slowest_old = max(v for k, v in results.items() if k != "streaming")
+            speedup = slowest_old / results["streaming"] if results["streaming"] else float("nan")
+            print(f"{os.path.basename(file_path):45} {os.path.getsize(file_path) / 1024:8.0f} "
+                  + " ".join(f"{results[name]:12.1f}ms" for name in engines)
+                  + f" {speedup:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Compare per-resume latency and token usage of the agentic crew and the direct single-call engine.
+
+Needs the same LLM credentials as a normal run (GEMINI_MODEL / GEMINI_API_KEY).
+Run with: python benchmarks/bench_engines.py [--engines crew,direct] [--limit N]
+"""
+import argparse
+import os
+
+from ph_resume_ext.extraction import extract_text
+from ph_resume_ext.field_extractor import confident_values, extract_fields
+from ph_resume_ext.main import ResumeFlow, format_stats_report
+from ph_resume_ext.type import Output_format
+
+TEMPLATES = os.path.join(os.path.dirname(__file__), "..", "src", "ph_resume_ext", "resume", "templates")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--engines", default="crew,direct")
+    parser.add_argument("--limit", type=int, default=0, help="Only use the first N resumes")
+    args = parser.parse_args()
+
+    files = sorted(f for f in os.listdir(TEMPLATES) if f.lower().endswith((".pdf", ".docx")))
+    if args.limit:
+        files = files[:args.limit]
+
+    flow = ResumeFlow()
+    flow.llm_stats = []
+    for file_name in files:
+        file_path = os.path.join(TEMPLATES, file_name)
+        text = extract_text(file_path)
+        prefilled = confident_values(extract_fields(text))
+        missing_fields = [f for f in Output_format.model_fields if f != "status" and f not in prefilled]
+        for engine in args.engines.split(","):
+            flow.state.engine = engine
+            flow.run_llm(file_name, file_path, text, prefilled, missing_fields)
+
+    print(f"\n{'resume':50} " + " ".join(f"{e + ' s':>10} {e + ' tok':>11}" for e in args.engines.split(",")))
+    for file_name in files:
+        row = {s.engine: s for s in flow.llm_stats if s.resume == file_name}
+        print(f"{file_name:50} " + " ".join(
+            f"{row[e].latency_s:10.2f} {row[e].total_tokens:11d}" if e in row else f"{'-':>10} {'-':>11}"
+            for e in args.engines.split(",")
+        ))
+    print()
+    print(format_stats_report(flow.llm_stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark the vectorised evaluation engine against the previous per-resume loop at large scale.
+
+Generates synthetic prediction/golden pairs in a temporary directory (per-file JSON and a
+results.jsonl sink), then times a full evaluation, a changed-only re-run after touching 1% of
+the predictions, and the legacy loop on a sample.
+
+Run with: python benchmarks/bench_evaluation.py [--pairs 100000] [--workers N]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from ph_resume_ext.evaluation import Evaluator, format_report
+
+SKILLS = [f"skill{i}" for i in range(400)] + ["Python", "SQL", "AWS", "Tableau", "Spark", "Excel"]
+
+
+def legacy_evaluate(pred_paths, golden_paths):
+    """The previous ResumeEvalFlow.evaluate loop, without the DataFrame and CSV at the end"""
+    def get_field(d, *names):
+        for name in names:
+            for k in d.keys():
+                if k.lower() == name.lower():
+                    return d[k]
+        return ""
+
+    def evaluate_field(pred, truth):
+        return int(pred.strip().lower() == truth.strip().lower())
+
+    def evaluate_skills(pred, truth):
+        pred_set = set([s.lower() for s in pred])
+        truth_set = set([s.lower() for s in truth])
+        tp = len(pred_set & truth_set)
+        precision = tp / len(pred_set) if pred_set else 0
+        recall = tp / len(truth_set) if truth_set else 0
+        return precision, recall, 2 * precision * recall / (precision + recall) if precision + recall else 0
+
+    golden_data = {}
+    for gfile in golden_paths:
+        with open(gfile, "r", encoding="utf-8") as f:
+            golden_data[os.path.splitext(os.path.basename(gfile))[0]] = json.load(f)
+    summary = []
+    for pfile in pred_paths:
+        name = os.path.splitext(os.path.basename(pfile))[0]
+        with open(pfile, "r", encoding="utf-8") as f:
+            pred = json.load(f)
+        truth = golden_data.get(name)
+        if not truth:
+            continue
+        summary.append((
+            evaluate_field(get_field(pred, "First_Name"), get_field(truth, "First_Name")),
+            evaluate_field(get_field(pred, "Last_Name"), get_field(truth, "Last_Name")),
+            evaluate_field(get_field(pred, "Email_Address", "email_address"), get_field(truth, "Email_Address", "email_address")),
+            *evaluate_skills(get_field(pred, "Skills", "skills", []), get_field(truth, "Skills", "skills", [])),
+        ))
+    return summary
+
+
+def generate(root, pairs, seed=0):
+    """Write pairs of golden records and slightly perturbed predictions, plus the same predictions as JSONL"""
+    rng = random.Random(seed)
+    pred_dir, golden_dir = os.path.join(root, "processed"), os.path.join(root, "golden")
+    os.makedirs(pred_dir)
+    os.makedirs(golden_dir)
+    with open(os.path.join(root, "results.jsonl"), "w", encoding="utf-8") as sink:
+        for i in range(pairs):
+            name = f"resume-{i:06d}"
+            first, last = f"First{i % 9973}", f"Last{i % 7919}"
+            skills = rng.sample(SKILLS, rng.randint(4, 14))
+            golden = {"First_Name": first, "Last_Name": last, "Email_Address": f"{first}.{last}@mail.com".lower(),
+                      "Skills": skills}
+            predicted_skills = skills[:rng.randint(2, len(skills))] + rng.sample(SKILLS, rng.randint(0, 3))
+            pred = {"status": "Success", "First_Name": first if rng.random() > 0.05 else first.upper() + "x",
+                    "Last_Name": last, "email_address": golden["Email_Address"], "skills": predicted_skills,
+                    "phone_number": "(555) 010-0000", "work_experience": {"Engineer": {"company": "Acme"}}}
+            with open(os.path.join(golden_dir, name + ".json"), "w", encoding="utf-8") as f:
+                json.dump(golden, f)
+            with open(os.path.join(pred_dir, name + ".json"), "w", encoding="utf-8") as f:
+                json.dump(pred, f, indent=4)
+            sink.write(json.dumps({"resume": name, "output": pred}) + "\n")
+    return pred_dir, golden_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--legacy-sample", type=int, default=10_000,
+                        help="pairs timed with the legacy loop; its time is extrapolated to --pairs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        started = time.perf_counter()
+        pred_dir, golden_dir = generate(root, args.pairs)
+        print(f"Generated {args.pairs} pairs in {time.perf_counter() - started:.1f}s\n")
+
+        state_path = os.path.join(root, "state.sqlite")
+        evaluator = Evaluator(pred_dir, golden_dir, state_path=state_path, max_workers=args.workers)
+        _, report = evaluator.run()
+        print(f"Full evaluation, per-file JSON, {args.workers} workers:\n{format_report(report)}\n")
+
+        for name in sorted(os.listdir(pred_dir))[::100]:
+            os.utime(os.path.join(pred_dir, name))
+        _, report = evaluator.run(changed_only=True)
+        print(f"Changed-only re-run after touching 1% of predictions:\n{format_report(report)}\n")
+
+        _, report = Evaluator(os.path.join(root, "results.jsonl"), golden_dir, max_workers=args.workers).run()
+        print(f"Full evaluation, results.jsonl sink:\n{format_report(report)}\n")
+
+        sample = sorted(os.listdir(pred_dir))[:args.legacy_sample]
+        started = time.perf_counter()
+        legacy_evaluate([os.path.join(pred_dir, name) for name in sample],
+                        [os.path.join(golden_dir, name) for name in sample])
+        elapsed = time.perf_counter() - started
+        print(f"Legacy loop: {elapsed:.2f}s for {len(sample)} pairs "
+              f"(~{elapsed * args.pairs / max(1, len(sample)):.1f}s extrapolated to {args.pairs})")
+
+
+if __name__ == "__main__":
+    main()
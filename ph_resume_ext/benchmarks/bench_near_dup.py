@@ -0,0 +1,116 @@
+"""Lookup latency, recall and false matches of the near-duplicate index as it grows.
+
+Fills a NearDuplicateIndex with --count synthetic resumes (text only, no files or LLM), then
+looks up --queries re-submitted copies of stored resumes (a new phone number plus an extra
+bullet or a changed location) and as many unrelated new resumes. Recall is the share of
+copies whose best match is their original; false matches are unrelated resumes that matched
+anything. Copies of short resumes can be less similar to their original than the threshold,
+so the share that is at least that similar is reported too. The same lookups are then timed
+as a linear scan over every stored signature, which is what the LSH buckets avoid. Pass
+--index to keep the index on disk and grow it across runs, e.g. to millions of resumes.
+
+Run with: python benchmarks/bench_near_dup.py [--count 20000] [--queries 500] [--threshold 0.8]
+          [--sizes small,medium] [--index near_dup.sqlite] [--no-scan]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from bench_pipeline import PERCENTILES, percentile
+from synthetic_corpus import near_duplicate, resume_lines
+
+from ph_resume_ext.near_dup import Document, NearDuplicateIndex
+
+
+def text_of(lines):
+    return "\n".join(text for _, text in lines)
+
+
+def build(index, args, rng):
+    """Add --count resumes; returns {name: lines} of the ones sampled for the queries"""
+    start = len(index)
+    sampled = set(rng.sample(range(start, start + args.count), min(args.queries, args.count)))
+    kept, batch = {}, []
+    started = time.perf_counter()
+    for i in range(start, start + args.count):
+        lines = resume_lines(rng, rng.choice(args.sizes))
+        name = f"resume-{i}"
+        if i in sampled:
+            kept[name] = lines
+        batch.append((name, Document(text_of(lines)), {"status": "Success"}))
+        if len(batch) == 1000:
+            index.add_many(batch)
+            batch = []
+            print(f"\r{i + 1 - start}/{args.count} added", end="", file=sys.stderr)
+    index.add_many(batch)
+    elapsed = time.perf_counter() - started
+    print(f"\rAdded {args.count} resumes in {elapsed:.1f}s ({args.count / elapsed:.0f}/s); "
+          f"the index holds {len(index)}")
+    return kept
+
+
+def scan_ms(path, queries):
+    """Milliseconds per query of comparing it with every stored signature"""
+    with sqlite3.connect(path) as conn:
+        signatures = np.frombuffer(b"".join(row[0] for row in conn.execute("SELECT signature FROM resumes")),
+                                   dtype=np.uint32).reshape(-1, queries[0].signature.size)
+    started = time.perf_counter()
+    for document in queries:
+        (signatures == document.signature).mean(axis=1).argmax()
+    return (time.perf_counter() - started) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20000, help="Resumes added to the index")
+    parser.add_argument("--queries", type=int, default=500, help="Copies looked up, and as many unrelated resumes")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--sizes", default="small,medium", help="Size classes of the generated resumes")
+    parser.add_argument("--index", help="Index file to keep and grow; a temporary one by default")
+    parser.add_argument("--no-scan", action="store_true", help="Skip the linear scan comparison")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    args.sizes = args.sizes.split(",")
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="bench-near-dup-") as tmp:
+        path = args.index or os.path.join(tmp, "near_dup.sqlite")
+        index = NearDuplicateIndex(path, args.threshold)
+        kept = build(index, args, rng)
+
+        copies = [(name, Document(text_of(near_duplicate(rng, lines)))) for name, lines in kept.items()]
+        # Copies of short resumes can fall below the threshold; the LSH can only find the others
+        similar = sum(float(np.mean(Document(text_of(kept[name])).signature == document.signature)) >= args.threshold
+                      for name, document in copies)
+        unrelated = [Document(text_of(resume_lines(rng, rng.choice(args.sizes)))) for _ in copies]
+        found, timings = 0, []
+        for name, document in copies:
+            started = time.perf_counter()
+            matches = index.matches(document)
+            timings.append(time.perf_counter() - started)
+            found += bool(matches) and matches[0].name == name
+        false_matches = 0
+        for document in unrelated:
+            started = time.perf_counter()
+            false_matches += bool(index.matches(document))
+            timings.append(time.perf_counter() - started)
+        index.close()
+
+        print(f"threshold {args.threshold:g} ({index.bands} bands of {index.rows} rows): "
+              f"recall {found / len(copies):.1%} of {len(copies)} copies ({similar / len(copies):.1%} are "
+              f"at least {args.threshold:g} similar), "
+              f"{false_matches} false matches among {len(unrelated)} unrelated resumes")
+        quantiles = "  ".join(f"p{q} {percentile(timings, q) * 1000:.2f} ms" for q in PERCENTILES)
+        print(f"LSH lookup: {quantiles}")
+        if not args.no_scan:
+            print(f"linear scan: {scan_ms(path, [document for _, document in copies][:50]):.2f} ms per lookup")
+
+
+if __name__ == "__main__":
+    main()
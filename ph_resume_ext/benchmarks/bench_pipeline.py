@@ -0,0 +1,325 @@
+"""Run the whole ResumeFlow offline against a local fake LLM and report throughput and latency.
+
+Generates a synthetic PDF/DOCX corpus (or uses --corpus), starts fake_llm_server on a free
+port, points the pipeline at it and runs ResumeFlow over the corpus. Reports per-stage
+timings (text extraction, fast path, LLM stage, output write, whole resume) as p50/p95/p99,
+plus resumes/sec. Results can be saved with --output and compared with an earlier result
+(--compare FILE) or with another commit (--ref GIT_REF), which is checked out into a
+temporary git worktree and benchmarked with the same corpus and settings. --packing sends
+resumes in packed requests and reports the packing ratio achieved. --token-ms and
+--trailer-tokens make the fake LLM generate at a given speed and add prose after its JSON, to
+measure the direct engine's streaming cut-off against --no-stream. --server-rpm makes the
+fake LLM answer 429 above that many requests a minute, and --llm-rpm sets the pipeline's own
+limit (RESUME_LLM_RPM) to stay under it; --cascade with --invalid-models has the first models
+of the cascade answer invalid JSON for an --invalid-rate fraction of requests, and the
+per-model report shows the escalations. Every resume goes to the LLM unless --required-fields
+turns on the fast-path skip; a run that sent no LLM requests did not measure the LLM stage, so
+it fails unless that skip was asked for.
+
+Run with: python benchmarks/bench_pipeline.py [--count 30] [--engine crew|direct] [--workers 4]
+          [--latency-ms 300] [--jitter-ms 100] [--error-rate 0] [--packing [--drop-rate 0]]
+          [--token-ms 0] [--trailer-tokens 0] [--no-stream]
+          [--server-rpm 0] [--llm-rpm 0] [--cascade MODEL,... --invalid-models MODEL,... --invalid-rate 1.0]
+          [--required-fields FIELD,...]
+          [--output result.json]
+          [--compare baseline.json | --ref main] [--threshold 10] [--min-delta-ms 2]
+"""
+import argparse
+import contextlib
+import functools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from fake_llm_server import FakeLLMServer
+from synthetic_corpus import generate_corpus
+
+# Stage name -> (where it lives, attribute), wrapped with a timer when it exists in the tree under test
+STAGES = {
+    "extract_text": ("module", "extract_text"),
+    "fast_path": ("module", "extract_fields"),
+    "llm": ("flow", "run_llm"),
+    "write_output": ("flow", "write_output"),
+    "resume": ("flow", "process_resume"),
+}
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, q):
+    """Linearly interpolated percentile of values, for q in [0, 100]"""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def instrument(main_module, timings, errors):
+    """Wrap each pipeline stage in a timer that records its latency, and failures, per call"""
+    def timed(stage, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                errors[stage] += 1
+                raise
+            finally:
+                timings[stage].append(time.perf_counter() - started)
+        return wrapper
+
+    for stage, (owner, name) in STAGES.items():
+        target = main_module if owner == "module" else main_module.ResumeFlow
+        if hasattr(target, name):
+            setattr(target, name, timed(stage, getattr(target, name)))
+
+
+def git_commit(path):
+    try:
+        commit = subprocess.run(["git", "-C", path, "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "-C", path, "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmark(args, corpus_dir):
+    """Run ResumeFlow over corpus_dir against a fake LLM and return the result summary"""
+    server = FakeLLMServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           error_rate=args.error_rate, seed=args.seed, drop_rate=args.drop_rate,
+                           token_ms=args.token_ms, trailer_tokens=args.trailer_tokens, rpm=args.server_rpm,
+                           invalid_models=[m for m in args.invalid_models.split(",") if m],
+                           invalid_rate=args.invalid_rate).start()
+    output_dir = tempfile.TemporaryDirectory(prefix="bench-output-")
+    # main reads its directories at import time, so the environment is set up first
+    os.environ.update({
+        "RESUME_INPUT_DIR": corpus_dir,
+        "RESUME_OUTPUT_DIR": output_dir.name,
+        "RESUME_ENGINE": args.engine,
+        "RESUME_MAX_WORKERS": str(args.workers),
+        "RESUME_CACHE": "1" if args.cache else "0",
+        "RESUME_PACKING": "1" if args.packing else "0",
+        "RESUME_STREAM": "0" if args.no_stream else "1",
+        "RESUME_LLM_RPM": str(args.llm_rpm),
+        "RESUME_LLM_CASCADE": args.cascade,
+        "RESUME_REQUIRED_FIELDS": args.required_fields,
+        "GEMINI_MODEL": "fake-model",
+        "GEMINI_API_KEY": "fake",
+        "LLM_PROVIDER": "openai",
+        "LLM_BASE_URL": server.base_url,
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+    })
+    import ph_resume_ext
+    from ph_resume_ext import main as main_module
+
+    timings, errors = defaultdict(list), defaultdict(int)
+    instrument(main_module, timings, errors)
+    flow = main_module.ResumeFlow()
+    sink = sys.stdout if args.verbose else open(os.devnull, "w")
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(sink):
+            flow.kickoff()
+    finally:
+        wall = time.perf_counter() - started
+        server.stop()
+        output_dir.cleanup()
+        if sink is not sys.stdout:
+            sink.close()
+
+    resumes = len(timings["resume"])
+    failed = errors["resume"]
+    packer = getattr(flow, "packer", None)
+    scheduler = getattr(flow.pipeline, "scheduler", None)
+    return {
+        "commit": git_commit(os.path.dirname(ph_resume_ext.__file__)),
+        "source": os.path.dirname(ph_resume_ext.__file__),
+        "config": {
+            "engine": args.engine, "workers": args.workers, "resumes": len(os.listdir(corpus_dir)),
+            "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate,
+            "cache": args.cache, "packing": args.packing, "drop_rate": args.drop_rate,
+            "token_ms": args.token_ms, "trailer_tokens": args.trailer_tokens, "stream": not args.no_stream,
+            "server_rpm": args.server_rpm, "llm_rpm": args.llm_rpm, "cascade": args.cascade,
+            "invalid_models": args.invalid_models, "invalid_rate": args.invalid_rate,
+            "required_fields": args.required_fields,
+        },
+        "resumes": resumes,
+        "failed": failed,
+        "llm_requests": server.llm.requests,
+        "llm_errors": server.llm.errors,
+        "llm_rate_limited": server.llm.rate_limited,
+        "models": scheduler.report() if scheduler is not None else None,
+        "packing": packer.report() if packer is not None else None,
+        "wall_s": wall,
+        "resumes_per_s": (resumes - failed) / wall if wall else 0.0,
+        "stages": {
+            stage: {
+                "count": len(values),
+                "mean_s": sum(values) / len(values),
+                **{f"p{q}_s": percentile(values, q) for q in PERCENTILES},
+            }
+            for stage, values in timings.items() if values
+        },
+    }
+
+
+def format_result(result):
+    lines = [
+        f"Commit {result['commit']}: {result['resumes']} resumes ({result['failed']} failed), "
+        f"{result['llm_requests']} LLM requests ({result['llm_errors']} injected errors, "
+        f"{result.get('llm_rate_limited', 0)} rate limited) in {result['wall_s']:.2f}s "
+        f"-> {result['resumes_per_s']:.2f} resumes/sec",
+        *([result["packing"]] if result.get("packing") else []),
+        *([result["models"]] if result.get("models") else []),
+        f"{'stage':14} {'calls':>6} {'mean ms':>9} " + " ".join(f"{f'p{q} ms':>9}" for q in PERCENTILES),
+    ]
+    for stage in STAGES:
+        row = result["stages"].get(stage)
+        if row:
+            lines.append(f"{stage:14} {row['count']:6d} {row['mean_s'] * 1000:9.1f} "
+                         + " ".join(f"{row[f'p{q}_s'] * 1000:9.1f}" for q in PERCENTILES))
+    return "\n".join(lines)
+
+
+def compare(current, baseline, threshold, min_delta_s=0.0):
+    """Print current against baseline and return the metrics that regressed by more than threshold percent.
+
+    Latency changes smaller than min_delta_s are never counted, so noise in sub-millisecond stages is ignored.
+    """
+    rows = [("resumes_per_s", baseline["resumes_per_s"], current["resumes_per_s"], True)]
+    for stage in STAGES:
+        if stage in current["stages"] and stage in baseline["stages"]:
+            for q in PERCENTILES:
+                key = f"p{q}_s"
+                rows.append((f"{stage} p{q}", baseline["stages"][stage][key], current["stages"][stage][key], False))
+
+    regressions = []
+    print(f"\n{'metric':22} {baseline['commit']:>14} {current['commit']:>14} {'change':>9}")
+    for name, before, after, higher_is_better in rows:
+        change = (after - before) / before * 100 if before else 0.0
+        regressed = (-change if higher_is_better else change) > threshold
+        if not higher_is_better and after - before < min_delta_s:
+            regressed = False
+        if regressed:
+            regressions.append(name)
+        print(f"{name:22} {before:14.4f} {after:14.4f} {change:8.1f}%{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def run_at_ref(ref, args, corpus_dir):
+    """Benchmark another commit with this harness, from a temporary git worktree"""
+    package_src = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+    top = subprocess.run(["git", "-C", package_src, "rev-parse", "--show-toplevel"],
+                         capture_output=True, text=True, check=True).stdout.strip()
+    with tempfile.TemporaryDirectory(prefix="bench-ref-") as tmp:
+        worktree = os.path.join(tmp, "tree")
+        subprocess.run(["git", "-C", top, "worktree", "add", "--detach", worktree, ref],
+                       capture_output=True, text=True, check=True)
+        try:
+            output = os.path.join(tmp, "result.json")
+            env = dict(os.environ, PYTHONPATH=os.path.join(worktree, os.path.relpath(package_src, top)))
+            command = [sys.executable, os.path.abspath(__file__), "--corpus", corpus_dir, "--output", output,
+                       "--engine", args.engine, "--workers", str(args.workers),
+                       "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+                       "--error-rate", str(args.error_rate), "--seed", str(args.seed)]
+            if args.cache:
+                command.append("--cache")
+            if args.packing:
+                command += ["--packing", "--drop-rate", str(args.drop_rate)]
+            if args.token_ms or args.trailer_tokens:
+                command += ["--token-ms", str(args.token_ms), "--trailer-tokens", str(args.trailer_tokens)]
+            if args.no_stream:
+                command.append("--no-stream")
+            if args.server_rpm or args.llm_rpm:
+                command += ["--server-rpm", str(args.server_rpm), "--llm-rpm", str(args.llm_rpm)]
+            if args.cascade or args.invalid_models:
+                command += ["--cascade", args.cascade, "--invalid-models", args.invalid_models,
+                            "--invalid-rate", str(args.invalid_rate)]
+            if args.required_fields:
+                command += ["--required-fields", args.required_fields]
+            subprocess.run(command, env=env, check=True)
+            with open(output, "r", encoding="utf-8") as f:
+                return json.load(f)
+        finally:
+            subprocess.run(["git", "-C", top, "worktree", "remove", "--force", worktree], capture_output=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of resumes to use instead of a generated corpus")
+    parser.add_argument("--count", type=int, default=30, help="Size of the generated corpus")
+    parser.add_argument("--engine", default="crew", choices=("crew", "direct"))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="Keep the extraction cache on (off by default)")
+    parser.add_argument("--packing", action="store_true", help="Send resumes in packed requests (direct engine)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of packed answers the fake LLM leaves out")
+    parser.add_argument("--token-ms", type=float, default=0.0, help="Fake LLM generation time per completion token")
+    parser.add_argument("--trailer-tokens", type=int, default=0, help="Prose the fake LLM adds after direct answers")
+    parser.add_argument("--no-stream", action="store_true", help="Read direct-engine answers without streaming")
+    parser.add_argument("--server-rpm", type=int, default=0, help="Requests a minute the fake LLM allows before 429")
+    parser.add_argument("--llm-rpm", type=float, default=0, help="The pipeline's own requests-per-minute limit")
+    parser.add_argument("--cascade", default="", help="Models to try in order, e.g. fake-lite,fake-model")
+    parser.add_argument("--invalid-models", default="", help="Models the fake LLM answers with invalid JSON")
+    parser.add_argument("--invalid-rate", type=float, default=1.0, help="Fraction of their answers that are invalid")
+    parser.add_argument("--required-fields", default="",
+                        help="Skip the LLM for resumes whose fast path fills these fields (off by default)")
+    parser.add_argument("--output", help="Write the result as JSON to this file")
+    parser.add_argument("--compare", help="Earlier result JSON to compare against")
+    parser.add_argument("--ref", help="Git ref to benchmark with the same corpus and compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Percent change that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="Latency increases smaller than this are not counted as regressions")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own output")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-corpus-") as tmp:
+        corpus_dir = args.corpus
+        if corpus_dir is None:
+            corpus_dir = os.path.join(tmp, "corpus")
+            generate_corpus(corpus_dir, args.count, args.seed)
+
+        baseline = None
+        if args.ref:
+            baseline = run_at_ref(args.ref, args, corpus_dir)
+        elif args.compare:
+            with open(args.compare, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+
+        result = run_benchmark(args, corpus_dir)
+
+    if args.compare:
+        print(format_result(baseline))
+        print()
+    print(format_result(result))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=4)
+    if result["resumes"] and not result["llm_requests"]:
+        print("\nWarning: no LLM requests were made, so the LLM stage was not measured", file=sys.stderr)
+        if not args.required_fields:
+            sys.exit(1)
+    if baseline is not None:
+        if baseline["config"] != result["config"]:
+            print(f"\nWarning: configurations differ ({baseline['config']} vs {result['config']})")
+        regressions = compare(result, baseline, args.threshold, args.min_delta_ms / 1000)
+        if regressions:
+            print(f"\n{len(regressions)} metrics regressed by more than {args.threshold:.0f}%: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
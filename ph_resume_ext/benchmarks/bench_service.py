@@ -0,0 +1,181 @@
+"""Load-test the HTTP extraction service offline and report throughput and tail latency.
+
+Generates a synthetic PDF/DOCX corpus (or uses --corpus), starts fake_llm_server and the
+extraction service on free ports in this process, then has --concurrency clients upload
+resumes from the corpus back to back until --requests uploads have been sent. Each client
+keeps its connection open. With --mode sync clients wait on POST /extract; with --mode jobs
+they POST /jobs and poll GET /jobs/<id>. Uploads refused with 429 are counted and not
+retried, so running more clients than workers plus queue slots shows the backpressure.
+The extraction cache is off, so every upload reaches the pipeline.
+
+Run with: python benchmarks/bench_service.py [--requests 200] [--concurrency 16] [--workers 4] [--queue-size 8]
+          [--mode sync|jobs] [--engine direct|crew] [--latency-ms 300] [--jitter-ms 100] [--timeout 120]
+"""
+import argparse
+import asyncio
+import contextlib
+import http.client
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from bench_pipeline import PERCENTILES, percentile
+from fake_llm_server import FakeLLMServer
+from synthetic_corpus import generate_corpus
+
+CONTENT_TYPES = {".pdf": "application/pdf",
+                 ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+
+
+def start_service(args, corpus_dir, output_dir, llm_url):
+    """Run an ExtractionService on a background event loop; returns (service, loop, thread)"""
+    os.environ.update({
+        "RESUME_INPUT_DIR": corpus_dir,
+        "RESUME_OUTPUT_DIR": output_dir,
+        "RESUME_ENGINE": args.engine,
+        "RESUME_CACHE": "0",
+        "GEMINI_MODEL": "fake-model",
+        "GEMINI_API_KEY": "fake",
+        "LLM_PROVIDER": "openai",
+        "LLM_BASE_URL": llm_url,
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+    })
+    from ph_resume_ext.service import ExtractionService
+
+    service = ExtractionService(host="127.0.0.1", port=0, workers=args.workers, queue_size=args.queue_size,
+                                timeout_s=args.timeout)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    async def run():
+        await service.start()
+        started.set()
+        await service._stopping.wait()
+        await service.shutdown()
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(run(),), daemon=True)
+    thread.start()
+    if not started.wait(120):
+        raise RuntimeError("The extraction service did not start")
+    return service, loop, thread
+
+
+def client(port, files, mode, results, lock):
+    """Upload resumes until the shared file iterator runs out, recording (status, seconds) per upload"""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=600)
+    for path in files:
+        with open(path, "rb") as f:
+            data = f.read()
+        name = os.path.basename(path)
+        headers = {"Content-Type": CONTENT_TYPES[os.path.splitext(name)[1].lower()], "X-Filename": name}
+        started = time.perf_counter()
+        try:
+            connection.request("POST", "/extract" if mode == "sync" else "/jobs", body=data, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+            status = response.status
+            if mode == "jobs" and status == 202:
+                job_id = json.loads(payload)["job_id"]
+                while True:
+                    time.sleep(0.05)
+                    connection.request("GET", f"/jobs/{job_id}")
+                    job = json.loads(connection.getresponse().read())
+                    if job["status"] not in ("queued", "running"):
+                        status = {"done": 200, "timeout": 504}.get(job["status"], 500)
+                        break
+        except (OSError, http.client.HTTPException):
+            status = "error"
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=600)
+        with lock:
+            results.append((status, time.perf_counter() - started))
+    connection.close()
+
+
+def run_load(args, port, corpus):
+    paths = [os.path.join(corpus, name) for name in sorted(os.listdir(corpus))]
+    # itertools.islice over a shared cycle hands each upload to exactly one client
+    shared = itertools.islice(itertools.cycle(paths), args.requests)
+    lock = threading.Lock()
+
+    def files():
+        while True:
+            with lock:
+                path = next(shared, None)
+            if path is None:
+                return
+            yield path
+
+    results, results_lock = [], threading.Lock()
+    threads = [threading.Thread(target=client, args=(port, files(), args.mode, results, results_lock))
+               for _ in range(args.concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of resumes to use instead of a generated corpus")
+    parser.add_argument("--count", type=int, default=20, help="Size of the generated corpus")
+    parser.add_argument("--requests", type=int, default=200, help="Uploads to send in total")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clients uploading at once")
+    parser.add_argument("--mode", default="sync", choices=("sync", "jobs"))
+    parser.add_argument("--engine", default="direct", choices=("crew", "direct"))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Service timeout per job, seconds")
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="Show the service's own output")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-corpus-") as tmp:
+        corpus = args.corpus
+        if corpus is None:
+            corpus = os.path.join(tmp, "corpus")
+            generate_corpus(corpus, args.count, args.seed)
+        llm = FakeLLMServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, seed=args.seed).start()
+        sink = sys.stdout if args.verbose else open(os.devnull, "w")
+        try:
+            with contextlib.redirect_stdout(sink):
+                service, loop, thread = start_service(args, corpus, os.path.join(tmp, "output"), llm.base_url)
+                try:
+                    results, wall = run_load(args, service.port, corpus)
+                finally:
+                    loop.call_soon_threadsafe(service.stop)
+                    thread.join()
+        finally:
+            llm.stop()
+            if sink is not sys.stdout:
+                sink.close()
+
+    statuses = Counter(status for status, _ in results)
+    latencies = [seconds for status, seconds in results if status == 200]
+    print(f"{len(results)} uploads from {args.concurrency} clients ({args.mode} mode) to {args.workers} workers "
+          f"with a queue of {args.queue_size}, engine {args.engine}, fake LLM {args.latency_ms:g}±{args.jitter_ms:g} ms")
+    print("responses: " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items(), key=str)))
+    print(f"{len(latencies)} extracted in {wall:.2f}s -> {len(latencies) / wall:.2f} resumes/sec, "
+          f"{statuses.get(429, 0) / len(results) * 100 if results else 0:.1f}% rejected with 429, "
+          f"{llm.llm.requests} LLM requests")
+    if latencies:
+        quantiles = "  ".join(f"p{q} {percentile(latencies, q) * 1000:.0f} ms" for q in PERCENTILES)
+        print(f"latency of extracted uploads: mean {sum(latencies) / len(latencies) * 1000:.0f} ms  {quantiles}  "
+              f"max {max(latencies) * 1000:.0f} ms")
+    rejected = [seconds for status, seconds in results if status == 429]
+    if rejected:
+        print(f"429 answered in p50 {percentile(rejected, 50) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
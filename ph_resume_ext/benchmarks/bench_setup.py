@@ -0,0 +1,45 @@
+"""Measure per-resume setup overhead: a fresh ResumeCrew per resume vs a shared ResumePipeline.
+
+No LLM calls are made. Run with: python benchmarks/bench_setup.py [--iterations N]
+"""
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("GEMINI_MODEL", "gemini-2.0-flash")
+
+from ph_resume_ext.crews.resume_crew_pr.resume_crew import ResumeCrew  # noqa: E402
+from ph_resume_ext.pipeline import ResumePipeline  # noqa: E402
+
+
+def measure(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, statistics.mean(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    pipeline = ResumePipeline()
+    build_ms = (time.perf_counter() - started) * 1000
+
+    before = measure(lambda: ResumeCrew().crew(), args.iterations)
+    after = measure(pipeline.crew, args.iterations)
+
+    print(f"One-off pipeline build: {build_ms:.1f}ms")
+    print(f"{'per-resume setup':28} {'median':>10} {'mean':>10}")
+    print(f"{'fresh ResumeCrew().crew()':28} {before[0]:8.2f}ms {before[1]:8.2f}ms")
+    print(f"{'ResumePipeline.crew()':28} {after[0]:8.2f}ms {after[1]:8.2f}ms")
+    print(f"Setup overhead reduced {before[0] / after[0]:.1f}x per resume")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Build time, memory and scan speed of the skill taxonomy index at increasing taxonomy sizes.
+
+Synthetic taxonomies of each size (canonical names of one to four made-up words, with acronym
+and suffixed aliases) are compiled into SkillTaxonomy and measured: build time, memory held by
+the automaton (tracemalloc), peak memory while building, and the time to scan a corpus of
+synthetic resumes that mention skills from the taxonomy. A naive scan that tests every alias
+with a substring search is timed on a sample of the resumes for comparison.
+
+Run with: python benchmarks/bench_skills.py [--sizes 1000,10000,50000,100000] [--resumes 200]
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from ph_resume_ext.skills import DEFAULT_TAXONOMY, SkillTaxonomy, load_taxonomy
+
+SYLLABLES = ["da", "ta", "lo", "gi", "ka", "mo", "ne", "tri", "flux", "core", "net", "py", "zen", "ark", "sol",
+             "vex", "qu", "io", "ra", "ly", "max", "dex", "on", "el", "tor", "bi", "sy", "go", "ha", "ku"]
+SUFFIXES = ["programming", "framework", "development", "analysis", "platform"]
+FILLER = ("Delivered projects for clients across several industries while working closely with product, "
+          "design and operations teams on planning and delivery. ").split()
+
+
+def make_taxonomy(size, rng):
+    """size canonical skills with one to three aliases each"""
+    skills = {}
+    while len(skills) < size:
+        words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+                 for _ in range(rng.randint(1, 4))]
+        name = " ".join(words)
+        if name in skills:
+            continue
+        aliases = []
+        if len(words) > 1:
+            aliases.append("".join(word[0] for word in words).upper() + "".join(rng.choice(SYLLABLES[:5]) for _ in range(2)))
+        aliases.append(f"{name} {rng.choice(SUFFIXES)}")
+        if rng.random() < 0.5:
+            aliases.append(name.replace(" ", "-"))
+        skills[name] = aliases
+    return skills
+
+
+def make_resumes(skills, count, rng, mentions=40, words=1200):
+    """Resume-sized texts mentioning skills by name or alias among filler words"""
+    names = list(skills)
+    resumes = []
+    for _ in range(count):
+        parts = [rng.choice(FILLER) for _ in range(words)]
+        for _ in range(mentions):
+            name = rng.choice(names)
+            parts.insert(rng.randrange(len(parts)), rng.choice([name, *skills[name]]) + ",")
+        resumes.append(" ".join(parts))
+    return resumes
+
+
+def naive_find(aliases, text):
+    lowered = text.lower()
+    return [alias for alias in aliases if alias in lowered]
+
+
+def measure(size, args):
+    rng = random.Random(args.seed)
+    skills = make_taxonomy(size, rng)
+    resumes = make_resumes(skills, args.resumes, rng)
+    gc.collect()
+
+    started = time.perf_counter()
+    taxonomy = SkillTaxonomy(skills)
+    build_s = time.perf_counter() - started
+    del taxonomy
+    gc.collect()
+    # Built a second time for memory, as tracing allocations slows the build down several times
+    tracemalloc.start()
+    taxonomy = SkillTaxonomy(skills)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    found = sum(len(taxonomy.find(text)) for text in resumes)
+    scan_s = time.perf_counter() - started
+
+    sample = resumes[:args.naive_sample]
+    aliases = list(taxonomy.aliases)
+    started = time.perf_counter()
+    for text in sample:
+        naive_find(aliases, text)
+    naive_s = (time.perf_counter() - started) / max(1, len(sample)) * len(resumes)
+
+    megabytes = sum(map(len, resumes)) / 1e6
+    return {
+        "size": size, "aliases": len(taxonomy.aliases), "nodes": taxonomy.nodes, "build_s": build_s,
+        "held_mb": held / 1e6, "peak_mb": peak / 1e6, "scan_ms": scan_s / len(resumes) * 1000,
+        "scan_mb_s": megabytes / scan_s, "naive_ms": naive_s / len(resumes) * 1000,
+        "found": found / len(resumes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,50000,100000", help="Comma-separated taxonomy sizes")
+    parser.add_argument("--resumes", type=int, default=200, help="Synthetic resumes scanned per size")
+    parser.add_argument("--naive-sample", type=int, default=10, help="Resumes scanned by the naive baseline")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    seed = load_taxonomy(DEFAULT_TAXONOMY)
+    print(f"Bundled taxonomy: {len(seed)} skills, {len(seed.aliases)} aliases, {seed.nodes} nodes, "
+          f"loaded in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    print(f"{'skills':>8} {'aliases':>8} {'nodes':>9} {'build s':>8} {'held MB':>8} {'peak MB':>8} "
+          f"{'scan ms':>8} {'MB/s':>6} {'naive ms':>9} {'found':>6}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        row = measure(size, args)
+        print(f"{row['size']:8d} {row['aliases']:8d} {row['nodes']:9d} {row['build_s']:8.2f} {row['held_mb']:8.1f} "
+              f"{row['peak_mb']:8.1f} {row['scan_ms']:8.2f} {row['scan_mb_s']:6.2f} {row['naive_ms']:9.1f} "
+              f"{row['found']:6.1f}")
+    print("scan ms and naive ms are per resume; naive tests every alias with a substring search")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Startup time of every entry point, module import times, and a cold single-resume run vs a warm worker.
+
+Each measurement runs in a fresh interpreter and the median of --repeat runs is kept:
+  - "help" rows time `--help` of the CLI and of each command (what the kickoff, plot and
+    serve scripts run), which must not import the pipeline;
+  - "import" rows time importing single modules;
+  - "extract" rows time `ph_resume_ext extract` on one synthetic resume against the fake LLM,
+    cold (a new process that sets up the pipeline) and through a warm, preforked service
+    (`extract --server`), which pays the setup once for every resume after it.
+Results can be saved with --output and compared with an earlier result (--compare FILE);
+rows slower by more than --threshold percent (and --min-delta-ms) count as regressions
+and make the script exit with status 1.
+
+Run with: python benchmarks/bench_startup.py [--repeat 5] [--latency-ms 50] [--output startup.json]
+          [--compare baseline.json] [--threshold 20] [--min-delta-ms 20]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from fake_llm_server import FakeLLMServer
+from synthetic_corpus import generate_corpus
+
+HELP = [
+    ("help: ph_resume_ext", ["-m", "ph_resume_ext", "--help"]),
+    ("help: run (kickoff)", ["-m", "ph_resume_ext", "run", "--help"]),
+    ("help: extract", ["-m", "ph_resume_ext", "extract", "--help"]),
+    ("help: serve", ["-m", "ph_resume_ext", "serve", "--help"]),
+    ("help: plot", ["-m", "ph_resume_ext", "plot", "--help"]),
+]
+IMPORTS = ["ph_resume_ext.cli", "ph_resume_ext.extraction", "ph_resume_ext.direct_extractor",
+           "ph_resume_ext.evaluation", "ph_resume_ext.main", "ph_resume_ext.service"]
+
+
+def timed_run(args, env, repeat):
+    """Median wall time in ms of running python with args, in a fresh process each time"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *args], env=env, check=True, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_service(env, port, prefork):
+    process = subprocess.Popen([sys.executable, "-m", "ph_resume_ext", "serve", "--port", str(port), "--prefork",
+                                str(prefork)], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("The extraction service did not start")
+
+
+def measure(args):
+    rows = {}
+    env = dict(os.environ, CREWAI_DISABLE_TELEMETRY="true", OTEL_SDK_DISABLED="true")
+    for name, command in HELP:
+        rows[name] = timed_run(command, env, args.repeat)
+    for module in IMPORTS:
+        rows[f"import: {module}"] = timed_run(["-c", f"import {module}"], env, args.repeat)
+
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as tmp:
+        corpus = os.path.join(tmp, "corpus")
+        generate_corpus(corpus, 2, args.seed)
+        resume = os.path.join(corpus, sorted(os.listdir(corpus))[0])
+        with FakeLLMServer(latency_ms=args.latency_ms, jitter_ms=0) as llm:
+            env.update({
+                "RESUME_OUTPUT_DIR": os.path.join(tmp, "output"),
+                "RESUME_ENGINE": "direct",
+                "RESUME_CACHE": "0",
+                "GEMINI_MODEL": "fake-model",
+                "GEMINI_API_KEY": "fake",
+                "LLM_PROVIDER": "openai",
+                "LLM_BASE_URL": llm.base_url,
+            })
+            rows["extract: cold process"] = timed_run(["-m", "ph_resume_ext", "extract", resume], env, args.repeat)
+            port = free_port()
+            started = time.perf_counter()
+            service = start_service(env, port, args.prefork)
+            rows["serve: ready (prefork)"] = (time.perf_counter() - started) * 1000
+            try:
+                rows["extract: warm service"] = timed_run(
+                    ["-m", "ph_resume_ext", "extract", "--server", f"http://127.0.0.1:{port}", resume], env, args.repeat)
+            finally:
+                service.terminate()
+                service.wait(60)
+    return {"python": sys.version.split()[0], "latency_ms": args.latency_ms, "rows": rows}
+
+
+def compare(current, baseline, threshold, min_delta_ms):
+    """Report rows that got slower than the baseline; returns True when any regressed"""
+    regressed = False
+    print(f"\n{'':40} {'baseline ms':>12} {'current ms':>11} {'change':>8}")
+    for name, now in current["rows"].items():
+        before = baseline["rows"].get(name)
+        if before is None:
+            continue
+        change = (now - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > threshold and now - before > min_delta_ms:
+            flag, regressed = "  REGRESSION", True
+        print(f"{name:40} {before:12.0f} {now:11.0f} {change:+7.1f}%{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the median is kept")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Fake LLM latency for the extract rows")
+    parser.add_argument("--prefork", type=int, default=2, help="Worker processes of the warm service")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the result as JSON to this file")
+    parser.add_argument("--compare", help="Earlier result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Percent change that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=20.0,
+                        help="Increases smaller than this are not counted as regressions")
+    args = parser.parse_args()
+
+    result = measure(args)
+    print(f"Python {result['python']}, median of {args.repeat} runs, fake LLM latency {args.latency_ms:g} ms")
+    print(f"{'':40} {'ms':>8}")
+    for name, value in result["rows"].items():
+        print(f"{name:40} {value:8.0f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=4)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(result, baseline, args.threshold, args.min_delta_ms):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Micro-benchmark the single-pass text cleaner against the previous multi-pass implementation.
+
+Run with: python benchmarks/bench_text_cleaner.py [--repeat N]
+"""
+import argparse
+import random
+import re
+import statistics
+import time
+
+from ph_resume_ext.tools.Text_Cleaner import clean_text, clean_texts
+
+
+def legacy_clean_text(text):
+    """The previous TextCleanerTool._run implementation"""
+    if not text or not isinstance(text, str):
+        return ""
+    text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\t\r')
+    text = ''.join(char for char in text if ord(char) <= 127)
+    text = re.sub(r' +', ' ', text)
+    text = re.sub(r'\t+', ' ', text)
+    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    lines = text.split('\n')
+    cleaned_lines = [line.strip() for line in lines]
+    text = '\n'.join(cleaned_lines)
+    return text.strip()
+
+
+def synthetic_resume(size, seed=0):
+    """Resume-like text with bullets, extra spacing, tabs, blank lines and some non-ASCII characters"""
+    rng = random.Random(seed)
+    words = ["Python", "SQL", "led", "team", "data", "pipeline", "  ", "\t", "café", "•", "–",
+             "increased", "revenue", "by", "25%", "\x0c", "model", "AWS", "résumé"]
+    parts, length = [], 0
+    while length < size:
+        line = " ".join(rng.choice(words) for _ in range(rng.randint(3, 14)))
+        line = "  " + line + rng.choice(["", " ", "\t", "\r"]) + rng.choice(["\n", "\n\n", "\n \n\n\n"])
+        parts.append(line)
+        length += len(line)
+    return "".join(parts)[:size]
+
+
+def measure(fn, arg, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    cases = {
+        "small (500 B)": synthetic_resume(500),
+        "typical (8 KB)": synthetic_resume(8 * 1024),
+        "large (1.5 MB)": synthetic_resume(1536 * 1024),
+    }
+    print(f"{'input':18} {'legacy':>12} {'single-pass':>12} {'speedup':>8}")
+    for name, text in cases.items():
+        assert clean_text(text) == legacy_clean_text(text), f"output differs for {name}"
+        legacy = measure(legacy_clean_text, text, args.repeat)
+        fast = measure(clean_text, text, args.repeat)
+        print(f"{name:18} {legacy * 1000:10.3f}ms {fast * 1000:10.3f}ms {legacy / fast:7.1f}x")
+
+    batch = [synthetic_resume(8 * 1024, seed=i) for i in range(500)]
+    legacy = measure(lambda texts: [legacy_clean_text(t) for t in texts], batch, args.repeat)
+    fast = measure(clean_texts, batch, args.repeat)
+    print(f"{'batch (500 x 8 KB)':18} {legacy * 1000:10.3f}ms {fast * 1000:10.3f}ms {legacy / fast:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
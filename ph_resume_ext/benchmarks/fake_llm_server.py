@@ -0,0 +1,319 @@
+"""Local stand-in for an OpenAI-compatible chat completions endpoint, for offline benchmarks.
+
+Answers every request with canned Output_format JSON after a configurable latency (plus
+jitter), and fails a configurable fraction of requests with HTTP 503. It understands the
+three kinds of request the pipeline makes: crew agent turns (ReAct "Final Answer"), crew
+reasoning/planning turns (plain text or the create_reasoning_plan function call), direct
+structured-output calls (response_format) and packed calls covering several resumes, which get
+a "results" array with one element per "### RESUME ID:" section (a --drop-rate fraction of
+them left out, to exercise retries). Streaming requests get server-sent events, sent at
+--token-ms per completion token; --trailer-tokens adds that much prose after each direct
+answer, the way chatty models explain their JSON. --rpm answers requests over that many in
+the last minute with 429 and a Retry-After header, like a provider's rate limit, and models
+listed in --invalid-models answer a --invalid-rate fraction of requests with JSON that fails
+Output_format validation, like a cheap model out of its depth.
+
+Point the pipeline at it with:
+    LLM_PROVIDER=openai LLM_BASE_URL=http://127.0.0.1:8765/v1 GEMINI_MODEL=fake-model GEMINI_API_KEY=fake
+
+Run with: python benchmarks/fake_llm_server.py [--port 8765] [--latency-ms 300] [--jitter-ms 100] [--error-rate 0.0]
+          [--drop-rate 0.0] [--token-ms 0] [--trailer-tokens 0] [--rpm 0]
+          [--invalid-models MODEL,... [--invalid-rate 1.0]]
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_OUTPUT = {
+    "status": "Success",
+    "First_Name": "Jordan",
+    "Last_Name": "Avery",
+    "email_address": "jordan.avery@example.com",
+    "skills": ["Python", "SQL", "Machine Learning", "Tableau", "AWS", "Communication"],
+    "phone_number": "(555) 010-4477",
+    "location": "Denver, CO",
+    "linkedin": "linkedin.com/in/jordanavery",
+    "summary": "Data professional with experience building analytics pipelines and models.",
+    "work_experience": {"Data Scientist": {"company": "Northwind Analytics", "dates": "2019 - current"}},
+    "education": {"B.S. Statistics": {"institution": "State University", "year": "2016"}},
+    "certifications": {},
+}
+
+# skills must be a list and work_experience an object, so this fails Output_format validation
+INVALID_OUTPUT = {"status": "Success", "skills": "Python, SQL", "work_experience": ["Data Scientist"]}
+
+PLAN = "1. Read the resume with the matching tool. 2. Return the Output_format fields as JSON."
+READY = "READY: I am ready to execute the task."
+RESUME_ID_RE = re.compile(r"^### RESUME ID: (\S+)$", re.MULTILINE)
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+TRAILER = "This JSON object was extracted from the resume text above. "
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+class FakeLLM:
+    """Decides what to answer and how long to wait; shared by every handler thread"""
+
+    def __init__(self, latency_ms=300.0, jitter_ms=100.0, error_rate=0.0, output=None, seed=None, drop_rate=0.0,
+                 token_ms=0.0, trailer_tokens=0, rpm=0, invalid_models=(),
+                 invalid_rate=1.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.token_ms = token_ms
+        self.trailer_tokens = trailer_tokens
+        self.output = output or CANNED_OUTPUT
+        self.rpm = rpm
+        self.invalid_models = set(invalid_models)
+        self.invalid_rate = invalid_rate
+        self._recent = deque()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.cutoffs = 0
+        self.rate_limited = 0
+
+    def over_limit(self):
+        """Seconds until a slot frees up when this request exceeds --rpm, else 0"""
+        if not self.rpm:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= 60:
+                self._recent.popleft()
+            if len(self._recent) >= self.rpm:
+                self.rate_limited += 1
+                return 60 - (now - self._recent[0])
+            self._recent.append(now)
+            return 0.0
+
+    def delay_and_fail(self):
+        """Sleep for the configured latency and return True when this request should fail"""
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000 if self.jitter_ms else self.latency_ms / 1000
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        time.sleep(delay)
+        return fail
+
+    def cut_off(self):
+        with self._lock:
+            self.cutoffs += 1
+
+    def reply(self, body):
+        """(content, tool_calls) answering a chat completions request body"""
+        prompt = "\n".join(str(m.get("content") or "") for m in body.get("messages", []))
+        tool_names = [t.get("function", {}).get("name") for t in body.get("tools") or []]
+        if "create_reasoning_plan" in tool_names:
+            arguments = json.dumps({"plan": PLAN, "ready": True})
+            return None, [{"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                           "function": {"name": "create_reasoning_plan", "arguments": arguments}}]
+        # Planning prompts ask for the READY statement; agent turns ask for a "Final Answer" instead
+        if READY in prompt and "Final Answer" not in prompt:
+            return f"{PLAN}\n\n{READY}", None
+        sections = RESUME_ID_RE.split(prompt)
+        if body.get("response_format") and len(sections) > 1:
+            # Packed request: sections alternate between resume IDs and their text
+            results = []
+            for resume_id, text in zip(sections[1::2], sections[2::2]):
+                with self._lock:
+                    dropped = self._rng.random() < self.drop_rate
+                if not dropped:
+                    results.append({"resume_id": resume_id, **self.answer_for(text)})
+            return json.dumps({"results": results}, ensure_ascii=False), None
+        with self._lock:
+            invalid = body.get("model") in self.invalid_models and self._rng.random() < self.invalid_rate
+        if invalid:
+            answer = json.dumps(INVALID_OUTPUT)
+        else:
+            answer = json.dumps(self.answer_for(prompt), ensure_ascii=False)
+        if body.get("response_format"):
+            if self.trailer_tokens:
+                trailer = (TRAILER * (self.trailer_tokens * 4 // len(TRAILER) + 1))[:self.trailer_tokens * 4]
+                return f"```json\n{answer}\n```\n{trailer}", None
+            return answer, None
+        return f"Thought: I now know the final answer\nFinal Answer: {answer}", None
+
+    def answer_for(self, text):
+        output = dict(self.output)
+        # Echo an email address from the prompt so outputs differ per resume like real ones do
+        email = EMAIL_RE.search(text)
+        if email:
+            output["email_address"] = email.group(0)
+        return output
+
+
+def make_handler(llm):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status, payload):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/models"):
+                self._send_json(200, {"object": "list", "data": [{"id": "fake-model", "object": "model"}]})
+            else:
+                self._send_json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+                return
+            wait = llm.over_limit()
+            if wait:
+                data = json.dumps({"error": {"message": "rate limit exceeded", "type": "rate_limit_error",
+                                             "code": 429}}).encode("utf-8")
+                self.send_response(429)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Retry-After", str(math.ceil(wait)))
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                return
+            if llm.delay_and_fail():
+                self._send_json(503, {"error": {"message": "injected failure", "type": "server_error", "code": 503}})
+                return
+
+            content, tool_calls = llm.reply(body)
+            prompt_tokens = estimate_tokens(json.dumps(body.get("messages", [])))
+            completion_tokens = estimate_tokens(content or json.dumps(tool_calls))
+            completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+            model = body.get("model", "fake-model")
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                     "total_tokens": prompt_tokens + completion_tokens}
+            finish_reason = "tool_calls" if tool_calls else "stop"
+
+            if not body.get("stream"):
+                # Generation time is spent before anything is sent
+                time.sleep(completion_tokens * llm.token_ms / 1000)
+                message = {"role": "assistant", "content": content}
+                if tool_calls:
+                    message["tool_calls"] = tool_calls
+                self._send_json(200, {
+                    "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                    "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+                    "usage": usage,
+                })
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            if tool_calls:
+                deltas = [{"role": "assistant", "tool_calls": [dict(tool_calls[0], index=0)]}]
+            else:
+                step = max(1, len(content) // 8)
+                deltas = [{"role": "assistant", "content": content[i:i + step]} for i in range(0, len(content), step)]
+            for delta in deltas:
+                time.sleep(estimate_tokens(delta.get("content") or "") * llm.token_ms / 1000)
+                chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                         "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+                try:
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client stopped reading, e.g. once it had the whole JSON object
+                    llm.cut_off()
+                    return
+            final = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                     "choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}], "usage": usage}
+            try:
+                self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                llm.cut_off()
+
+    return Handler
+
+
+class FakeLLMServer:
+    """Runs the fake endpoint on a background thread; port 0 picks a free port"""
+
+    def __init__(self, host="127.0.0.1", port=0, **options):
+        self.llm = FakeLLM(**options)
+        self._server = ThreadingHTTPServer((host, port), make_handler(self.llm))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of packed answers left out")
+    parser.add_argument("--token-ms", type=float, default=0.0, help="Generation time per completion token")
+    parser.add_argument("--trailer-tokens", type=int, default=0, help="Prose appended after each direct answer")
+    parser.add_argument("--rpm", type=int, default=0, help="Requests allowed per minute before answering 429")
+    parser.add_argument("--invalid-models", default="", help="Comma-separated models that answer invalid JSON")
+    parser.add_argument("--invalid-rate", type=float, default=1.0, help="Fraction of their answers that are invalid")
+    parser.add_argument("--response-file", help="JSON file with the Output_format answer to return")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    output = None
+    if args.response_file:
+        with open(args.response_file, "r", encoding="utf-8") as f:
+            output = json.load(f)
+    server = FakeLLMServer(args.host, args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           error_rate=args.error_rate, output=output, seed=args.seed, drop_rate=args.drop_rate,
+                           token_ms=args.token_ms, trailer_tokens=args.trailer_tokens, rpm=args.rpm,
+                           invalid_models=[m for m in args.invalid_models.split(",") if m],
+                           invalid_rate=args.invalid_rate)
+    print(f"Fake LLM listening on {server.base_url}")
+    try:
+        server.start()._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Generate synthetic PDF and DOCX resumes of different sizes for offline benchmarks.
+
+Files are written directly (a minimal PDF with the standard Helvetica font, and a minimal
+OOXML package), so no PDF or Word library is needed. Every resume has a name, an email
+address built from it, a phone number, a LinkedIn URL and the usual sections, and its size
+class controls how many jobs, bullets and pages it has.
+
+Run with: python benchmarks/synthetic_corpus.py OUTPUT_DIR [--count 30] [--seed 0]
+"""
+import argparse
+import os
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+FIRST_NAMES = ["Avery", "Jordan", "Priya", "Mateo", "Hannah", "Kenji", "Olivia", "Samuel", "Amara", "Lucas",
+               "Sofia", "Ethan", "Noor", "Daniel", "Ingrid", "Marcus"]
+LAST_NAMES = ["Bennett", "Okafor", "Larsen", "Nakamura", "Alvarez", "Fischer", "Reyes", "Patel", "Novak",
+              "Sullivan", "Haddad", "Kowalski", "Moreau", "Lindqvist"]
+TITLES = ["Data Scientist", "Software Engineer", "Product Manager", "Data Analyst", "Machine Learning Engineer",
+          "Customer Success Manager", "DevOps Engineer", "Business Analyst"]
+COMPANIES = ["Northwind Analytics", "Contoso Ltd", "Fabrikam", "Globex", "Initech", "Umbrella Health",
+             "Stark Logistics", "Wayne Retail"]
+SKILLS = ["Python", "SQL", "R", "Tableau", "Power BI", "AWS", "Azure", "Docker", "Kubernetes", "Spark",
+          "TensorFlow", "PyTorch", "Excel", "Jira", "Git", "Airflow", "Snowflake", "Looker", "Scikit-learn", "Go"]
+VERBS = ["Built", "Led", "Designed", "Automated", "Migrated", "Reduced", "Improved", "Launched", "Scaled"]
+OBJECTS = ["a churn model", "the reporting pipeline", "an A/B testing platform", "ETL jobs", "customer dashboards",
+           "the data warehouse", "a recommendation service", "on-call runbooks", "the forecasting process"]
+
+# jobs, bullets per job; large resumes span well over PARALLEL_MIN_PAGES PDF pages
+SIZES = {"small": (2, 3), "medium": (10, 12), "large": (40, 12)}
+LINES_PER_PAGE = 48
+
+
+def resume_lines(rng, size):
+    """The resume as (style, text) lines, where style is "name", "heading" or "body" """
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    jobs, bullets = SIZES[size]
+    lines = [
+        ("name", f"{first} {last}"),
+        ("body", f"{first.lower()}.{last.lower()}@example.com | ({rng.randint(200, 989)}) "
+                 f"{rng.randint(200, 999)}-{rng.randint(1000, 9999)} | linkedin.com/in/{first.lower()}{last.lower()}"),
+        ("body", f"{rng.choice(['Denver, CO', 'Austin, TX', 'Seattle, WA', 'Boston, MA'])}"),
+        ("heading", "SUMMARY"),
+        ("body", f"{rng.choice(TITLES)} with {rng.randint(2, 15)} years of experience delivering data products."),
+        ("heading", "EXPERIENCE"),
+    ]
+    for j in range(jobs):
+        start = 2024 - 2 * (j + 1)
+        lines.append(("body", f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)}, {start} - {start + 2}"))
+        for _ in range(bullets):
+            lines.append(("body", f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}, improving throughput by "
+                                  f"{rng.randint(5, 60)}% across {rng.randint(2, 40)} teams"))
+    lines += [
+        ("heading", "EDUCATION"),
+        ("body", f"B.S. Computer Science, State University, {rng.randint(2005, 2018)}"),
+        ("heading", "SKILLS"),
+        ("body", ", ".join(rng.sample(SKILLS, rng.randint(5, 12)))),
+    ]
+    return lines
+
+
+def near_duplicate(rng, lines):
+    """A re-submitted copy of a resume: a new phone number, plus an extra bullet or a changed location"""
+    lines = list(lines)
+    contact = lines[1][1].split(" | ")
+    contact[1] = f"({rng.randint(200, 989)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}"
+    lines[1] = ("body", " | ".join(contact))
+    if rng.random() < 0.5:
+        lines[2] = ("body", rng.choice(["Chicago, IL", "Portland, OR", "Atlanta, GA", "Remote"]))
+    else:
+        bullet = ("body", f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}, improving throughput by "
+                          f"{rng.randint(5, 60)}% across {rng.randint(2, 40)} teams")
+        lines.insert(lines.index(("heading", "EXPERIENCE")) + 2, bullet)
+    return lines
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path, lines):
+    """Write lines as a text PDF, LINES_PER_PAGE per page"""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>",
+               3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+               4: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>"}
+    kids = []
+    for n, page in enumerate(pages):
+        page_id, content_id = 5 + 2 * n, 6 + 2 * n
+        kids.append(f"{page_id} 0 R")
+        ops = ["BT", "14 TL", "50 800 Td"]
+        for style, text in page:
+            font = "/F2 16" if style == "name" else "/F2 11" if style == "heading" else "/F1 10"
+            ops.append(f"{font} Tf ({_pdf_escape(text)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents {content_id} 0 R "
+                            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>").encode()
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id])
+    xref = len(out)
+    size = max(objects) + 1
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    for obj_id in range(1, size):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/></Relationships>'
+)
+
+
+def write_docx(path, lines):
+    """Write lines as a minimal DOCX, with the skills line in a one-row table"""
+    body = []
+    for style, text in lines:
+        run_props = "<w:rPr><w:b/></w:rPr>" if style in ("name", "heading") else ""
+        body.append(f"<w:p><w:r>{run_props}<w:t xml:space=\"preserve\">{escape(text)}</w:t></w:r></w:p>")
+    skills = lines[-1][1].split(", ")
+    cells = "".join(f"<w:tc><w:p><w:r><w:t>{escape(s)}</w:t></w:r></w:p></w:tc>" for s in skills[:4])
+    body[-1] = f"<w:tbl><w:tr>{cells}</w:tr></w:tbl>" + body[-1]
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+        + "".join(body) + "</w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", RELS)
+        archive.writestr("word/document.xml", document)
+
+
+def generate_corpus(directory, count=30, seed=0):
+    """Write count resumes, alternating PDF and DOCX, and return {file name: size class}"""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    corpus = {}
+    for i in range(count):
+        # Cycling sizes (3) against formats (2) covers every size in both formats every 6 files
+        size = list(SIZES)[i % len(SIZES)]
+        lines = resume_lines(rng, size)
+        extension = ".pdf" if i % 2 == 0 else ".docx"
+        name = f"synthetic-{i:04d}-{size}{extension}"
+        (write_pdf if extension == ".pdf" else write_docx)(os.path.join(directory, name), lines)
+        corpus[name] = size
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir")
+    parser.add_argument("--count", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    corpus = generate_corpus(args.output_dir, args.count, args.seed)
+    by_size = {size: sum(1 for s in corpus.values() if s == size) for size in SIZES}
+    print(f"Wrote {len(corpus)} resumes to {args.output_dir}: {by_size}")
+
+
+if __name__ == "__main__":
+    main()
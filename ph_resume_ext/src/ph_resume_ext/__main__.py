@@ -0,0 +1,5 @@
+import sys
+
+from ph_resume_ext.cli import main
+
+sys.exit(main())
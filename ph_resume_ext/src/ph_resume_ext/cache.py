@@ -0,0 +1,144 @@
+"""Content-addressed cache of extraction results."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+from pydantic import ValidationError
+
+from ph_resume_ext.direct_extractor import PACKED_SYSTEM_PROMPT, SYSTEM_PROMPT
+from ph_resume_ext.field_extractor import RULES_VERSION
+from ph_resume_ext.type import Output_format
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), "crews", "resume_crew_pr", "config")
+
+
+def config_version(taxonomy_version: str = "", engine: str = "crew", models: Iterable[Optional[str]] = (),
+                   token_budget: int = 0, packing: bool = False) -> str:
+    """Hash of everything that changes the extracted output: engine, models, prompts, agent config, output schema,
+    compaction budget, fast-path rules and skill taxonomy"""
+    digest = hashlib.sha256(RULES_VERSION.encode("utf-8"))
+    digest.update(taxonomy_version.encode("utf-8"))
+    options = {"engine": engine, "models": [model or "" for model in models], "token_budget": token_budget,
+               "packing": packing}
+    digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+    for prompt in (SYSTEM_PROMPT, PACKED_SYSTEM_PROMPT):
+        digest.update(prompt.encode("utf-8"))
+    for name in ("agents.yaml", "tasks.yaml"):
+        with open(os.path.join(CONFIG_DIR, name), "rb") as f:
+            digest.update(f.read())
+    schema = json.dumps(Output_format.model_json_schema(), sort_keys=True)
+    digest.update(schema.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def file_digest(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Persistent SQLite cache mapping (file bytes, config version) to the extracted output.
+
+    Entries are evicted least-recently-used first once the stored payloads exceed max_bytes. The
+    total payload size is kept in a one-row meta table that triggers update in the same
+    transaction as every write, so checking it does not scan the table.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, version: Optional[str] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version or config_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS extractions ("
+            " key TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON extractions(last_access)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        # Caches made before the running total existed are summed once
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value)"
+                           " SELECT 'bytes', COALESCE(SUM(size), 0) FROM extractions")
+        self._conn.executescript(
+            "CREATE TRIGGER IF NOT EXISTS extractions_insert AFTER INSERT ON extractions BEGIN"
+            " UPDATE meta SET value = value + NEW.size WHERE key = 'bytes'; END;"
+            "CREATE TRIGGER IF NOT EXISTS extractions_delete AFTER DELETE ON extractions BEGIN"
+            " UPDATE meta SET value = value - OLD.size WHERE key = 'bytes'; END;"
+            "CREATE TRIGGER IF NOT EXISTS extractions_update AFTER UPDATE OF size ON extractions BEGIN"
+            " UPDATE meta SET value = value + NEW.size - OLD.size WHERE key = 'bytes'; END;"
+        )
+        self._conn.commit()
+
+    def key_for(self, file_path: str) -> str:
+        return f"{file_digest(file_path)}:{self.version}"
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM extractions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE extractions SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, output: dict) -> bool:
+        """Store output under key; returns False when it does not match Output_format and is not cached"""
+        try:
+            Output_format.model_validate(output)
+        except ValidationError:
+            return False
+        payload = json.dumps(output, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO extractions (key, payload, size, last_access) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET payload = excluded.payload, size = excluded.size,"
+                " last_access = excluded.last_access",
+                (key, payload, len(payload.encode("utf-8")), time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+        return True
+
+    @property
+    def total_bytes(self) -> int:
+        return self._conn.execute("SELECT value FROM meta WHERE key = 'bytes'").fetchone()[0]
+
+    def _evict(self) -> None:
+        total = self.total_bytes
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self._conn.execute("SELECT key, size FROM extractions ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM extractions WHERE key = ?", evicted)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def report(self) -> str:
+        return (f"Cache: {self.hits} hits, {self.misses} misses "
+                f"({self.hit_rate:.1%} hit rate)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,149 @@
+"""Command line entry points, which import the pipeline only once a command runs."""
+import argparse
+import contextlib
+import json
+import os
+import sys
+from typing import List, Optional
+
+# Options that map onto the RESUME_* variables main.py reads, set before it is imported
+ENVIRONMENT = {
+    "input": "RESUME_INPUT_DIR",
+    "output": "RESUME_OUTPUT_DIR",
+    "engine": "RESUME_ENGINE",
+    "workers": "RESUME_MAX_WORKERS",
+    "prefork": "RESUME_PREFORK",
+    "host": "RESUME_SERVICE_HOST",
+    "port": "RESUME_SERVICE_PORT",
+    "queue_size": "RESUME_SERVICE_QUEUE_SIZE",
+    "timeout": "RESUME_SERVICE_TIMEOUT",
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ph_resume_ext", description="Extract structured fields from PDF and DOCX resumes.")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    def pipeline_options(command):
+        command.add_argument("--engine", choices=("crew", "direct"), help="LLM engine (RESUME_ENGINE)")
+        command.add_argument("--workers", type=int, help="Resumes processed at once (RESUME_MAX_WORKERS)")
+        command.add_argument("--prefork", type=int, metavar="N",
+                             help="Run resumes in N worker processes forked after setup (RESUME_PREFORK)")
+
+    run = commands.add_parser("run", help="Extract every resume in the input directory")
+    run.add_argument("--input", help="Directory of resumes (RESUME_INPUT_DIR)")
+    run.add_argument("--output", help="Directory for the results (RESUME_OUTPUT_DIR)")
+    run.add_argument("--incremental", action="store_true", help="Only process new or changed files")
+    run.add_argument("--watch", action="store_true", help="Keep watching the input directory")
+    pipeline_options(run)
+
+    extract = commands.add_parser("extract", help="Extract the given files and print their JSON")
+    extract.add_argument("files", nargs="+", help="PDF or DOCX resumes")
+    extract.add_argument("--server", metavar="URL",
+                         help="Send the files to a running service (serve) instead of starting the pipeline here")
+    pipeline_options(extract)
+
+    serve = commands.add_parser("serve", help="Run the HTTP extraction service")
+    serve.add_argument("--host", help="Interface to listen on (RESUME_SERVICE_HOST)")
+    serve.add_argument("--port", type=int, help="Port to listen on (RESUME_SERVICE_PORT)")
+    serve.add_argument("--queue-size", type=int, help="Uploads allowed to wait for a worker (RESUME_SERVICE_QUEUE_SIZE)")
+    serve.add_argument("--timeout", type=float, help="Seconds before a job times out (RESUME_SERVICE_TIMEOUT)")
+    pipeline_options(serve)
+
+    commands.add_parser("plot", help="Plot the resume flow")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    for option, variable in ENVIRONMENT.items():
+        value = getattr(args, option, None)
+        if value is not None:
+            os.environ[variable] = str(value)
+    if getattr(args, "incremental", False):
+        os.environ["RESUME_INCREMENTAL"] = "1"
+    if getattr(args, "watch", False):
+        os.environ["RESUME_WATCH"] = "1"
+
+    if args.command == "run":
+        from ph_resume_ext.main import kickoff
+        kickoff()
+    elif args.command == "plot":
+        from ph_resume_ext.main import plot
+        plot()
+    elif args.command == "serve":
+        from ph_resume_ext.service import serve
+        serve()
+    elif args.server:
+        return extract_remote(args.server, args.files)
+    else:
+        return extract_local(args.files)
+    return 0
+
+
+def extract_local(files: List[str]) -> int:
+    """Print one JSON result per file; the pipeline's own output goes to stderr"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from ph_resume_ext.main import ResumeFlow
+
+    failed = 0
+    with contextlib.redirect_stdout(sys.stderr):
+        flow = ResumeFlow()
+        flow.prepare()
+        workers = flow.prefork.processes if flow.prefork is not None else flow.state.max_workers
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [pool.submit(flow.extract_tracked, os.path.basename(path), path) for path in files]
+            for path, future in zip(files, futures):
+                try:
+                    record = {"resume": path, "output": future.result()}
+                except Exception as e:
+                    failed += 1
+                    record = {"resume": path, "error": str(e)}
+                print(json.dumps(record, ensure_ascii=False), file=sys.__stdout__, flush=True)
+        flow.finish()
+    return 1 if failed else 0
+
+
+def extract_remote(server: str, files: List[str]) -> int:
+    """POST each file to a running service's /extract, so only the standard library is imported"""
+    import urllib.error
+    import urllib.parse
+    import urllib.request
+
+    failed = 0
+    for path in files:
+        query = urllib.parse.urlencode({"filename": os.path.basename(path)})
+        with open(path, "rb") as f:
+            request = urllib.request.Request(f"{server.rstrip('/')}/extract?{query}", data=f.read(), method="POST")
+        try:
+            with urllib.request.urlopen(request) as response:
+                record = {"resume": path, "output": json.load(response)}
+        except urllib.error.HTTPError as e:
+            failed += 1
+            record = {"resume": path, "error": f"HTTP {e.code}: {e.read().decode('utf-8', 'replace')}"}
+        except urllib.error.URLError as e:
+            failed += 1
+            record = {"resume": path, "error": str(e.reason)}
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+    return 1 if failed else 0
+
+
+def kickoff() -> int:
+    return main(["run", *sys.argv[1:]])
+
+
+def plot() -> int:
+    return main(["plot", *sys.argv[1:]])
+
+
+def serve() -> int:
+    return main(["serve", *sys.argv[1:]])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
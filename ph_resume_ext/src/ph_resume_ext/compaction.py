@@ -0,0 +1,145 @@
+"""Section-aware compaction of resume text before it is sent to the LLM."""
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ph_resume_ext.type import CompactionResult
+
+# Diagnostic lines added by PDFReaderTool that are never part of the resume itself
+DIAGNOSTIC_RE = re.compile(
+    r"^(?:--- .* ---|Text preview:.*|Text length:.*|\[WARNING\].*|Page objects:.*|Resources:.*"
+    r"|Contains XObjects.*)$"
+)
+CONTENT_START = "--- Content Start ---"
+PAGE_BREAK_RE = re.compile(r"^--- Page (?:Break|\d+) ---$", re.MULTILINE)
+
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "objective", "about me", "career objective"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"),
+    "education": ("education", "academic background", "qualifications", "education and training"),
+    "skills": ("skills", "technical skills", "core competencies", "competencies", "technologies",
+               "tools", "key skills", "skills and abilities"),
+    "certifications": ("certifications", "certificates", "licenses", "licences", "licenses and certifications",
+                       "certifications and licenses"),
+    "contact": ("contact", "contact information", "personal details", "personal information"),
+    "other": ("projects", "activities", "awards", "interests", "languages", "publications",
+              "volunteer experience", "references", "achievements"),
+}
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# Output_format field -> the section that holds it
+FIELD_SECTIONS = {
+    "First_Name": "contact", "Last_Name": "contact", "email_address": "contact", "phone_number": "contact",
+    "location": "contact", "linkedin": "contact", "skills": "skills", "summary": "summary",
+    "work_experience": "experience", "education": "education", "certifications": "certifications",
+}
+DEFAULT_PRIORITY = ("contact", "skills", "experience", "education", "summary", "certifications", "other")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English prose)"""
+    return math.ceil(len(text) / 4)
+
+
+def strip_diagnostics(text: str) -> List[List[str]]:
+    """Drop PDFReaderTool metadata and diagnostics and return the remaining lines page by page"""
+    if CONTENT_START in text:
+        text = text.split(CONTENT_START, 1)[1]
+    pages = []
+    # Lean PDF output separates pages with form feeds, the diagnostic output with marker lines
+    for page in PAGE_BREAK_RE.split(text.replace("\f", "\n--- Page Break ---\n")):
+        lines = [line.strip() for line in page.splitlines()]
+        lines = [line for line in lines if line and not DIAGNOSTIC_RE.match(line)]
+        if lines:
+            pages.append(lines)
+    return pages
+
+
+def _edge_key(line: str) -> str:
+    # Page numbers change between pages ("Page 2 of 3"), so compare headers and footers without digits
+    return re.sub(r"\d+", "#", line.lower())
+
+
+def dedupe_headers_footers(pages: List[List[str]], edge: int = 2) -> List[str]:
+    """Join pages, dropping header/footer lines that repeat at the top or bottom of several pages"""
+    if len(pages) < 2:
+        return [line for page in pages for line in page]
+    counts = Counter()
+    for page in pages:
+        counts.update({_edge_key(line) for line in page[:edge] + page[-edge:]})
+    repeated = {key for key, count in counts.items() if count >= max(2, len(pages) // 2)}
+    lines, seen = [], set()
+    for page in pages:
+        for i, line in enumerate(page):
+            key = _edge_key(line)
+            at_edge = i < edge or i >= len(page) - edge
+            if at_edge and key in repeated:
+                if key in seen:
+                    continue
+                seen.add(key)
+            lines.append(line)
+    return lines
+
+
+def _heading(line: str) -> Optional[str]:
+    if len(line) > 40:
+        return None
+    key = re.sub(r"[^a-z& ]", "", line.lower()).replace("&", "and").strip()
+    return _HEADING_LOOKUP.get(key)
+
+
+def split_sections(lines: Iterable[str]) -> List[Tuple[str, List[str]]]:
+    """Split resume lines into (section, lines) in document order; text before any heading is contact"""
+    sections: List[Tuple[str, List[str]]] = [("contact", [])]
+    for line in lines:
+        section = _heading(line)
+        if section:
+            sections.append((section, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, body) for name, body in sections if body]
+
+
+def section_priority(missing_fields: Optional[Iterable[str]] = None) -> List[str]:
+    """Sections holding still-missing fields come first, in the default order, then everything else"""
+    if missing_fields is None:
+        return list(DEFAULT_PRIORITY)
+    needed = {FIELD_SECTIONS[field] for field in missing_fields if field in FIELD_SECTIONS}
+    return [s for s in DEFAULT_PRIORITY if s in needed] + [s for s in DEFAULT_PRIORITY if s not in needed]
+
+
+def compact(text: str, token_budget: Optional[int] = None,
+            missing_fields: Optional[Iterable[str]] = None) -> CompactionResult:
+    """Strip diagnostics, dedupe headers/footers and fit the resume into token_budget by section priority"""
+    tokens_before = estimate_tokens(text)
+    sections = split_sections(dedupe_headers_footers(strip_diagnostics(text)))
+
+    kept: Dict[int, List[str]] = {}
+    remaining = token_budget if token_budget else math.inf
+    truncated = False
+    for name in section_priority(missing_fields):
+        for index, (section, body) in enumerate(sections):
+            if section != name:
+                continue
+            for line in body:
+                cost = estimate_tokens(line + "\n")
+                if cost > remaining:
+                    truncated = True
+                    break
+                kept.setdefault(index, []).append(line)
+                remaining -= cost
+
+    # A heading whose content did not fit only costs tokens; a one-line section such as a lone contact line stays
+    kept = {index: body for index, body in kept.items()
+            if len(body) > 1 or not _heading(body[0]) or len(sections[index][1]) == 1}
+    # Sections follow each other line by line in the source, so they are joined the same way
+    compacted = "\n".join(line for index in sorted(kept) for line in kept[index])
+    return CompactionResult(
+        text=compacted,
+        tokens_before=tokens_before,
+        tokens_after=estimate_tokens(compacted),
+        sections=[sections[index][0] for index in sorted(kept)],
+        truncated=truncated,
+    )
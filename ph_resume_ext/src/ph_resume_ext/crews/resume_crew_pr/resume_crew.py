@@ -1,40 +1,62 @@
 from crewai import Agent, Crew, Process, Task, LLM
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
-import os
+from typing import List, Optional
 from ph_resume_ext.tools.doc_extractor_tool import ExtractTextTool
 from ph_resume_ext.tools.Text_Cleaner import TextCleanerTool
 from ph_resume_ext.tools.pdf_reader_tool import PDFReaderTool
+from ph_resume_ext.compaction import estimate_tokens
+from ph_resume_ext.extraction import PDF_WORKERS
+from ph_resume_ext.llm_scheduler import LLMScheduler
+from ph_resume_ext.settings import Settings
 from ph_resume_ext.type import Output_format
 
+
+class ScheduledLLM(LLM):
+    """crewai LLM whose calls go through an LLMScheduler's rate limits, retries and circuit breaker"""
+
+    def __init__(self, scheduler: LLMScheduler, **kwargs):
+        # LiteLLM's own retries would bypass the rate limits, so the scheduler does all of them
+        super().__init__(max_retries=0, **kwargs)
+        self.scheduler = scheduler
+
+    def call(self, messages, *args, **kwargs):
+        text = messages if isinstance(messages, str) else "\n".join(str(m.get("content") or "") for m in messages)
+        prompt_tokens = estimate_tokens(text)
+
+        def request():
+            answer = LLM.call(self, messages, *args, **kwargs)
+            # crewai keeps the real usage to itself, so both sides are estimated for the token bucket
+            return answer, {"prompt_tokens": prompt_tokens, "completion_tokens": estimate_tokens(str(answer))}
+
+        return self.scheduler.call(self.model, request, prompt_tokens)[0]
+
+
+def build_llm(settings: Settings, model: Optional[str] = None, scheduler: Optional[LLMScheduler] = None) -> LLM:
+    options = dict(
+        model=model or settings.llm_model,             # just "gemini-2.0-flash"
+        api_key=settings.llm_api_key,
+        base_url=settings.llm_base_url,
+        custom_llm_provider=settings.llm_provider  # ✅ tell LiteLLM which backend
+    )
+    if scheduler is not None:
+        return ScheduledLLM(scheduler, **options)
+    return LLM(**options)
+
 @CrewBase
 class ResumeCrew:
     """Resume Crew"""
 
-    # llm = LLM(
-    #     # model=os.getenv("DEPLOYMENT_NAME"),
-    #     # api_key=os.getenv("AZURE_API_KEY"),
-    #     # api_base=os.getenv("AZURE_API_BASE"),
-    #     # api_version=os.getenv("AZURE_API_VERSION"),
-    #     model=f'google/{os.getenv("GEMINI_MODEL")}',
-    #     api_key=os.getenv("GEMINI_API_KEY"),
-    # )
-    from dotenv import load_dotenv
-    load_dotenv(dotenv_path=r"C:\Users\samar\OneDrive\Documents\CrewAI\ph_resume_ext\.env")
-
-    llm = LLM(
-        model=os.getenv("GEMINI_MODEL"),       # just "gemini-2.0-flash"
-        api_key=os.getenv("GEMINI_API_KEY"),
-        custom_llm_provider="gemini"           # ✅ tell LiteLLM which backend
-    )
-
     agents: List[BaseAgent]
     tasks: List[Task]
 
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
+    def __init__(self, llm: Optional[LLM] = None, settings: Optional[Settings] = None):
+        # Building the LLM client is left to the caller so a long-lived pipeline can share one
+        self.llm = llm or build_llm(settings or Settings.from_env())
+
     @agent
     def Extractor_Agent(self) -> Agent:
         return Agent(
@@ -42,7 +64,7 @@ class ResumeCrew:
             verbose=True,
             llm=self.llm,
             tools=[ExtractTextTool(), 
-                   PDFReaderTool()],
+                   PDFReaderTool(lean=True, max_workers=PDF_WORKERS)],
             temperature=0.2
         )
     
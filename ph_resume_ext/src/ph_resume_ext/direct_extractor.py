@@ -0,0 +1,179 @@
+"""Single-call structured extraction, an alternative to the agentic ResumeCrew."""
+import json
+from typing import Dict, List, Optional, Tuple
+
+from ph_resume_ext.compaction import estimate_tokens
+from ph_resume_ext.json_stream import JSONStreamParser
+from ph_resume_ext.llm_scheduler import LLMScheduler
+from ph_resume_ext.telemetry import telemetry
+from ph_resume_ext.type import Output_format, PackedOutput
+
+SYSTEM_PROMPT = (
+    "You extract structured facts from resumes. Reply with exactly one JSON object that matches "
+    "the provided schema and nothing else. Use null for fields the resume does not contain."
+)
+PACKED_SYSTEM_PROMPT = (
+    "You extract structured facts from several resumes at once. Each resume starts with a line "
+    "'### RESUME ID: <id>'. Reply with exactly one JSON object matching the provided schema: a "
+    "'results' array with one object per resume, carrying its resume_id and the facts from that "
+    "resume only. Use null for fields a resume does not contain."
+)
+
+
+class DirectExtractor:
+    """Extract a resume with exactly one structured-output LLM call.
+
+    Text extraction and cleaning run in-process, so the LLM is not asked to plan or to call tools.
+    With stream set, the answer is read as it is generated and the stream is closed as soon as
+    the JSON object is complete, so trailing prose or fences are never waited for. With a
+    scheduler, every request goes through its rate limits, retries and circuit breaker, and
+    LiteLLM's own retries are turned off.
+    """
+
+    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None,
+                 custom_llm_provider: str = "gemini", api_base: Optional[str] = None,
+                 temperature: float = 0.2, stream: bool = True, scheduler: Optional[LLMScheduler] = None):
+        self.model = model
+        self.api_key = api_key
+        self.custom_llm_provider = custom_llm_provider
+        self.api_base = api_base
+        self.temperature = temperature
+        self.stream = stream
+        self.scheduler = scheduler
+
+    def warm_up(self) -> None:
+        """Import what the first completion would otherwise import, e.g. before forking worker processes"""
+        import litellm  # noqa: F401
+        from ph_resume_ext.tools.Text_Cleaner import clean_text  # noqa: F401
+        try:
+            # LiteLLM calls OpenAI-compatible endpoints through the openai SDK, which loads its resources lazily
+            import openai.lib.streaming.chat  # noqa: F401
+            import openai.resources  # noqa: F401
+        except ImportError:
+            pass
+
+    def build_messages(self, text: str, prefilled: Optional[Dict[str, str]] = None,
+                       missing_fields: Optional[List[str]] = None,
+                       skill_candidates: Optional[List[str]] = None) -> List[dict]:
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": self.resume_prompt(text, prefilled, missing_fields, skill_candidates)},
+        ]
+
+    def resume_prompt(self, text: str, prefilled: Optional[Dict[str, str]] = None,
+                      missing_fields: Optional[List[str]] = None,
+                      skill_candidates: Optional[List[str]] = None) -> str:
+        """Known fields, hints and cleaned text of one resume, as sent alone or as part of a pack"""
+        prompt = []
+        if prefilled:
+            prompt.append("These fields are already known and must be returned exactly as given: "
+                          + json.dumps(prefilled, ensure_ascii=False))
+        if missing_fields:
+            prompt.append("Concentrate on extracting: " + ", ".join(missing_fields))
+        if skill_candidates:
+            prompt.append("Skills recognised in the resume by the skill taxonomy, under their canonical names "
+                          "(use these names, and add any other skills the resume lists): " + ", ".join(skill_candidates))
+        # Imported on first use, like litellm below: both pull in crewai or LiteLLM, which take seconds to import
+        from ph_resume_ext.tools.Text_Cleaner import clean_text
+        with telemetry.span("clean_text"):
+            prompt.append("Resume text:\n" + clean_text(text))
+        return "\n\n".join(prompt)
+
+    def build_packed_messages(self, prompts: Dict[str, str]) -> List[dict]:
+        """Messages for one request covering several resumes, given their resume_prompt() under their IDs"""
+        sections = [f"### RESUME ID: {resume_id}\n{prompt}" for resume_id, prompt in prompts.items()]
+        return [
+            {"role": "system", "content": PACKED_SYSTEM_PROMPT},
+            {"role": "user", "content": "\n\n".join(sections)},
+        ]
+
+    def extract(self, text: str, prefilled: Optional[Dict[str, str]] = None,
+                missing_fields: Optional[List[str]] = None,
+                skill_candidates: Optional[List[str]] = None,
+                model: Optional[str] = None) -> Tuple[str, Dict[str, int]]:
+        """Return the raw JSON answer and the token usage of the single call, made to model or the default"""
+        messages = self.build_messages(text, prefilled, missing_fields, skill_candidates)
+        return self._complete(messages, Output_format, model)
+
+    def extract_packed(self, prompts: Dict[str, str]) -> Tuple[str, Dict[str, int]]:
+        """Return the raw JSON answer for several resumes sent in one call, and its token usage"""
+        return self._complete(self.build_packed_messages(prompts), PackedOutput)
+
+    def _complete(self, messages: List[dict], response_format, model: Optional[str] = None) -> Tuple[str, Dict[str, int]]:
+        model = model or self.model
+        if self.scheduler is None:
+            return self._request(messages, response_format, model)
+        prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+        return self.scheduler.call(model, lambda: self._request(messages, response_format, model), prompt_tokens)
+
+    def _request(self, messages: List[dict], response_format, model: Optional[str]) -> Tuple[str, Dict[str, int]]:
+        if self.stream:
+            return self._complete_streaming(messages, response_format, model)
+        import litellm
+        response = litellm.completion(
+            model=model,
+            api_key=self.api_key,
+            custom_llm_provider=self.custom_llm_provider,
+            api_base=self.api_base,
+            messages=messages,
+            response_format=response_format,
+            temperature=self.temperature,
+            max_retries=0 if self.scheduler is not None else None,
+        )
+        return response.choices[0].message.content or "", _usage(getattr(response, "usage", None))
+
+    def _complete_streaming(self, messages: List[dict], response_format, model: Optional[str]) -> Tuple[str, Dict[str, int]]:
+        """Read the answer chunk by chunk, stopping at the end of the first JSON object"""
+        import litellm
+        response = litellm.completion(
+            model=model,
+            api_key=self.api_key,
+            custom_llm_provider=self.custom_llm_provider,
+            api_base=self.api_base,
+            messages=messages,
+            response_format=response_format,
+            temperature=self.temperature,
+            max_retries=0 if self.scheduler is not None else None,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        parser = JSONStreamParser()
+        usage = None
+        try:
+            for chunk in response:
+                usage = getattr(chunk, "usage", None) or usage
+                choices = getattr(chunk, "choices", None)
+                if choices and parser.feed(getattr(choices[0].delta, "content", None) or ""):
+                    telemetry.count("stream_cutoffs")
+                    break
+        finally:
+            _close_stream(response)
+        text = parser.text if parser.complete else parser.raw
+        counted = _usage(usage)
+        if not counted["total_tokens"]:
+            # The usage chunk comes last, so a stream cut off early has to be estimated
+            prompt = sum(estimate_tokens(message["content"]) for message in messages)
+            completion = estimate_tokens(text)
+            counted.update(prompt_tokens=prompt, completion_tokens=completion, total_tokens=prompt + completion)
+        return text, counted
+
+
+def _usage(usage) -> Dict[str, int]:
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+        "llm_calls": 1,
+    }
+
+
+def _close_stream(response) -> None:
+    """Drop the HTTP connection of a stream that is no longer read, so the provider stops generating"""
+    stream = getattr(response, "completion_stream", None)
+    for target in (stream, getattr(stream, "response", None), getattr(response, "response", None)):
+        close = getattr(target, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
@@ -0,0 +1,300 @@
+"""Vectorised scoring of extraction outputs against golden records."""
+import json
+import os
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ph_resume_ext.skills import SkillTaxonomy
+
+# Scored fields, under the lower-cased key both golden records ("Email_Address") and outputs ("email_address") share
+EXACT_FIELDS = {"first_name": "first_name_acc", "last_name": "last_name_acc", "email_address": "email_acc"}
+SKILLS_FIELD = "skills"
+SCORE_COLUMNS = ["resume", *EXACT_FIELDS.values(), "skills_precision", "skills_recall", "skills_f1",
+                 "skills_exact_precision", "skills_exact_recall", "skills_exact_f1"]
+
+# Files per task handed to a loader process; large enough to amortise the pickling round trip
+LOAD_CHUNK = 512
+
+
+def normalise_record(record: dict) -> dict:
+    """Lower-case the keys once and keep only the scored fields"""
+    if not isinstance(record, dict):
+        return {}
+    lowered = {key.lower(): value for key, value in record.items()}
+    normalised = {field: lowered.get(field) for field in EXACT_FIELDS}
+    skills = lowered.get(SKILLS_FIELD)
+    normalised[SKILLS_FIELD] = skills if isinstance(skills, list) else []
+    return normalised
+
+
+def _load_json_files(directory: str, names: List[str]) -> List[Tuple[str, dict]]:
+    """Worker: read and normalise a chunk of per-resume JSON files"""
+    records = []
+    prefix = os.path.join(directory, "")
+    for name in names:
+        # Unbuffered readall() is one read into an exactly sized buffer, the cheapest way to slurp a small file
+        with open(f"{prefix}{name}.json", "rb", buffering=0) as f:
+            try:
+                record = json.loads(f.readall())
+            except json.JSONDecodeError:
+                record = {}
+        records.append((name, normalise_record(record)))
+    return records
+
+
+def _frame(records: Iterable[Tuple[str, dict]]) -> pd.DataFrame:
+    records = list(records)
+    frame = pd.DataFrame.from_records(
+        [record for _, record in records],
+        index=pd.Index([name for name, _ in records], name="resume"),
+        columns=[*EXACT_FIELDS, SKILLS_FIELD],
+    )
+    return frame[~frame.index.duplicated(keep="last")]
+
+
+def json_dir_signatures(directory: str, stat: bool = True) -> Dict[str, str]:
+    """Map each <name>.json in directory to a size/mtime signature, using one stat per file (none without stat)"""
+    if not stat:
+        return {f[:-5]: "" for f in os.listdir(directory) if f.endswith(".json")}
+    signatures = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(".json"):
+                info = entry.stat()
+                signatures[entry.name[:-5]] = f"{info.st_size}:{info.st_mtime_ns}"
+    return signatures
+
+
+def load_json_dir(directory: str, names: Optional[Iterable[str]] = None, max_workers: int = 1) -> pd.DataFrame:
+    """Load per-resume JSON files (all of them, or only names) across a process pool when max_workers > 1"""
+    if names is None:
+        names = [f[:-5] for f in os.listdir(directory) if f.endswith(".json")]
+    names = list(names)
+    chunks = [names[i:i + LOAD_CHUNK] for i in range(0, len(names), LOAD_CHUNK)]
+    if max_workers <= 1 or len(chunks) < 2:
+        return _frame(record for chunk in chunks for record in _load_json_files(directory, chunk))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        loaded = pool.map(_load_json_files, [directory] * len(chunks), chunks)
+        return _frame(record for records in loaded for record in records)
+
+
+def load_sink(path: str) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """Load a results.jsonl or results.sqlite sink, with a payload checksum per resume as its signature"""
+    records, signatures = {}, {}
+    if path.endswith(".sqlite"):
+        with sqlite3.connect(path) as conn:
+            for name, payload in conn.execute("SELECT resume, payload FROM results"):
+                signatures[name] = format(zlib.crc32(payload.encode("utf-8")), "x")
+                records[name] = normalise_record(json.loads(payload))
+    else:
+        with open(path, "rb") as f:
+            for line in f:
+                # A trailing line without its newline is still being written
+                if not line.endswith(b"\n"):
+                    break
+                record = json.loads(line)
+                # Later lines win, as a re-processed resume is appended again
+                signatures[record["resume"]] = format(zlib.crc32(line), "x")
+                records[record["resume"]] = normalise_record(record["output"])
+    return _frame(records.items()), signatures
+
+
+def _as_text(column: pd.Series) -> pd.Series:
+    return column.where(column.notna(), "").astype(str).str.strip().str.lower()
+
+
+def _skill_keys(skill_lists: pd.Series, item_codes: np.ndarray, expansions: List[np.ndarray], width: int) -> np.ndarray:
+    """Distinct position * width + skill_code keys, one per (resume, canonical lower-cased skill).
+
+    item_codes index the distinct skill strings, and expansions[code] holds the canonical
+    skill codes one string stands for (usually one; "Python (NumPy)" stands for two).
+    """
+    lengths = np.fromiter(map(len, skill_lists), dtype=np.int64, count=len(skill_lists))
+    positions = np.repeat(np.arange(len(skill_lists), dtype=np.int64), lengths)
+    counts = np.fromiter(map(len, expansions), dtype=np.int64, count=len(expansions))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])) if len(counts) else counts
+    flat = np.concatenate(expansions) if expansions else np.zeros(0, dtype=np.int64)
+    item_counts = counts[item_codes]
+    # Offset of each expanded entry within its item, added to the item's start in flat
+    offsets = np.arange(item_counts.sum()) - np.repeat(np.cumsum(item_counts) - item_counts, item_counts)
+    skill_codes = flat[np.repeat(starts[item_codes], item_counts) + offsets]
+    keys = np.sort(np.repeat(positions, item_counts) * width + skill_codes)
+    # Sorting and dropping neighbours is several times faster than np.unique's hashing here
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+
+
+def _skill_counts(pred: pd.Series, truth: pd.Series,
+                  taxonomy: Optional[SkillTaxonomy]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Matched, predicted and golden skill counts per resume"""
+    # Factorise every skill string once, then canonicalise and lower-case only the distinct values,
+    # so sets of skills become integer keys that numpy can intersect and count per resume
+    flat = list(chain.from_iterable(chain(pred, truth)))
+    codes, uniques = pd.factorize(np.array(flat, dtype=object))
+    canonical = [[str(skill)] if taxonomy is None else taxonomy.expand(str(skill)) for skill in uniques]
+    canonical_codes, _ = pd.factorize(pd.Index(list(chain.from_iterable(canonical)), dtype=object).str.lower())
+    bounds = np.cumsum([0, *map(len, canonical)])
+    expansions = [canonical_codes[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    n_pred_skills = sum(map(len, pred))
+    width = canonical_codes.max(initial=0) + 1
+    pred_keys = _skill_keys(pred, codes[:n_pred_skills], expansions, width)
+    truth_keys = _skill_keys(truth, codes[n_pred_skills:], expansions, width)
+    matched = np.intersect1d(pred_keys, truth_keys, assume_unique=True)
+
+    tp = np.bincount(matched // width, minlength=len(pred)).astype(float)
+    n_pred = np.bincount(pred_keys // width, minlength=len(pred)).astype(float)
+    n_truth = np.bincount(truth_keys // width, minlength=len(pred)).astype(float)
+    return tp, n_pred, n_truth
+
+
+def score(predictions: pd.DataFrame, golden: pd.DataFrame, taxonomy: Optional[SkillTaxonomy] = None) -> pd.DataFrame:
+    """Score every prediction that has a golden record, as column operations over all resumes at once.
+
+    With a taxonomy, skills are compared under their canonical names, so aliases such as
+    "Amazon Web Services (AWS)" and "AWS" match. The skills_exact_* columns always compare the
+    strings themselves (ignoring case), so the taxonomy's share of the score stays visible.
+    """
+    names = predictions.index.intersection(golden.index)
+    pred, truth = predictions.loc[names], golden.loc[names]
+    scores = pd.DataFrame(index=names)
+    for field, column in EXACT_FIELDS.items():
+        scores[column] = (_as_text(pred[field]) == _as_text(truth[field])).astype(int)
+
+    exact = _skill_counts(pred[SKILLS_FIELD], truth[SKILLS_FIELD], None)
+    counts = exact if taxonomy is None else _skill_counts(pred[SKILLS_FIELD], truth[SKILLS_FIELD], taxonomy)
+    for prefix, (tp, n_pred, n_truth) in (("skills", counts), ("skills_exact", exact)):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = np.where(n_pred > 0, tp / n_pred, 0.0)
+            recall = np.where(n_truth > 0, tp / n_truth, 0.0)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+        scores[f"{prefix}_precision"] = precision
+        scores[f"{prefix}_recall"] = recall
+        scores[f"{prefix}_f1"] = f1
+        scores[f"{prefix}_tp"], scores[f"{prefix}_pred"], scores[f"{prefix}_truth"] = tp, n_pred, n_truth
+    return scores.rename_axis("resume").reset_index()
+
+
+def field_metrics(scores: pd.DataFrame) -> Dict[str, float]:
+    """Per-field accuracy, macro skill precision/recall/F1 and micro skill F1 over all scored resumes,
+    alias-aware and on exact strings"""
+    if scores.empty:
+        return {}
+    metrics = {column: float(scores[column].mean()) for column in EXACT_FIELDS.values()}
+    for prefix in ("skills", "skills_exact"):
+        for column in (f"{prefix}_precision", f"{prefix}_recall", f"{prefix}_f1"):
+            metrics[column] = float(scores[column].mean())
+        tp, n_pred, n_truth = (float(scores[f"{prefix}_{c}"].sum()) for c in ("tp", "pred", "truth"))
+        precision = tp / n_pred if n_pred else 0.0
+        recall = tp / n_truth if n_truth else 0.0
+        metrics[f"{prefix}_micro_f1"] = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return metrics
+
+
+class Evaluator:
+    """Scores predictions against golden records, optionally re-scoring only pairs that changed.
+
+    predictions is a directory of <name>.json outputs, or a results.jsonl / results.sqlite sink;
+    golden is a directory of <name>.json records. With a state_path, scores and the signatures of
+    the inputs they came from are kept in SQLite, so changed_only runs load and score just the
+    pairs whose prediction or golden record changed since the last run. A taxonomy makes skill
+    matching alias-aware; changing it re-scores every pair.
+    """
+
+    def __init__(self, predictions: str, golden: str, state_path: Optional[str] = None, max_workers: int = 1,
+                 taxonomy: Optional[SkillTaxonomy] = None):
+        self.predictions = predictions
+        self.golden = golden
+        self.state_path = state_path
+        self.max_workers = max_workers
+        self.taxonomy = taxonomy
+
+    def _previous(self) -> pd.DataFrame:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return pd.DataFrame()
+        with sqlite3.connect(self.state_path) as conn:
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'scores'").fetchone()
+            previous = pd.read_sql("SELECT * FROM scores", conn) if exists else pd.DataFrame()
+        # Scores saved before a column was added are recomputed rather than reused
+        return previous if set(SCORE_COLUMNS) <= set(previous.columns) else pd.DataFrame()
+
+    def run(self, changed_only: bool = False) -> Tuple[pd.DataFrame, dict]:
+        """Return per-resume scores and a report with per-field metrics and per-stage timings"""
+        timings = {}
+        started = time.perf_counter()
+
+        # Signatures are only needed to detect changes on a later run, so skip the stat calls without state
+        track = bool(self.state_path)
+        gold_sigs = json_dir_signatures(self.golden, stat=track)
+        sink_frame = None
+        if os.path.isdir(self.predictions):
+            pred_sigs = json_dir_signatures(self.predictions, stat=track)
+        else:
+            sink_frame, pred_sigs = load_sink(self.predictions)
+        names = sorted(pred_sigs.keys() & gold_sigs.keys())
+        signatures = pd.DataFrame(
+            {"pred_sig": [pred_sigs[n] for n in names], "gold_sig": [gold_sigs[n] for n in names],
+             "taxonomy": self.taxonomy.fingerprint() if self.taxonomy is not None else ""},
+            index=pd.Index(names, name="resume"),
+        )
+
+        previous = self._previous() if changed_only else pd.DataFrame()
+        todo = names
+        if not previous.empty:
+            known = previous.set_index("resume").reindex(index=names, columns=signatures.columns)
+            changed = (known != signatures).any(axis=1)
+            todo = list(signatures.index[changed.to_numpy()])
+
+        stage = time.perf_counter()
+        if sink_frame is None:
+            predictions = load_json_dir(self.predictions, todo, self.max_workers)
+        else:
+            predictions = sink_frame.loc[sink_frame.index.intersection(todo)]
+        timings["scan_s"] = stage - started
+        golden = load_json_dir(self.golden, todo, self.max_workers)
+        timings["load_s"] = time.perf_counter() - stage
+
+        stage = time.perf_counter()
+        fresh = score(predictions, golden, self.taxonomy)
+        fresh = fresh.join(signatures, on="resume")
+        if not previous.empty:
+            # Unchanged pairs keep their previous scores; pairs that no longer exist are dropped
+            kept = previous[previous["resume"].isin(names) & ~previous["resume"].isin(todo)]
+            scores = pd.concat([kept, fresh], ignore_index=True) if not kept.empty else fresh
+        else:
+            scores = fresh
+        scores = scores.sort_values("resume", ignore_index=True)
+        timings["score_s"] = time.perf_counter() - stage
+
+        if self.state_path:
+            stage = time.perf_counter()
+            with sqlite3.connect(self.state_path) as conn:
+                scores.to_sql("scores", conn, if_exists="replace", index=False)
+            timings["save_s"] = time.perf_counter() - stage
+        timings["total_s"] = time.perf_counter() - started
+
+        report = {
+            "pairs": len(names),
+            "scored": len(fresh),
+            "reused": len(scores) - len(fresh),
+            "unmatched_predictions": len(pred_sigs) - len(names),
+            "metrics": field_metrics(scores),
+            "timings": timings,
+        }
+        return scores, report
+
+
+def format_report(report: dict) -> str:
+    """Per-field metrics and timings as printable lines"""
+    lines = [
+        f"Pairs: {report['pairs']} ({report['scored']} scored, {report['reused']} reused from the last run, "
+        f"{report['unmatched_predictions']} predictions without a golden record)"
+    ]
+    lines += [f"{name:22} {value:.4f}" for name, value in report["metrics"].items()]
+    lines.append("Timings: " + ", ".join(f"{name} {value:.3f}" for name, value in report["timings"].items()))
+    return "\n".join(lines)
@@ -0,0 +1,30 @@
+"""In-process text extraction for resume files."""
+import os
+
+from ph_resume_ext.telemetry import telemetry
+
+# Processes used to extract pages of long PDFs in parallel; 1 keeps extraction in-process
+PDF_WORKERS = int(os.getenv("RESUME_PDF_WORKERS", "1"))
+
+
+def extract_text(file_path: str) -> str:
+    """Return the raw text of a PDF or DOCX resume using the same tools the crew uses.
+
+    A missing, unreadable or textless file raises rather than returning the tools' error
+    messages, which would otherwise be extracted, sent to the LLM and cached as resume text.
+    """
+    # The tools subclass crewai's BaseTool, so they are imported on first use rather than with this module
+    format_type = os.path.splitext(file_path)[1].lower()
+    if format_type == ".pdf":
+        from ph_resume_ext.tools.pdf_reader_tool import PDFReaderTool
+        with telemetry.span("pdf_text"):
+            text = PDFReaderTool(lean=True, max_workers=PDF_WORKERS).read(file_path)
+    elif format_type == ".docx":
+        from ph_resume_ext.tools.doc_extractor_tool import ExtractTextTool
+        with telemetry.span("docx_text"):
+            text = ExtractTextTool().extract_text_from_docx(file_path)
+    else:
+        raise ValueError(f"Unsupported file type for {file_path}. Only .pdf and .docx are supported.")
+    if not text.strip():
+        raise ValueError(f"No text extracted from {file_path}; it may be image-based")
+    return text
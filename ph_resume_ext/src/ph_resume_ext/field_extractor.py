@@ -0,0 +1,118 @@
+"""Rule-based extraction of contact fields, run before the LLM."""
+import re
+from typing import Dict, List, Optional
+
+from ph_resume_ext.compaction import CONTENT_START, DIAGNOSTIC_RE
+from ph_resume_ext.type import PrefilledField
+
+# Bump when the rules change so cached extractions built with older rules are invalidated
+RULES_VERSION = "2"
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(
+    r"(?<![\w+])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{3}\)|\d{3})[\s.-]?\d{3}[\s.-]?\d{4}(?!\w)"
+)
+LINKEDIN_RE = re.compile(
+    r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/[A-Za-z0-9_%-]+/?",
+    re.IGNORECASE,
+)
+NAME_TOKEN_RE = re.compile(r"[A-Z][A-Za-z'\-]*\.?$")
+
+SECTION_WORDS = {
+    "resume", "curriculum", "vitae", "cv", "summary", "profile", "objective", "experience",
+    "work", "education", "skills", "certifications", "projects", "contact", "linkedin",
+}
+
+HIGH_CONFIDENCE = 0.9
+
+
+def _content_lines(text: str) -> List[str]:
+    if CONTENT_START in text:
+        text = text.split(CONTENT_START, 1)[1]
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not DIAGNOSTIC_RE.match(line):
+            lines.append(line)
+    return lines
+
+
+def _name_candidates(lines: List[str]) -> List[tuple]:
+    """Short, capitalised lines near the top of the resume that could be the candidate's name"""
+    candidates = []
+    for line in lines[:40]:
+        tokens = line.split()
+        if not 2 <= len(tokens) <= 4:
+            continue
+        if any(t.lower().strip(".,") in SECTION_WORDS for t in tokens):
+            continue
+        if all(NAME_TOKEN_RE.match(t) for t in tokens):
+            first, last = tokens[0], tokens[-1]
+            if line.isupper():
+                first, last = first.title(), last.title()
+            candidates.append((first, last))
+    return candidates
+
+
+def _matches_email(name, email: Optional[str]) -> bool:
+    if not name or not email:
+        return False
+    local = email.split("@", 1)[0].lower()
+    return any(len(part) > 2 and part.lower() in local for part in name)
+
+
+def _extract_email(text: str, name) -> tuple:
+    emails = list(dict.fromkeys(m.group(0).strip(".") for m in EMAIL_RE.finditer(text)))
+    if not emails:
+        return None, 0.0
+    email = emails[0]
+    confidence = 0.95 if len(emails) == 1 else 0.75
+    local, domain = email.split("@", 1)
+    if name and "." in local:
+        # PDF text often glues the previous sentence onto the address ("users.tmathers@...")
+        first, last = (part.lower() for part in name)
+        head, tail = local.split(".", 1)
+        if (last in tail.lower() or first in tail.lower()) and not (last in head.lower() or first in head.lower()):
+            email = f"{tail}@{domain}"
+            confidence = 0.85
+    return email, confidence
+
+
+def extract_fields(text: str) -> Dict[str, PrefilledField]:
+    """Extract Output_format contact fields from raw resume text with a confidence per field"""
+    fields: Dict[str, PrefilledField] = {}
+    if not text:
+        return fields
+
+    lines = _content_lines(text)
+    body = "\n".join(lines)
+    candidates = _name_candidates(lines)
+    email = EMAIL_RE.search(body)
+    # An email address built from the name is strong evidence the line really is the name
+    name = next((c for c in candidates if email and _matches_email(c, email.group(0))), None)
+    name_confidence = 0.95
+    if name is None and candidates:
+        name, name_confidence = candidates[0], 0.7
+
+    email, email_confidence = _extract_email(body, name)
+    if email:
+        fields["email_address"] = PrefilledField(value=email, confidence=email_confidence)
+
+    if name:
+        first, last = name
+        fields["First_Name"] = PrefilledField(value=first, confidence=name_confidence)
+        fields["Last_Name"] = PrefilledField(value=last, confidence=name_confidence)
+
+    phones = list(dict.fromkeys(m.group(0) for m in PHONE_RE.finditer(body)))
+    if phones:
+        fields["phone_number"] = PrefilledField(value=phones[0], confidence=0.9 if len(phones) == 1 else 0.7)
+
+    linkedin = LINKEDIN_RE.search(body)
+    if linkedin:
+        fields["linkedin"] = PrefilledField(value=linkedin.group(0), confidence=0.95)
+
+    return fields
+
+
+def confident_values(fields: Dict[str, PrefilledField], threshold: float = HIGH_CONFIDENCE) -> Dict[str, str]:
+    return {name: field.value for name, field in fields.items() if field.confidence >= threshold}
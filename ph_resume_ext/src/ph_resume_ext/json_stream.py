@@ -0,0 +1,219 @@
+"""Incremental parsing and lenient repair of JSON answers from the LLM."""
+import json
+import re
+from typing import Any, List, Tuple
+
+# Characters that change the parser's state; everything between them is copied in bulk
+_SIGNIFICANT_RE = re.compile(r'[\\"{}\[\]]')
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_$][\w$.-]*")
+# Numbers as JSON writes them, plus the forms JavaScript and Python also accept (+1, .5, 1.)
+_NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_LITERALS = {"true": "true", "false": "false", "null": "null", "True": "true", "False": "false", "None": "null",
+             "NaN": "null", "Infinity": "null", "undefined": "null"}
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+class JSONStreamParser:
+    """Finds the first top-level JSON object in text that arrives in chunks.
+
+    Everything before the first "{" (a Markdown fence, "Final Answer:", prose) is skipped, and
+    feed() returns True as soon as the object's closing brace arrives, so the caller can stop
+    reading the stream there. Braces inside strings are ignored.
+    """
+
+    def __init__(self):
+        self.raw_parts: List[str] = []
+        self._parts: List[str] = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.complete = False
+
+    @property
+    def raw(self) -> str:
+        """Everything fed so far"""
+        return "".join(self.raw_parts)
+
+    @property
+    def text(self) -> str:
+        """The object so far: complete once feed() has returned True, else a truncated prefix"""
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> bool:
+        if not chunk:
+            return self.complete
+        self.raw_parts.append(chunk)
+        if self.complete:
+            return True
+        position = 0
+        if not self._started:
+            position = chunk.find("{")
+            if position < 0:
+                return False
+            self._started = True
+        start = position
+        if self._escape:
+            # The previous chunk ended with a backslash inside a string, so skip the escaped character
+            self._escape = False
+            position += 1
+        search = _SIGNIFICANT_RE.search
+        while True:
+            match = search(chunk, position)
+            if match is None:
+                break
+            char, index = match.group(), match.start()
+            position = index + 1
+            if self._in_string:
+                if char == "\\":
+                    self._escape = index + 1 == len(chunk)
+                    position = index + 2
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(chunk[start:index + 1])
+                    self.complete = True
+                    return True
+        self._parts.append(chunk[start:])
+        return False
+
+
+def repair_json(text: str) -> str:
+    """Fix the usual ways LLM JSON goes wrong, so json.loads can read it.
+
+    Handles single-quoted strings, Python and JavaScript literals (True, None, NaN), unquoted keys,
+    comments, trailing commas, smart quotes, raw newlines inside strings and output truncated
+    mid-object (open strings and brackets are closed).
+    """
+    text = text.translate(_SMART_QUOTES)
+    out: List[str] = []
+    stack: List[str] = []
+    i, n = 0, len(text)
+    while i < n:
+        char = text[i]
+        if char in "\"'":
+            value, i = _read_string(text, i)
+            out.append(json.dumps(value, ensure_ascii=False))
+            continue
+        if char == "/" and text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if char == "/" and text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        if char in "{[":
+            stack.append("}" if char == "{" else "]")
+            out.append(char)
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(char)
+        elif char.isdigit() or (char in "-+." and _NUMBER_RE.match(text, i)):
+            # Read whole, so the exponent of 1e5 is not taken for an unquoted word
+            number = _NUMBER_RE.match(text, i).group()
+            i += len(number)
+            sign = "-" if number[0] == "-" else ""
+            number = number.lstrip("+-")
+            out.append(sign + ("0" + number if number[0] == "." else number) + ("0" if number[-1] == "." else ""))
+            continue
+        elif char.isalpha() or char in "_$":
+            word = _IDENTIFIER_RE.match(text, i).group()
+            i += len(word)
+            rest = text[i:i + 64].lstrip()
+            if rest.startswith(":"):
+                out.append(json.dumps(word))
+            else:
+                out.append(_LITERALS.get(word, json.dumps(word)))
+            continue
+        else:
+            out.append(char)
+        i += 1
+
+    # Truncated output: drop a dangling comma or key, then close whatever is still open
+    significant = [token for token in out if not token.isspace()]
+    if (stack and stack[-1] == "}" and len(significant) > 1 and significant[-1].startswith('"')
+            and significant[-2] in ("{", ",")):
+        while out[-1].isspace():
+            out.pop()
+        out.pop()
+    while out and out[-1].isspace():
+        out.pop()
+    _drop_trailing_comma(out)
+    if out and out[-1] == ":":
+        out.append("null")
+    for closer in reversed(stack):
+        out.append(closer)
+    return "".join(out)
+
+
+def _read_string(text: str, start: int) -> Tuple[str, int]:
+    """Decode a quoted string starting at text[start], returning it and the index after it"""
+    quote = text[start]
+    chars: List[str] = []
+    i, n = start + 1, len(text)
+    while i < n:
+        char = text[i]
+        if char == "\\" and i + 1 < n:
+            escaped = text[i + 1]
+            if escaped == "u" and i + 6 <= n:
+                try:
+                    chars.append(chr(int(text[i + 2:i + 6], 16)))
+                    i += 6
+                    continue
+                except ValueError:
+                    pass
+            chars.append({"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}.get(escaped, escaped))
+            i += 2
+            continue
+        if char == quote:
+            return "".join(chars), i + 1
+        chars.append(char)
+        i += 1
+    return "".join(chars), n
+
+
+def _drop_trailing_comma(out: List[str]) -> None:
+    j = len(out) - 1
+    while j >= 0 and out[j].isspace():
+        j -= 1
+    if j >= 0 and out[j] == ",":
+        del out[j]
+
+
+def _reject_constant(name: str) -> None:
+    # json.loads accepts NaN and Infinity, but they are not JSON; repair turns them into null
+    raise ValueError(f"{name} is not valid JSON")
+
+
+def parse_json(text: str) -> Tuple[Any, bool]:
+    """The first JSON object in an LLM answer, and whether it had to be repaired.
+
+    Markdown fences and surrounding prose are skipped. Raises ValueError when nothing that
+    looks like a JSON object can be recovered.
+    """
+    if not isinstance(text, str):
+        raise ValueError("LLM answer is not text")
+    parser = JSONStreamParser()
+    parser.feed(text)
+    candidate = parser.text
+    if not candidate:
+        raise ValueError("No JSON object in LLM answer")
+    if parser.complete:
+        try:
+            return json.loads(candidate, parse_constant=_reject_constant), False
+        except ValueError:
+            pass
+    try:
+        return json.loads(repair_json(candidate)), True
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Unrepairable JSON in LLM answer: {e}") from e
@@ -0,0 +1,317 @@
+"""Rate limits, retries, circuit breaking and a model cascade in front of every LLM call."""
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ph_resume_ext.telemetry import telemetry
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server-side failures
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+# LiteLLM and openai exceptions raised for the same conditions, matched by name so neither is imported here
+RETRY_ERRORS = {"RateLimitError", "Timeout", "APITimeoutError", "APIConnectionError", "ServiceUnavailableError",
+                "InternalServerError", "TimeoutError", "ConnectionError"}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a model whose circuit breaker is open"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at per_minute units a minute.
+
+    reserve() takes the units at once, going into debt if need be, and returns how long the
+    caller must wait for them, so concurrent callers queue up in order without holding the lock
+    while they sleep. At most burst_s seconds' worth is saved up, so a provider that counts per
+    minute does not see a minute's requests arrive together. A per_minute of 0 disables it.
+    """
+
+    def __init__(self, per_minute: float, burst_s: float = 1.0):
+        self.per_minute = per_minute
+        self.capacity = max(1.0, per_minute * burst_s / 60)
+        self.available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        if self.per_minute <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.available = min(self.capacity, self.available + (now - self._updated) * self.per_minute / 60)
+            self._updated = now
+            self.available -= amount
+            return max(0.0, -self.available) * 60 / self.per_minute
+
+    def adjust(self, amount: float) -> None:
+        """Take (or with a negative amount, give back) units once the real cost of a call is known"""
+        if self.per_minute <= 0:
+            return
+        with self._lock:
+            self.available = min(self.capacity, self.available - amount)
+
+
+class CircuitBreaker:
+    """Opens after failures consecutive failed calls and lets one probe through every reset_s seconds.
+
+    While open, calls fail at once instead of adding load to a provider that is already failing;
+    a successful probe closes the circuit again.
+    """
+
+    def __init__(self, failures: int = 5, reset_s: float = 30.0):
+        self.failures = failures
+        self.reset_s = reset_s
+        self.state = CLOSED
+        self._failed = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED or self.failures <= 0:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_s:
+                self.state = HALF_OPEN
+                return True
+            return False
+
+    def success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self._failed = 0
+
+    def failure(self) -> None:
+        with self._lock:
+            self._failed += 1
+            if self.state == HALF_OPEN or (self.failures > 0 and self._failed >= self.failures):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+
+def retriable(error: BaseException) -> bool:
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRY_STATUS
+    return any(cls.__name__ in RETRY_ERRORS for cls in type(error).__mro__)
+
+
+def retry_after(error: BaseException) -> float:
+    """Seconds from the Retry-After header of a rate-limited response, or 0"""
+    # LiteLLM keeps the provider's headers on the exception; its .response is often a placeholder
+    headers = (getattr(error, "litellm_response_headers", None)
+               or getattr(getattr(error, "response", None), "headers", None) or {})
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_prices(spec: str) -> Dict[str, Tuple[float, float]]:
+    """Parse "model=prompt/completion,..." USD prices per million tokens"""
+    prices = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        model, _, price = item.rpartition("=")
+        prompt, _, completion = price.partition("/")
+        prices[model.strip()] = (float(prompt), float(completion or prompt))
+    return prices
+
+
+class ModelRoute:
+    """Rate limits and circuit breaker of one model"""
+
+    __slots__ = ("model", "requests", "tokens", "breaker")
+
+    def __init__(self, model: str, rpm: float, tpm: float, breaker_failures: int, breaker_reset_s: float):
+        self.model = model
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.breaker = CircuitBreaker(breaker_failures, breaker_reset_s)
+
+
+class LLMScheduler:
+    """Sends LLM calls through per-model rate limits, retries and circuit breakers, down a model cascade.
+
+    Every call first reserves a request and its estimated prompt tokens from the model's
+    requests-per-minute and tokens-per-minute buckets (the token estimate is corrected once the
+    usage is known). Failures that are worth retrying (timeouts, 429 and 5xx responses) are
+    retried up to max_retries times with full-jitter exponential backoff, or after the server's
+    Retry-After when that is longer; all but rate limiting count towards the model's circuit breaker.
+    cascade() tries the configured models in order, cheapest first, and only moves on when a
+    model fails or its answer does not validate. Requests, outcomes, latency, tokens and cost
+    are recorded per model in the telemetry metrics, so worker processes are included too.
+    """
+
+    def __init__(self, models: List[str], rpm: float = 0, tpm: float = 0, max_retries: int = 3,
+                 backoff_s: float = 1.0, backoff_max_s: float = 30.0, breaker_failures: int = 5,
+                 breaker_reset_s: float = 30.0, prices: Optional[Dict[str, Tuple[float, float]]] = None,
+                 custom_llm_provider: Optional[str] = None):
+        self.models = [model for model in models if model] or [None]
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self.breaker_failures = breaker_failures
+        self.breaker_reset_s = breaker_reset_s
+        self.prices = prices or {}
+        self.custom_llm_provider = custom_llm_provider
+        self._routes: Dict[Optional[str], ModelRoute] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings) -> "LLMScheduler":
+        return cls(
+            settings.llm_cascade or [settings.llm_model],
+            rpm=settings.llm_rpm,
+            tpm=settings.llm_tpm,
+            max_retries=settings.llm_max_retries,
+            backoff_s=settings.llm_backoff_s,
+            breaker_failures=settings.llm_breaker_failures,
+            breaker_reset_s=settings.llm_breaker_reset_s,
+            prices=parse_prices(settings.llm_prices),
+            custom_llm_provider=settings.llm_provider,
+        )
+
+    def route(self, model: Optional[str]) -> ModelRoute:
+        with self._lock:
+            route = self._routes.get(model)
+            if route is None:
+                route = self._routes[model] = ModelRoute(
+                    model, self.rpm, self.tpm, self.breaker_failures, self.breaker_reset_s)
+            return route
+
+    def share(self, processes: int) -> None:
+        """Split the rate limits evenly between processes that each run their own scheduler"""
+        self.rpm /= processes
+        self.tpm /= processes
+        with self._lock:
+            self._routes.clear()
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        delay = random.uniform(0, min(self.backoff_max_s, self.backoff_s * 2 ** attempt))
+        return max(delay, retry_after(error))
+
+    def call(self, model: Optional[str], fn: Callable[[], tuple], prompt_tokens: int = 0) -> tuple:
+        """Run fn(), which makes one LLM request and returns (answer, usage), under the model's limits"""
+        route = self.route(model)
+        label = model or "default"
+        for attempt in range(self.max_retries + 1):
+            if not route.breaker.allow():
+                telemetry.count("llm_model_requests", model=label, outcome="circuit_open")
+                raise CircuitOpenError(f"Circuit breaker for {label} is open after repeated failures")
+            wait = max(route.requests.reserve(1), route.tokens.reserve(prompt_tokens))
+            if wait:
+                telemetry.count("llm_throttled_seconds", wait, model=label)
+                with telemetry.span("llm_throttle"):
+                    time.sleep(wait)
+            started = time.perf_counter()
+            try:
+                answer, usage = fn()
+            except Exception as e:
+                retry = retriable(e)
+                if retry and getattr(e, "status_code", None) != 429:
+                    route.breaker.failure()
+                else:
+                    # A request rejected as invalid or over the rate limit still shows the provider is up
+                    route.breaker.success()
+                # Nothing was generated, so the reserved prompt tokens go back to the bucket
+                route.tokens.adjust(-prompt_tokens)
+                telemetry.count("llm_model_requests", model=label, outcome="error")
+                if attempt == self.max_retries or not retry:
+                    raise
+                telemetry.count("llm_model_retries", model=label)
+                delay = self.backoff(attempt, e)
+                print(f"LLM call to {label} failed ({type(e).__name__}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            latency = time.perf_counter() - started
+            route.breaker.success()
+            self.record(route, label, latency, usage, prompt_tokens)
+            return answer, usage
+
+    def record(self, route: ModelRoute, label: str, latency: float, usage: Dict[str, int], reserved_tokens: int) -> None:
+        prompt = usage.get("prompt_tokens", 0)
+        completion = usage.get("completion_tokens", 0)
+        route.tokens.adjust(prompt + completion - reserved_tokens)
+        telemetry.count("llm_model_requests", model=label, outcome="success")
+        telemetry.metrics.observe("resume_llm_model_seconds", latency, model=label)
+        telemetry.count("llm_model_prompt_tokens", prompt, model=label)
+        telemetry.count("llm_model_completion_tokens", completion, model=label)
+        telemetry.count("llm_model_cost_usd", self.cost(label, prompt, completion), model=label)
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """USD cost from the configured prices, else LiteLLM's price list, else 0"""
+        if model in self.prices:
+            prompt_price, completion_price = self.prices[model]
+            return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1e6
+        try:
+            import litellm
+            return sum(litellm.cost_per_token(model=model, prompt_tokens=prompt_tokens,
+                                              completion_tokens=completion_tokens,
+                                              custom_llm_provider=self.custom_llm_provider))
+        except Exception:
+            return 0.0
+
+    def cascade(self, run: Callable[[Optional[str]], tuple], validate: Callable[[str], bool]) -> tuple:
+        """(answer, usage, model) of the first model in the cascade whose answer validates.
+
+        run(model) makes the calls for one model and returns (answer, usage). A failing model
+        passes the request to the next one; when no answer validates, the last answer is returned
+        for the caller to fall back on, and when every model failed the last error is raised.
+        Usage is summed over every model tried.
+        """
+        total: Dict[str, int] = {}
+        answer, used, error = None, None, None
+        for model in self.models:
+            try:
+                result, usage = run(model)
+            except Exception as e:
+                error = e
+                if model != self.models[-1]:
+                    print(f"LLM {model} failed ({type(e).__name__}); escalating to the next model")
+                continue
+            answer, used = result, model
+            for key, value in usage.items():
+                total[key] = total.get(key, 0) + value
+            if validate(result):
+                return answer, total, model
+            telemetry.count("llm_model_invalid", model=model or "default")
+            if model != self.models[-1]:
+                print(f"Answer of {model} failed validation; escalating to the next model")
+        if answer is None:
+            raise error
+        return answer, total, used
+
+    def report(self) -> str:
+        """Requests, success rate, retries, invalid answers, latency, tokens and cost per model"""
+        counters, histograms = telemetry.metrics.snapshot("resume_llm_model_")
+        latencies = histograms.get("resume_llm_model_seconds", {})
+
+        def value(name, model, **labels):
+            # telemetry.count() stores name as resume_<name>_total
+            series = counters.get(f"resume_{name}_total", {})
+            return series.get(tuple(sorted(dict(labels, model=model).items())), 0)
+
+        models = sorted({dict(key)["model"] for series in counters.values() for key in series})
+        if not models:
+            return ""
+        lines = [f"{'model':28} {'requests':>8} {'success':>8} {'retries':>7} {'invalid':>7} {'open':>5} "
+                 f"{'p50 ms<=':>9} {'p95 ms<=':>9} {'tokens':>9} {'cost $':>9}"]
+        for model in models:
+            ok = value("llm_model_requests", model, outcome="success")
+            failed = value("llm_model_requests", model, outcome="error")
+            latency = latencies.get((("model", model),))
+            lines.append(
+                f"{model:28} {ok + failed:8.0f} {ok / (ok + failed) if ok + failed else 0:8.1%} "
+                f"{value('llm_model_retries', model):7.0f} {value('llm_model_invalid', model):7.0f} "
+                f"{value('llm_model_requests', model, outcome='circuit_open'):5.0f} "
+                f"{latency.quantile(0.5) * 1000 if latency else 0:9.0f} "
+                f"{latency.quantile(0.95) * 1000 if latency else 0:9.0f} "
+                f"{value('llm_model_prompt_tokens', model) + value('llm_model_completion_tokens', model):9.0f} "
+                f"{value('llm_model_cost_usd', model):9.4f}"
+            )
+        return "\n".join(lines)
@@ -1,22 +1,144 @@
-import re
 import json
 import os
-from pydantic import BaseModel
-from ph_resume_ext.crews.resume_crew_pr.resume_crew import ResumeCrew
+import time
+import statistics
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pydantic import BaseModel, Field, ValidationError
+from ph_resume_ext.cache import ExtractionCache, config_version
+from ph_resume_ext.compaction import compact
+from ph_resume_ext.extraction import extract_text
+from ph_resume_ext.manifest import DONE, FAILED, PROCESSING, Manifest
+from ph_resume_ext.near_dup import DEFAULT_THRESHOLD, Document, NearDuplicateIndex
+from ph_resume_ext.packing import RequestPacker
+from ph_resume_ext.prefork import PreforkPool, fork_available
+from ph_resume_ext.field_extractor import HIGH_CONFIDENCE, confident_values, extract_fields
+from ph_resume_ext.json_stream import parse_json
+from ph_resume_ext.sinks import JsonFileSink, make_sink
+from ph_resume_ext.skills import DEFAULT_TAXONOMY, load_taxonomy
+from ph_resume_ext.telemetry import install_crewai_hooks, telemetry
+from ph_resume_ext.type import ExtractionStats, Output_format
 from crewai.flow import Flow, listen, start
 
 os.environ['CREWAI_DISABLE_TELEMETRY'] = 'true'
 
+RESUME_ROOT = os.path.join(os.path.dirname(__file__), "resume")
+RESUME_DIR = os.getenv("RESUME_INPUT_DIR", os.path.join(RESUME_ROOT, "templates"))
+PROCESSED_DIR = os.getenv("RESUME_OUTPUT_DIR", os.path.join(RESUME_ROOT, "processed"))
+
+SUPPORTED_FORMATS = ('.pdf', '.docx')
+# Legacy Word files have no OOXML to stream, so they are converted to PDF with docx2pdf first (needs Microsoft Word)
+CONVERTED_FORMATS = ('.doc',)
+CONVERTED_DIR = os.path.join(PROCESSED_DIR, ".converted")
+
+def convert_to_pdf(file_path):
+    """Path of a PDF copy of a legacy .doc resume, written outside the input directory so it is not picked up as a new resume"""
+    from docx2pdf import convert
+    os.makedirs(CONVERTED_DIR, exist_ok=True)
+    pdf_path = os.path.join(CONVERTED_DIR, os.path.splitext(os.path.basename(file_path))[0] + ".pdf")
+    convert(file_path, pdf_path)
+    return pdf_path
+
+
+def format_stats_report(stats):
+    """Per-engine latency and token usage of the LLM stage, side by side"""
+    lines = [f"{'engine':8} {'resumes':>8} {'p50 s':>8} {'mean s':>8} {'calls':>6} {'prompt tok':>11} {'compl tok':>10} {'total tok':>10}"]
+    for engine in sorted({s.engine for s in stats}):
+        rows = [s for s in stats if s.engine == engine]
+        latencies = [s.latency_s for s in rows]
+        lines.append(
+            f"{engine:8} {len(rows):8d} {statistics.median(latencies):8.2f} {statistics.mean(latencies):8.2f} "
+            f"{statistics.mean(s.llm_calls for s in rows):6.1f} "
+            f"{statistics.mean(s.prompt_tokens for s in rows):11.0f} "
+            f"{statistics.mean(s.completion_tokens for s in rows):10.0f} "
+            f"{statistics.mean(s.total_tokens for s in rows):10.0f}"
+        )
+    return "\n".join(lines)
+
+
 class ResumeState(BaseModel):
     resume_paths: list = []
+    max_workers: int = Field(default_factory=lambda: int(os.getenv("RESUME_MAX_WORKERS", "4")))
+    use_cache: bool = Field(default_factory=lambda: os.getenv("RESUME_CACHE", "1") != "0")
+    cache_path: str = Field(default_factory=lambda: os.getenv(
+        "RESUME_CACHE_PATH", os.path.join(PROCESSED_DIR, ".extraction_cache.sqlite")))
+    cache_max_mb: int = Field(default_factory=lambda: int(os.getenv("RESUME_CACHE_MAX_MB", "256")))
+    # When the rule-based extractor fills all of these with high confidence the LLM is skipped;
+    # skills only count as filled when the skill taxonomy finds some. Empty (the default) always calls the LLM,
+    # since the fields only it extracts (summary, work_experience, education...) would otherwise be null
+    required_fields: list = Field(default_factory=lambda: [
+        field for field in os.getenv("RESUME_REQUIRED_FIELDS", "").split(",") if field])
+    prefill_threshold: float = Field(default_factory=lambda: float(os.getenv("RESUME_PREFILL_THRESHOLD", str(HIGH_CONFIDENCE))))
+    # An LLM answer must fill these (unless the fast path already did) before the cascade accepts it from a cheaper model
+    answer_required_fields: list = Field(default_factory=lambda: [
+        field for field in os.getenv("RESUME_ANSWER_REQUIRED_FIELDS", "First_Name,Last_Name").split(",") if field])
+    # "crew" runs the agentic ResumeCrew, "direct" makes a single structured-output LLM call
+    engine: str = Field(default_factory=lambda: os.getenv("RESUME_ENGINE", "crew"))
+    # Estimated prompt tokens allowed for the resume text of one request; 0 disables the budget
+    token_budget: int = Field(default_factory=lambda: int(os.getenv("RESUME_TOKEN_BUDGET", "3000")))
+    # Incremental mode only processes new or changed files, tracked in a manifest that survives crashes
+    incremental: bool = Field(default_factory=lambda: os.getenv("RESUME_INCREMENTAL", "0") == "1")
+    manifest_path: str = Field(default_factory=lambda: os.getenv(
+        "RESUME_MANIFEST_PATH", os.path.join(PROCESSED_DIR, ".manifest.sqlite")))
+    # Watch mode keeps rescanning the inbox for new files (implies incremental mode)
+    watch: bool = Field(default_factory=lambda: os.getenv("RESUME_WATCH", "0") == "1")
+    watch_interval: float = Field(default_factory=lambda: float(os.getenv("RESUME_WATCH_INTERVAL", "5")))
+    # "json" writes one <name>.json per resume, "jsonl" appends to results.jsonl, "sqlite" fills results.sqlite
+    output_sink: str = Field(default_factory=lambda: os.getenv("RESUME_OUTPUT_SINK", "json"))
+    sink_batch_size: int = Field(default_factory=lambda: int(os.getenv("RESUME_SINK_BATCH_SIZE", "100")))
+    # Stage timings and LLM counters are exported here: Prometheus text format, or JSON for a .json path
+    metrics_path: str = Field(default_factory=lambda: os.getenv("RESUME_METRICS_PATH", ""))
+    # One JSON line of spans and counters per resume
+    trace_path: str = Field(default_factory=lambda: os.getenv("RESUME_TRACE_PATH", ""))
+    # cProfile stats of a sample of resumes (RESUME_PROFILE_SAMPLE, 0-1) are dumped here
+    profile_path: str = Field(default_factory=lambda: os.getenv("RESUME_PROFILE_PATH", ""))
+    profile_sample: float = Field(default_factory=lambda: float(os.getenv("RESUME_PROFILE_SAMPLE", "1")))
+    # Skill taxonomy used to find candidate skills before the LLM and to normalise its skills; empty disables it
+    skills_taxonomy: str = Field(default_factory=lambda: os.getenv("RESUME_SKILLS_TAXONOMY", DEFAULT_TAXONOMY))
+    # Packing sends several resumes in one direct-engine request, up to a token budget and resume count
+    packing: bool = Field(default_factory=lambda: os.getenv("RESUME_PACKING", "0") == "1")
+    pack_token_budget: int = Field(default_factory=lambda: int(os.getenv("RESUME_PACK_TOKEN_BUDGET", "12000")))
+    pack_max_resumes: int = Field(default_factory=lambda: int(os.getenv("RESUME_PACK_MAX_RESUMES", "8")))
+    pack_wait_ms: float = Field(default_factory=lambda: float(os.getenv("RESUME_PACK_WAIT_MS", "200")))
+    # The direct engine streams its answer and stops reading once the JSON object is complete
+    stream: bool = Field(default_factory=lambda: os.getenv("RESUME_STREAM", "1") != "0")
+    # The HTTP service (service.py) runs max_workers extractions at once and queues up to service_queue_size more
+    service_host: str = Field(default_factory=lambda: os.getenv("RESUME_SERVICE_HOST", "127.0.0.1"))
+    service_port: int = Field(default_factory=lambda: int(os.getenv("RESUME_SERVICE_PORT", "8080")))
+    service_queue_size: int = Field(default_factory=lambda: int(os.getenv("RESUME_SERVICE_QUEUE_SIZE", "32")))
+    service_timeout_s: float = Field(default_factory=lambda: float(os.getenv("RESUME_SERVICE_TIMEOUT", "120")))
+    service_max_upload_mb: float = Field(default_factory=lambda: float(os.getenv("RESUME_SERVICE_MAX_UPLOAD_MB", "10")))
+    # Worker processes forked after setup, so imports and the pipeline are built once; 0 runs resumes on threads
+    prefork: int = Field(default_factory=lambda: int(os.getenv("RESUME_PREFORK", "0")))
+    # A resume at least this similar to an extracted one (estimated Jaccard similarity of word shingles)
+    # reuses its output, updated from the lines that differ, instead of calling the LLM
+    near_dup: bool = Field(default_factory=lambda: os.getenv("RESUME_NEAR_DUP", "0") == "1")
+    near_dup_threshold: float = Field(default_factory=lambda: float(os.getenv(
+        "RESUME_NEAR_DUP_THRESHOLD", str(DEFAULT_THRESHOLD))))
+    near_dup_path: str = Field(default_factory=lambda: os.getenv(
+        "RESUME_NEAR_DUP_PATH", os.path.join(PROCESSED_DIR, ".near_dup.sqlite")))
 
 class ResumeFlow(Flow[ResumeState]):
+    cache = None
+    pipeline = None
+    llm_stats = None
+    manifest = None
+    sink = None
+    taxonomy = None
+    packer = None
+    prefork = None
+    near_dup = None
 
     @start()
     def read_resume(self):
         """Find resume files and Store complete paths of each"""
         self.state.resume_paths = []
-        resume = r"C:\Users\samar\OneDrive\Documents\CrewAI\ph_resume_ext\src\ph_resume_ext\resume\templates"
+        resume = RESUME_DIR
+
+        if self.state.incremental or self.state.watch:
+            self.manifest = Manifest(self.state.manifest_path)
+            self.state.resume_paths = self.manifest.scan(resume)
+            print(f"{len(self.state.resume_paths)} new, changed or unfinished resumes to process")
+            return
 
         if os.path.exists(resume):
             for file_name in os.listdir(resume):
@@ -27,53 +149,368 @@ class ResumeFlow(Flow[ResumeState]):
                 else:
                     self.state.resume_paths.append(file_path)
 
-    @listen(read_resume)
-    def process_resumes(self):
-        """Process each resume file found"""
-        for resume_path in self.state.resume_paths:
-            resume = r"C:\Users\samar\OneDrive\Documents\CrewAI\ph_resume_ext\src\ph_resume_ext\resume\templates"
-            resume_processing_path = os.path.join(resume, resume_path)
-            
-            """Doc to PDF conversion"""
-            format_type = os.path.splitext(resume_path)[1] 
-            if format_type in ['.doc', '.docx']:
-                from docx2pdf import convert
-                pdf_path = os.path.join(resume, f"{os.path.splitext(resume_path)[0]}.pdf")
-                convert(resume_processing_path, pdf_path)
-                resume_processing_path = pdf_path
-
-            print("Found resume:", resume_processing_path)
-            result = (
-                ResumeCrew()
-                .crew()
-                .kickoff(inputs={"file_path": resume_processing_path})
-            )
-            print("Resume processed", result.raw)
-
-            def extract_json_from_markdown(text):
-                """LLM's output in JSON structure are wrapped into JSON format by removing Markdown code blocks"""
-                # Remove Markdown code block if present
-                match = re.search(r"```(?:json)?\\s*([\\s\\S]*?)```", text, re.IGNORECASE)
-                if match:
-                    return match.group(1)
-                # Try again with real newlines (not escaped)
-                match = re.search(r"```(?:json)?\s*([\s\S]*?)```", text, re.IGNORECASE)
-                if match:
-                    return match.group(1)
-                return text
-            
-            """Save output in JSON file format"""
+    def process_resume(self, resume_path):
+        """Extract a single resume and write its JSON output as soon as it is ready"""
+        resume = RESUME_DIR
+        resume_processing_path = os.path.join(resume, resume_path)
+        output_name = os.path.splitext(resume_path)[0]
+        output = self.extract_resume(resume_path, resume_processing_path)
+        self.write_output(output_name, output, resume_path)
+        return output
+
+    def extract_resume(self, resume_path, resume_processing_path):
+        """Output_format fields of one resume file, from the cache, the fast path, a near-duplicate or the LLM"""
+        if self.prefork is not None:
+            return self.prefork.extract(resume_path, resume_processing_path)
+        """DOCX is read natively by ExtractTextTool, so only legacy .doc files are converted to PDF"""
+        format_type = os.path.splitext(resume_path)[1].lower()
+        if format_type not in SUPPORTED_FORMATS + CONVERTED_FORMATS:
+            raise ValueError(f"Unsupported file type {format_type}; only {', '.join(SUPPORTED_FORMATS + CONVERTED_FORMATS)} are read")
+
+        """Skip the LLM entirely when these exact bytes were extracted with the current config"""
+        cache_key = None
+        if self.cache is not None:
+            with telemetry.span("cache_lookup"):
+                cache_key = self.cache.key_for(resume_processing_path)
+                output = self.cache.get(cache_key)
+            if output is not None:
+                print("Cache hit:", resume_processing_path)
+                telemetry.annotate("cache_hit")
+                return output
+
+        if format_type in CONVERTED_FORMATS:
+            # Converted after the cache lookup, which is keyed on the original bytes
+            with telemetry.span("convert_to_pdf"):
+                resume_processing_path = convert_to_pdf(resume_processing_path)
+
+        print("Found resume:", resume_processing_path)
+
+        """Deterministic fast path for contact fields"""
+        with telemetry.span("extract_text"):
+            text = extract_text(resume_processing_path)
+        with telemetry.span("fast_path"):
+            prefilled = confident_values(extract_fields(text), self.state.prefill_threshold)
+        skill_candidates = []
+        if self.taxonomy is not None:
+            # Scanned before compaction, so skills in sections cut to fit the token budget still count
+            with telemetry.span("skill_scan"):
+                skill_candidates = self.taxonomy.find(text)
+        missing_fields = [
+            field for field in Output_format.model_fields
+            if field != "status" and field not in prefilled
+        ]
+        filled = {**prefilled, "skills": skill_candidates} if skill_candidates else prefilled
+        if self.state.required_fields and all(field in filled for field in self.state.required_fields):
+            print("All required fields found without the LLM:", resume_processing_path)
+            telemetry.annotate("fast_path")
+            # The full schema, so fields the fast path does not extract are explicit nulls rather than absent
+            output = Output_format(status="Success", **filled).model_dump()
+        else:
+            output = document = None
+            if self.near_dup is not None:
+                with telemetry.span("near_dup_lookup"):
+                    document = Document(text)
+                    output = self.reuse_near_duplicate(resume_processing_path, document, prefilled)
+            if output is not None:
+                telemetry.annotate("near_duplicate")
+            else:
+                output = self.run_llm(resume_path, resume_processing_path, text, prefilled, missing_fields, skill_candidates)
+                if "raw_text" in output:
+                    telemetry.annotate("raw_text")
+                    return output
+                output.update(prefilled)
+                if self.taxonomy is not None and isinstance(output.get("skills"), list):
+                    output["skills"] = self.taxonomy.normalise(output["skills"])
+                if document is not None:
+                    with telemetry.span("near_dup_store"):
+                        self.near_dup.add(resume_path, document, output)
+
+        if cache_key is not None:
+            with telemetry.span("cache_store"):
+                self.cache.put(cache_key, output)
+        return output
+
+    def reuse_near_duplicate(self, file_path, document, prefilled):
+        """Output of the most similar stored resume, updated from the lines that differ, or None"""
+        for match in self.near_dup.matches(document):
+            stored = match.output
+            # One template filled in by two candidates can look alike, so a different name rules a match out
+            if any(stored.get(field) and field in prefilled and str(stored[field]).lower() != prefilled[field].lower()
+                   for field in ("First_Name", "Last_Name")):
+                continue
+            print(f"Near-duplicate of {match.name} ({match.similarity:.0%} similar):", file_path)
+            output = dict(stored)
+            # Only the new lines are searched, so a changed phone number is found even where the whole
+            # resume mentions several
+            output.update(confident_values(extract_fields(match.changed_text), self.state.prefill_threshold))
+            output.update(prefilled)
+            if self.taxonomy is not None and isinstance(output.get("skills"), list):
+                output["skills"] = self.taxonomy.normalise(output["skills"] + self.taxonomy.find(match.changed_text))
+            return output
+        return None
+
+    def run_llm(self, resume_path, file_path, text, prefilled, missing_fields, skill_candidates=()):
+        """Ask the configured engine for the fields the fast path could not fill"""
+        started = time.perf_counter()
+        if self.pipeline is None:
+            self.pipeline = build_pipeline()
+        self.pipeline.direct_extractor.stream = self.state.stream
+        engine = self.state.engine
+        required = [field for field in self.state.answer_required_fields if field in missing_fields]
+        if engine == "direct":
+            # Only the direct and packed requests send the text; the crew reads the file itself
+            with telemetry.span("compaction"):
+                compacted = compact(text, self.state.token_budget, missing_fields)
+            print(f"Prompt compaction for {resume_path}: ~{compacted.tokens_before} -> ~{compacted.tokens_after} tokens"
+                  f"{' (truncated to budget)' if compacted.truncated else ''}")
+            packed = None
+            if self.packer is not None:
+                with telemetry.span("pack_wait"):
+                    packed = self.packer.extract(compacted.text, prefilled, missing_fields, skill_candidates)
+            if packed is not None:
+                # Already validated on its own; a missing or invalid answer falls through to a single request
+                output, usage = packed
+                raw = json.dumps(output, ensure_ascii=False)
+                engine, model = "packed", self.pipeline.direct_extractor.model
+            else:
+                # The cheapest model in the cascade is asked first; stronger ones only when its answer is invalid
+                with telemetry.span("llm_call"):
+                    raw, usage, model = self.pipeline.scheduler.cascade(
+                        lambda model: self.pipeline.direct_extractor.extract(
+                            compacted.text, prefilled, missing_fields, skill_candidates, model=model),
+                        lambda raw: valid_output(raw, required))
+        else:
+            inputs = {
+                "file_path": file_path,
+                "prefilled_fields": json.dumps(prefilled, ensure_ascii=False),
+                "missing_fields": ", ".join(missing_fields),
+                "skill_candidates": ", ".join(skill_candidates) or "none found",
+            }
+
+            def kickoff(model):
+                result = self.pipeline.kickoff(inputs=inputs, model=model)
+                return result.raw, {
+                    "prompt_tokens": result.token_usage.prompt_tokens,
+                    "completion_tokens": result.token_usage.completion_tokens,
+                    "total_tokens": result.token_usage.total_tokens,
+                    "llm_calls": result.token_usage.successful_requests,
+                }
+
+            with telemetry.span("crew_kickoff"):
+                raw, usage, model = self.pipeline.scheduler.cascade(kickoff, lambda raw: valid_output(raw, required))
+        stats = ExtractionStats(
+            resume=resume_path,
+            engine=engine,
+            latency_s=time.perf_counter() - started,
+            **usage,
+        )
+        if self.llm_stats is not None:
+            self.llm_stats.append(stats)
+        telemetry.count("llm_calls", stats.llm_calls, engine=stats.engine)
+        telemetry.count("prompt_tokens", stats.prompt_tokens, engine=stats.engine)
+        telemetry.count("completion_tokens", stats.completion_tokens, engine=stats.engine)
+        print("Resume processed", raw)
+        print(f"LLM stage ({stats.engine}, {model}): {stats.latency_s:.2f}s, {stats.llm_calls} calls, {stats.total_tokens} tokens")
+
+        """Save output in JSON file format"""
+        with telemetry.span("parse_output"):
             try:
-                json_str = extract_json_from_markdown(result.raw)
-                output = json.loads(json_str)
-            except (json.JSONDecodeError, TypeError):
+                # Fences and prose around the object are skipped, and near-JSON is repaired rather than dropped
+                output, repaired = parse_json(raw)
+                if not isinstance(output, dict):
+                    raise ValueError("LLM answer is not a JSON object")
+                if self.state.engine == "direct":
+                    output = Output_format.model_validate(output).model_dump()
+                if repaired:
+                    telemetry.count("repaired_outputs")
+            except (ValueError, ValidationError):
                 print("Result was not JSON. Using raw text instead.")
-                output = {"raw_text": result.raw}
-            output_resume = r"C:\Users\samar\OneDrive\Documents\CrewAI\ph_resume_ext\src\ph_resume_ext\resume\processed"
-            base_name = os.path.splitext(resume_path)[0] 
-            output_path = os.path.join(output_resume, base_name + ".json")
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(output, f, ensure_ascii=False, indent=4)
+                telemetry.count("parse_failures")
+                output = {"raw_text": raw, **prefilled}
+        return output
+
+    def write_output(self, output_name, output, resume_path=None):
+        """Hand the output to the configured sink, which writes it atomically"""
+        if self.sink is None:
+            self.use_sink(JsonFileSink(PROCESSED_DIR))
+        with telemetry.span("write_output"):
+            self.sink.write(output_name, output, resume_path)
+
+    def use_sink(self, sink):
+        """Write outputs to sink; in incremental mode a resume is marked done as soon as its output is durable"""
+        self.sink = sink
+        if self.manifest is not None:
+            sink.on_durable = lambda resume_paths: self.manifest.mark_many(resume_paths, DONE)
+
+    def process_tracked(self, resume_path):
+        """Process one resume, checkpointing its status in the manifest when incremental mode is on"""
+        with telemetry.resume(resume_path):
+            if self.manifest is None:
+                return self.process_resume(resume_path)
+            self.manifest.mark(resume_path, PROCESSING)
+            try:
+                return self.process_resume(resume_path)
+            except Exception as e:
+                self.manifest.mark(resume_path, FAILED, str(e))
+                raise
+
+    def extract_tracked(self, resume_name, file_path):
+        """Extract one resume file outside the input directory, e.g. an upload, without writing it anywhere"""
+        with telemetry.resume(resume_name):
+            return self.extract_resume(resume_name, file_path)
+
+    def process_batch(self, resume_paths):
+        """Process resume files concurrently, bounded by state.max_workers"""
+        processed, failed = 0, 0
+        workers = max(1, self.state.max_workers)
+        if self.packer is not None:
+            # max_workers bounds the requests in flight; each packed request needs a thread per resume in it
+            workers *= self.packer.max_resumes
+        if self.prefork is not None:
+            # One thread hands resumes to each worker process
+            workers = self.prefork.processes
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(self.process_tracked, resume_path): resume_path
+                for resume_path in resume_paths
+            }
+            # One failing resume must not stop the rest of the batch
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    processed += 1
+                except Exception as e:
+                    failed += 1
+                    print(f"Failed to process {futures[future]}: {e}")
+        if self.sink is not None:
+            # Buffered outputs are made durable, and so marked done, at the end of every batch
+            self.sink.flush()
+        if self.state.metrics_path:
+            # Exported after every batch so a scraper sees progress during watch mode
+            telemetry.metrics.export(self.state.metrics_path)
+        return processed, failed
+
+    @listen(read_resume)
+    def process_resumes(self):
+        """Process the resumes found by read_resume, then keep watching the inbox in watch mode"""
+        started = time.perf_counter()
+        self.prepare()
+        if self.sink is None:
+            self.use_sink(make_sink(self.state.output_sink, PROCESSED_DIR, self.state.sink_batch_size))
+
+        processed, failed = self.process_batch(self.state.resume_paths)
+        try:
+            while self.state.watch:
+                time.sleep(self.state.watch_interval)
+                # Unchanged failures were already retried at startup; only a new version is retried
+                resume_paths = self.manifest.scan(RESUME_DIR, retry_failed=False)
+                if resume_paths:
+                    print(f"{len(resume_paths)} new or changed resumes in the inbox")
+                    batch_processed, batch_failed = self.process_batch(resume_paths)
+                    processed += batch_processed
+                    failed += batch_failed
+        except KeyboardInterrupt:
+            print("Stopped watching", RESUME_DIR)
+
+        elapsed = time.perf_counter() - started
+        rate = processed / elapsed * 60 if elapsed else 0.0
+        print(f"Processed {processed} resumes ({failed} failed) in {elapsed:.1f}s "
+              f"with {self.state.max_workers} workers: {rate:.1f} resumes/min")
+        self.finish()
+
+    def prepare(self):
+        """Set up telemetry, the taxonomy, cache, near-duplicate index, pipeline, packer and worker processes shared by every resume"""
+        self.llm_stats = []
+        telemetry.configure(self.state.trace_path, self.state.profile_path, self.state.profile_sample)
+        install_crewai_hooks()
+        self.taxonomy = load_taxonomy(self.state.skills_taxonomy)
+        if self.pipeline is None:
+            # Built once per run and shared by every worker
+            self.pipeline = build_pipeline()
+        if self.state.packing:
+            if self.state.engine != "direct":
+                print("Packing sends structured-output requests, so the direct engine is used")
+                self.state.engine = "direct"
+            self.packer = RequestPacker(self.pipeline.direct_extractor, self.state.pack_token_budget,
+                                        self.state.pack_max_resumes, self.state.pack_wait_ms / 1000)
+        # Outputs depend on the taxonomy through the skill candidates and normalisation, and on the engine,
+        # its models and, for the direct engine, the compaction budget
+        version = config_version(
+            self.taxonomy.fingerprint() if self.taxonomy is not None else "",
+            engine=self.state.engine,
+            models=self.pipeline.scheduler.models,
+            token_budget=self.state.token_budget if self.state.engine == "direct" else 0,
+            packing=self.packer is not None,
+        )
+        if self.state.use_cache:
+            self.cache = ExtractionCache(
+                self.state.cache_path, max_bytes=self.state.cache_max_mb * 1024 * 1024, version=version)
+        if self.state.near_dup:
+            self.near_dup = NearDuplicateIndex(self.state.near_dup_path, self.state.near_dup_threshold, version)
+        if self.state.prefork > 0:
+            if self.packer is not None:
+                print("Packing needs the resumes of a pack in one process, so worker processes are not used")
+            elif not fork_available():
+                print("Worker processes need os.fork, which this platform lacks; using threads")
+            else:
+                # Forked last, so every worker inherits the finished setup
+                self.prefork = PreforkPool(self, self.state.prefork)
+
+    def finish(self):
+        """Print the run's reports and close everything prepare() and the batches opened"""
+        if self.prefork is not None:
+            self.prefork.close()
+            self.prefork = None
+        if self.llm_stats:
+            print(format_stats_report(self.llm_stats))
+        if self.packer is not None:
+            print(self.packer.report())
+        if self.pipeline is not None and self.llm_stats:
+            print(self.pipeline.scheduler.report())
+        print(telemetry.stage_report())
+        if self.state.profile_path:
+            print(telemetry.profile_report())
+        telemetry.close()
+        if self.cache is not None:
+            print(self.cache.report())
+            self.cache.close()
+            self.cache = None
+        if self.near_dup is not None:
+            print(self.near_dup.report())
+            self.near_dup.close()
+            self.near_dup = None
+        if self.sink is not None:
+            self.sink.close()
+            self.sink = None
+        if self.manifest is not None:
+            print("Manifest:", self.manifest.counts())
+            self.manifest.close()
+            self.manifest = None
+
+
+def valid_output(raw, required=()):
+    """Whether an LLM answer is usable: a JSON object (after repair if needed) that fits Output_format,
+    is not a failure or empty, and has a value for every required field.
+
+    Every Output_format field is optional and unknown keys are ignored, so the schema alone accepts
+    almost any object; the content checks are what make the cascade escalate.
+    """
+    try:
+        output, _ = parse_json(raw)
+        if not isinstance(output, dict):
+            return False
+        parsed = Output_format.model_validate(output)
+    except (ValueError, ValidationError):
+        return False
+    if parsed.status == "Fail" or not any(getattr(parsed, field) for field in Output_format.model_fields if field != "status"):
+        return False
+    return all(getattr(parsed, field, None) for field in required)
+
+
+def build_pipeline():
+    # Imported on first use: the crew module pulls in crewai's agents, tools and config loading
+    from ph_resume_ext.pipeline import ResumePipeline
+    return ResumePipeline()
 
 
 def kickoff():
@@ -86,4 +523,4 @@ def plot():
     resume_flow.plot()
 
 if __name__ == "__main__":
-    kickoff()
\ No newline at end of file
+    kickoff()
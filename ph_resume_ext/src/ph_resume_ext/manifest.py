@@ -0,0 +1,106 @@
+"""Crash-safe manifest of inbox files for incremental ingestion."""
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from ph_resume_ext.cache import file_digest
+
+PENDING = "pending"
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+
+
+class Manifest:
+    """SQLite record of every inbox file: path, size, mtime, content hash and processing status.
+
+    A rescan only stats each file; content is hashed only when size or mtime changed. Status
+    changes are committed immediately, so after a crash anything not marked done is picked up again.
+    """
+
+    def __init__(self, path: str, extensions: Tuple[str, ...] = (".pdf", ".docx"), retry_failed: bool = True):
+        self.path = path
+        self.extensions = extensions
+        self.retry_failed = retry_failed
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " sha256 TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " error TEXT,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_status ON files(status)")
+        self._conn.commit()
+
+    def scan(self, directory: str, retry_failed: Optional[bool] = None) -> List[str]:
+        """Record new or changed files under directory and return the names that still need processing"""
+        retry_failed = self.retry_failed if retry_failed is None else retry_failed
+        with self._lock:
+            known = {
+                row[0]: row[1:]
+                for row in self._conn.execute("SELECT path, size, mtime_ns, sha256, status FROM files")
+            }
+        upserts, todo = [], []
+        now = time.time()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.lower().endswith(self.extensions):
+                    continue
+                stat = entry.stat()
+                record = known.get(entry.name)
+                if record is not None and record[:2] == (stat.st_size, stat.st_mtime_ns):
+                    status = record[3]
+                    if status in (PENDING, PROCESSING) or (status == FAILED and retry_failed):
+                        todo.append(entry.name)
+                    continue
+                digest = file_digest(entry.path)
+                if record is not None and record[2] == digest and record[3] == DONE:
+                    # Touched but not changed: remember the new stat so it is not hashed again
+                    upserts.append((entry.name, stat.st_size, stat.st_mtime_ns, digest, DONE, now))
+                    continue
+                upserts.append((entry.name, stat.st_size, stat.st_mtime_ns, digest, PENDING, now))
+                todo.append(entry.name)
+        if upserts:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256, status, error, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, NULL, ?)",
+                    upserts,
+                )
+                self._conn.commit()
+        return sorted(todo)
+
+    def mark(self, name: str, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE files SET status = ?, error = ?, updated_at = ? WHERE path = ?",
+                (status, error, time.time(), name),
+            )
+            self._conn.commit()
+
+    def mark_many(self, names: List[str], status: str) -> None:
+        """Set the status of several files in one transaction"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE files SET status = ?, error = NULL, updated_at = ? WHERE path = ?",
+                [(status, now, name) for name in names],
+            )
+            self._conn.commit()
+
+    def counts(self) -> dict:
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM files GROUP BY status").fetchall())
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,217 @@
+"""MinHash/LSH index of extracted resumes, used to reuse the output of a near-duplicate."""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from ph_resume_ext.compaction import CONTENT_START, DIAGNOSTIC_RE
+
+NUM_PERM = 128
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+# Universal hashing (a * x + b) mod a Mersenne prime; products stay below 2**62, so uint64 never overflows
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, int(_PRIME), NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), NUM_PERM, dtype=np.uint64)
+_WORD_RE = re.compile(r"\w+")
+
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """(bands, rows) whose LSH curve best separates pairs above threshold from those below.
+
+    Missed duplicates cost an LLM call while extra candidates only cost a signature comparison,
+    so false negatives weigh more than false positives.
+    """
+    similarities = np.linspace(0.0, 1.0, 1001)
+    step = similarities[1]
+    below = similarities < threshold
+    best, best_error = (num_perm, 1), float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        candidate = 1 - (1 - similarities ** rows) ** bands
+        false_positive = candidate[below].sum() * step
+        false_negative = (1 - candidate[~below]).sum() * step
+        error = 0.3 * false_positive + 0.7 * false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def _lines(text: str) -> List[str]:
+    """Non-empty lines of the cleaned resume text, without the PDF reader's diagnostics"""
+    from ph_resume_ext.tools.Text_Cleaner import clean_text
+
+    text = clean_text(text)
+    if CONTENT_START in text:
+        text = text.split(CONTENT_START, 1)[1]
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not DIAGNOSTIC_RE.match(line):
+            lines.append(line)
+    return lines
+
+
+class Document:
+    """Cleaned lines of one resume with their hashes and the MinHash signature of its word shingles"""
+
+    __slots__ = ("lines", "line_hashes", "signature")
+
+    def __init__(self, text: str):
+        self.lines = _lines(text)
+        normalised = [" ".join(_WORD_RE.findall(line.lower())) for line in self.lines]
+        self.line_hashes = np.array([zlib.crc32(line.encode("utf-8")) for line in normalised], dtype=np.uint32)
+        words = " ".join(normalised).split()
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(1, len(words) - SHINGLE_SIZE + 1))}
+        shingles.discard("")
+        self.signature = None
+        if shingles:
+            hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64,
+                                 count=len(shingles)) % _PRIME
+            # One row per permutation, one column per shingle; the signature is each row's minimum
+            self.signature = ((np.outer(_A, hashes) + _B[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def changed_text(self, stored_hashes: np.ndarray) -> str:
+        """Lines of this resume that the stored one does not have"""
+        new = ~np.isin(self.line_hashes, stored_hashes)
+        return "\n".join(line for line, changed in zip(self.lines, new) if changed)
+
+
+class Match:
+    __slots__ = ("resume_id", "name", "similarity", "output", "changed_text")
+
+    def __init__(self, resume_id: int, name: str, similarity: float, output: dict, changed_text: str):
+        self.resume_id = resume_id
+        self.name = name
+        self.similarity = similarity
+        self.output = output
+        self.changed_text = changed_text
+
+
+class NearDuplicateIndex:
+    """Persistent SQLite index of resume signatures, bucketed by locality-sensitive hashing.
+
+    Each signature is cut into bands and every band is hashed to a bucket key; a lookup reads
+    the rows of its own bucket keys through an index, so its cost grows with the number of
+    candidates rather than with the number of stored resumes. Candidates are then compared on
+    their full signatures, and those with an estimated Jaccard similarity of at least threshold
+    are returned. Entries made with another config version are never returned, and when the
+    threshold changes the band layout the buckets are rebuilt from the stored signatures.
+    """
+
+    def __init__(self, path: str, threshold: float = DEFAULT_THRESHOLD, version: str = ""):
+        self.path = path
+        self.threshold = threshold
+        self.version = version
+        self.bands, self.rows = lsh_params(threshold)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            " id INTEGER PRIMARY KEY,"
+            " name TEXT NOT NULL,"
+            " version TEXT NOT NULL,"
+            " signature BLOB NOT NULL,"
+            " line_hashes BLOB NOT NULL,"
+            " output TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key INTEGER NOT NULL, resume INTEGER NOT NULL,"
+            " PRIMARY KEY (key, resume)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+        self._check_layout()
+
+    def _bucket_keys(self, signature: np.ndarray) -> List[int]:
+        keys = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(rows.tobytes(), digest_size=8, person=band.to_bytes(2, "little")).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    def _check_layout(self) -> None:
+        layout = f"{NUM_PERM}:{SHINGLE_SIZE}:{self.bands}x{self.rows}"
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'layout'").fetchone()
+        if row is not None and row[0] == layout:
+            return
+        if row is not None and row[0].split(":")[:2] != layout.split(":")[:2]:
+            # Signatures of another size or shingling cannot be compared with new ones
+            self._conn.execute("DELETE FROM resumes")
+        self._conn.execute("DELETE FROM buckets")
+        for resume_id, signature in self._conn.execute("SELECT id, signature FROM resumes").fetchall():
+            keys = self._bucket_keys(np.frombuffer(signature, dtype=np.uint32))
+            self._conn.executemany("INSERT OR IGNORE INTO buckets (key, resume) VALUES (?, ?)",
+                                   [(key, resume_id) for key in keys])
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('layout', ?)", (layout,))
+        self._conn.commit()
+
+    def matches(self, document: Document) -> List[Match]:
+        """Stored resumes at least threshold-similar to document, most similar first"""
+        if document.signature is None:
+            return []
+        keys = self._bucket_keys(document.signature)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, name, signature, line_hashes, output FROM resumes WHERE version = ? AND id IN"
+                f" (SELECT resume FROM buckets WHERE key IN ({','.join('?' * len(keys))}))",
+                (self.version, *keys),
+            ).fetchall()
+        found = []
+        for resume_id, name, signature, line_hashes, output in rows:
+            similarity = float(np.mean(np.frombuffer(signature, dtype=np.uint32) == document.signature))
+            if similarity >= self.threshold:
+                changed = document.changed_text(np.frombuffer(line_hashes, dtype=np.uint32))
+                found.append(Match(resume_id, name, similarity, json.loads(output), changed))
+        found.sort(key=lambda match: match.similarity, reverse=True)
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found
+
+    def add(self, name: str, document: Document, output: dict) -> None:
+        """Store an extracted resume; resumes without any text are not stored"""
+        self.add_many([(name, document, output)])
+
+    def add_many(self, entries: Iterable[Tuple[str, Document, dict]]) -> None:
+        """Store several extracted resumes in one transaction"""
+        with self._lock:
+            for name, document, output in entries:
+                if document.signature is None:
+                    continue
+                cursor = self._conn.execute(
+                    "INSERT INTO resumes (name, version, signature, line_hashes, output, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (name, self.version, document.signature.tobytes(), np.unique(document.line_hashes).tobytes(),
+                     json.dumps(output, ensure_ascii=False), time.time()),
+                )
+                self._conn.executemany("INSERT OR IGNORE INTO buckets (key, resume) VALUES (?, ?)",
+                                       [(key, cursor.lastrowid) for key in self._bucket_keys(document.signature)])
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def report(self) -> str:
+        return (f"Near-duplicates: {self.hits} lookups matched, {self.misses} did not "
+                f"(threshold {self.threshold:g}, {self.bands} bands of {self.rows} rows)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
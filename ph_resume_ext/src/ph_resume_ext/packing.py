@@ -0,0 +1,174 @@
+"""Packing several resumes into one structured-output LLM request."""
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from ph_resume_ext.compaction import estimate_tokens
+from ph_resume_ext.direct_extractor import DirectExtractor
+from ph_resume_ext.json_stream import parse_json
+from ph_resume_ext.telemetry import telemetry
+from ph_resume_ext.type import Output_format
+
+
+class PendingResume:
+    """A resume waiting in a pack, and the validated answer once its pack has been sent"""
+
+    __slots__ = ("resume_id", "prompt", "tokens", "done", "output", "usage")
+
+    def __init__(self, prompt: str):
+        self.resume_id = ""
+        self.prompt = prompt
+        self.tokens = estimate_tokens(prompt)
+        self.done = threading.Event()
+        self.output: Optional[dict] = None
+        self.usage: Dict[str, int] = {}
+
+
+def split_usage(usage: Dict[str, int], prompt_shares: List[int], completion_shares: List[int]) -> List[Dict[str, int]]:
+    """Divide a packed request's token usage among its resumes in proportion to their shares.
+
+    The request itself is counted once, on the first resume, so per-resume stats still add up.
+    """
+    def divide(total, shares):
+        weight = sum(shares) or 1
+        parts = [total * share // weight for share in shares]
+        if parts:
+            parts[0] += total - sum(parts)
+        return parts
+
+    prompts = divide(usage.get("prompt_tokens", 0), prompt_shares)
+    completions = divide(usage.get("completion_tokens", 0), completion_shares)
+    return [
+        {"prompt_tokens": p, "completion_tokens": c, "total_tokens": p + c, "llm_calls": int(i == 0)}
+        for i, (p, c) in enumerate(zip(prompts, completions))
+    ]
+
+
+class RequestPacker:
+    """Groups resumes that are waiting for the LLM into packed requests.
+
+    Worker threads call extract() and block until their resume's pack has been answered. A pack
+    is sent as soon as the next resume would take it over token_budget estimated prompt tokens
+    or max_resumes resumes, or once a resume has waited max_wait_s; the thread that closes a
+    pack sends it, so packs are sent concurrently without a thread of their own. Each element
+    of the answer is validated on its own. extract() returns None for a resume whose element
+    was missing or invalid, or that ended up alone in its pack, and the caller sends that
+    resume as a single request.
+    """
+
+    def __init__(self, extractor: DirectExtractor, token_budget: int = 12000, max_resumes: int = 8,
+                 max_wait_s: float = 0.2):
+        self.extractor = extractor
+        self.token_budget = token_budget
+        self.max_resumes = max(1, max_resumes)
+        self.max_wait_s = max_wait_s
+        self._lock = threading.Lock()
+        self._waiting: List[PendingResume] = []
+        self._tokens = 0
+        self.requests = 0
+        self.packed = 0
+        self.answered = 0
+        self.alone = 0
+
+    def extract(self, text: str, prefilled: Optional[Dict[str, str]] = None,
+                missing_fields: Optional[List[str]] = None,
+                skill_candidates: Optional[List[str]] = None) -> Optional[Tuple[dict, Dict[str, int]]]:
+        """Validated Output_format fields and this resume's share of the token usage, or None to send it alone"""
+        pending = PendingResume(self.extractor.resume_prompt(text, prefilled, missing_fields, skill_candidates))
+        displaced, own = None, None
+        with self._lock:
+            if self._waiting and self._tokens + pending.tokens > self.token_budget:
+                displaced = self._take()
+            self._waiting.append(pending)
+            self._tokens += pending.tokens
+            if len(self._waiting) >= self.max_resumes or self._tokens >= self.token_budget:
+                own = self._take()
+        if displaced is not None:
+            # Sent on its own thread so this resume's wait does not include the other pack's round trip
+            threading.Thread(target=self._send, args=(displaced,), daemon=True).start()
+        if own is not None:
+            self._send(own)
+        if not pending.done.wait(self.max_wait_s):
+            with self._lock:
+                own = self._take() if any(p is pending for p in self._waiting) else None
+            if own is not None:
+                self._send(own)
+            pending.done.wait()
+        if pending.output is None:
+            return None
+        return pending.output, pending.usage
+
+    def _take(self) -> List[PendingResume]:
+        pack, self._waiting, self._tokens = self._waiting, [], 0
+        return pack
+
+    def _send(self, pack: List[PendingResume]) -> None:
+        try:
+            if len(pack) == 1:
+                with self._lock:
+                    self.alone += 1
+                return
+            for number, pending in enumerate(pack, 1):
+                pending.resume_id = f"R{number}"
+            with telemetry.span("packed_llm_call"):
+                raw, usage = self.extractor.extract_packed({p.resume_id: p.prompt for p in pack})
+            telemetry.count("packed_requests")
+            answers = parse_packed(raw)
+            sizes = [len(json.dumps(answers[p.resume_id])) if p.resume_id in answers else 0 for p in pack]
+            for pending, share in zip(pack, split_usage(usage, [p.tokens for p in pack], sizes)):
+                pending.output = answers.get(pending.resume_id)
+                pending.usage = share
+            with self._lock:
+                self.requests += 1
+                self.packed += len(pack)
+                self.answered += sum(p.output is not None for p in pack)
+        except Exception as e:
+            # Every resume in a failed pack is retried alone by its own thread
+            print(f"Packed request for {len(pack)} resumes failed: {e}")
+            with self._lock:
+                self.requests += 1
+                self.packed += len(pack)
+        finally:
+            for pending in pack:
+                pending.done.set()
+
+    @property
+    def retried(self) -> int:
+        return self.packed - self.answered
+
+    def report(self) -> str:
+        """Resumes per packed request, and how many resumes still needed a request of their own"""
+        if not self.requests and not self.alone:
+            return "Packing: no resumes needed the LLM"
+        ratio = self.packed / self.requests if self.requests else 0.0
+        total_requests = self.requests + self.retried + self.alone
+        overall = (self.packed + self.alone) / total_requests if total_requests else 0.0
+        return (f"Packing: {self.packed} resumes in {self.requests} packed requests ({ratio:.2f} per request), "
+                f"{self.retried} retried alone, {self.alone} sent alone; "
+                f"{self.packed + self.alone} resumes in {total_requests} LLM requests overall ({overall:.2f} per request)")
+
+
+def parse_packed(raw: str) -> Dict[str, dict]:
+    """Validated Output_format fields by resume ID; elements that are not valid on their own are left out"""
+    try:
+        data = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        # Fenced, wrapped in prose or slightly malformed: recover the results object if possible
+        try:
+            data, _ = parse_json(raw)
+        except ValueError:
+            return {}
+    elements = data.get("results") if isinstance(data, dict) else data
+    answers = {}
+    for element in elements if isinstance(elements, list) else []:
+        if not isinstance(element, dict) or "resume_id" not in element:
+            continue
+        element = dict(element)
+        resume_id = str(element.pop("resume_id"))
+        try:
+            answers[resume_id] = Output_format.model_validate(element).model_dump()
+        except ValidationError:
+            continue
+    return answers
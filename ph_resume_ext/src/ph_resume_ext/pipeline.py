@@ -0,0 +1,46 @@
+"""Long-lived extraction pipeline shared by every resume in a run."""
+import threading
+from typing import Optional
+
+from ph_resume_ext.crews.resume_crew_pr.resume_crew import ResumeCrew, build_llm
+from ph_resume_ext.direct_extractor import DirectExtractor
+from ph_resume_ext.llm_scheduler import LLMScheduler
+from ph_resume_ext.settings import Settings
+
+
+class ResumePipeline:
+    """Builds the LLM client, parsed crew config, agents and tools once and reuses them for every resume.
+
+    Crew.kickoff mutates its tasks and agents, so each call runs on a copy of the template crew.
+    Copies reuse the tool instances and a shallow copy of the LLM, and skip YAML parsing and
+    decorator wiring, so one pipeline is safe to share across concurrent workers. Both engines
+    call the LLM through one scheduler; the crew of each other model in the cascade is built the
+    first time that model is needed.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        self.settings = settings or Settings.from_env()
+        self.scheduler = LLMScheduler.from_settings(self.settings)
+        self.llm = build_llm(self.settings, scheduler=self.scheduler)
+        self.direct_extractor = DirectExtractor(
+            model=self.settings.llm_model,
+            api_key=self.settings.llm_api_key,
+            custom_llm_provider=self.settings.llm_provider,
+            api_base=self.settings.llm_base_url,
+            scheduler=self.scheduler,
+        )
+        self._crews = {self.settings.llm_model: ResumeCrew(llm=self.llm).crew()}
+        self._lock = threading.Lock()
+
+    def crew(self, model: Optional[str] = None):
+        """A per-run crew for model (the configured one by default) sharing the template's LLM, tools and parsed config"""
+        model = model or self.settings.llm_model
+        with self._lock:
+            template = self._crews.get(model)
+            if template is None:
+                llm = build_llm(self.settings, model, self.scheduler)
+                template = self._crews[model] = ResumeCrew(llm=llm).crew()
+            return template.copy()
+
+    def kickoff(self, inputs: dict, model: Optional[str] = None):
+        return self.crew(model).kickoff(inputs=inputs)
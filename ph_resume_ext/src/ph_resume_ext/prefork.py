@@ -0,0 +1,87 @@
+"""Worker processes forked from a warmed-up ResumeFlow, so imports and setup are paid once."""
+import multiprocessing
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+from ph_resume_ext.cache import ExtractionCache
+from ph_resume_ext.near_dup import NearDuplicateIndex
+from ph_resume_ext.telemetry import telemetry
+
+# The flow the pool was forked from; each worker process inherits its own copy
+_flow = None
+
+
+def fork_available() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+class PreforkPool:
+    """Runs ResumeFlow.extract_resume in processes forked once the flow is set up.
+
+    The parent has already imported crewai and LiteLLM, built the pipeline and loaded the
+    taxonomy, so every worker starts warm and serves resumes until the pool is closed. Each
+    worker runs one resume at a time, with its own cache and near-duplicate index connections.
+    Spans, counters, LLM stats, cache hits and near-duplicate matches are sent back with every
+    result, so reports and metrics in the parent cover the workers.
+    """
+
+    def __init__(self, flow, processes: int):
+        global _flow
+        _flow = flow
+        self.flow = flow
+        self.processes = max(1, processes)
+        # Both engines call LiteLLM, so its lazy imports are done once here instead of in every worker
+        flow.pipeline.direct_extractor.warm_up()
+        self._pool = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("fork"),
+                                         initializer=_init_worker, initargs=(self.processes,))
+        # With fork the executor starts every worker on the first submit, before its own threads exist
+        self._pool.submit(int).result()
+
+    def extract(self, resume_name: str, file_path: str) -> dict:
+        output, stats, metrics, trace, counts = self._pool.submit(_extract, resume_name, file_path).result()
+        telemetry.metrics.merge(*metrics)
+        telemetry.adopt(trace)
+        if self.flow.llm_stats is not None:
+            self.flow.llm_stats.extend(stats)
+        for store, (hits, misses) in zip((self.flow.cache, self.flow.near_dup), counts):
+            if store is not None:
+                store.hits += hits
+                store.misses += misses
+        return output
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+
+def _init_worker(processes: int) -> None:
+    # Ctrl+C is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    flow = _flow
+    # SQLite connections must not cross a fork, and trace or profile files are the parent's to write
+    if flow.cache is not None:
+        flow.cache = ExtractionCache(flow.cache.path, flow.cache.max_bytes, flow.cache.version)
+    if flow.near_dup is not None:
+        flow.near_dup = NearDuplicateIndex(flow.near_dup.path, flow.near_dup.threshold, flow.near_dup.version)
+    # Each worker schedules its own LLM calls, so together they stay within the configured rate limits
+    flow.pipeline.scheduler.share(processes)
+    flow.prefork = None
+    flow.manifest = None
+    flow.sink = None
+    telemetry.configure()
+    telemetry.metrics.drain()
+
+
+def _extract(resume_name: str, file_path: str):
+    flow = _flow
+    flow.llm_stats = []
+    stores = (flow.cache, flow.near_dup)
+    before = [(store.hits, store.misses) if store is not None else (0, 0) for store in stores]
+    with telemetry.collect(resume_name) as trace:
+        try:
+            output = flow.extract_resume(resume_name, file_path)
+        except BaseException:
+            telemetry.metrics.drain()
+            raise
+    counts = [(store.hits - hits, store.misses - misses) if store is not None else (0, 0)
+              for store, (hits, misses) in zip(stores, before)]
+    return output, flow.llm_stats, telemetry.metrics.drain(), trace, counts
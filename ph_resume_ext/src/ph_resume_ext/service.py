@@ -0,0 +1,377 @@
+"""Asyncio HTTP service that extracts uploaded resumes with a bounded queue and worker pool."""
+import asyncio
+import collections
+import email.parser
+import email.policy
+import json
+import math
+import os
+import shutil
+import signal
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ph_resume_ext.main import SUPPORTED_FORMATS, ResumeFlow
+from ph_resume_ext.telemetry import telemetry
+
+CONTENT_TYPES = {
+    "application/pdf": ".pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+}
+# Finished jobs can be polled for this long
+RESULT_TTL_S = 600
+# A keep-alive connection with no new request for this long is closed
+IDLE_TIMEOUT_S = 30
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class Job:
+    """One uploaded resume, from the queue to its output or error"""
+
+    __slots__ = ("job_id", "filename", "path", "status", "output", "error", "created", "started", "finished",
+                 "deadline", "done")
+
+    def __init__(self, filename: str, path: str, job_id: str, timeout_s: float):
+        self.job_id = job_id
+        self.filename = filename
+        self.path = path
+        self.status = "queued"
+        self.output: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.created = time.monotonic()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.deadline = self.created + timeout_s
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> dict:
+        data = {"job_id": self.job_id, "filename": self.filename, "status": self.status}
+        if self.started is not None:
+            data["queued_s"] = round(self.started - self.created, 3)
+        if self.finished is not None and self.started is not None:
+            data["run_s"] = round(self.finished - self.started, 3)
+        if self.output is not None:
+            data["output"] = self.output
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class ExtractionService:
+    """Accepts PDF and DOCX uploads over HTTP and extracts them with a shared ResumeFlow.
+
+    POST /extract answers with the Output_format JSON once the resume is done; POST /jobs
+    answers 202 with a job ID right away, and GET /jobs/<id> returns the job's status and
+    output. Uploads are either the raw file (name in ?filename= or X-Filename, or type in
+    Content-Type) or a multipart/form-data file field. At most queue_size jobs wait for one of
+    the workers; further uploads get 429 with a Retry-After estimate. A job that is not done
+    timeout_s after its upload is reported as timed out (504 for /extract). GET /health
+    reports queue depth and GET /metrics the pipeline's Prometheus metrics.
+    """
+
+    def __init__(self, flow: Optional[ResumeFlow] = None, host: Optional[str] = None, port: Optional[int] = None,
+                 workers: Optional[int] = None, queue_size: Optional[int] = None, timeout_s: Optional[float] = None,
+                 max_upload_mb: Optional[float] = None):
+        self.flow = flow or ResumeFlow()
+        state = self.flow.state
+        self.host = host if host is not None else state.service_host
+        self.port = port if port is not None else state.service_port
+        self.workers = max(1, workers if workers is not None else state.max_workers)
+        self.queue_size = max(1, queue_size if queue_size is not None else state.service_queue_size)
+        self.timeout_s = timeout_s if timeout_s is not None else state.service_timeout_s
+        self.max_upload_bytes = int((max_upload_mb if max_upload_mb is not None else state.service_max_upload_mb)
+                                    * 1024 * 1024)
+        self.jobs: Dict[str, Job] = {}
+        self._finished = collections.deque()
+        self._queue: Optional[asyncio.Queue] = None
+        self._server = None
+        self._executor = None
+        self._tasks = []
+        self._stopping: Optional[asyncio.Event] = None
+        self._upload_dir = None
+        self.running = 0
+        # Moving average of job run time, for Retry-After
+        self._mean_run_s = 0.0
+
+    async def start(self) -> None:
+        self._stopping = asyncio.Event()
+        # Building the pipeline parses the crew config and the taxonomy, so it is kept off the request path
+        await asyncio.get_running_loop().run_in_executor(None, self.flow.prepare)
+        threads = self.workers
+        if self.flow.packer is not None:
+            # Packs only fill when enough resumes are in flight at once, as in process_batch
+            threads *= self.flow.packer.max_resumes
+        if self.flow.prefork is not None:
+            # One thread hands uploads to each worker process
+            threads = self.flow.prefork.processes
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="extract")
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(threads)]
+        self._upload_dir = tempfile.mkdtemp(prefix="resume-uploads-")
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"Resume extraction service on http://{self.host}:{self.port} ({threads} workers, "
+              f"queue of {self.queue_size}, {self.timeout_s:g}s timeout, engine {self.flow.state.engine})")
+
+    def stop(self) -> None:
+        """Ask run() to shut down; call on the service's event loop"""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def run(self) -> None:
+        await self.start()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Windows, or not the main thread: Ctrl+C still cancels asyncio.run
+                pass
+        try:
+            await self._stopping.wait()
+        finally:
+            await self.shutdown()
+
+    async def shutdown(self) -> None:
+        """Stop accepting uploads, let running extractions finish, then print the run's reports"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+            self._executor = None
+        if self._upload_dir is not None:
+            shutil.rmtree(self._upload_dir, ignore_errors=True)
+            self._upload_dir = None
+        self.flow.finish()
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.status != "queued":
+                    # Timed out while waiting, and its client has already been answered
+                    continue
+                remaining = job.deadline - time.monotonic()
+                if remaining <= 0:
+                    self._finish(job, "timeout", error=f"Not started within {self.timeout_s:g}s")
+                    continue
+                job.status, job.started = "running", time.monotonic()
+                self.running += 1
+                future = loop.run_in_executor(self._executor, self.flow.extract_tracked, job.filename, job.path)
+                try:
+                    output = await asyncio.wait_for(asyncio.shield(future), remaining)
+                    self._finish(job, "done", output=output)
+                except asyncio.TimeoutError:
+                    self._finish(job, "timeout", error=f"Not finished within {self.timeout_s:g}s")
+                    # A running extraction cannot be interrupted; the worker waits so the pool stays bounded
+                    await asyncio.gather(future, return_exceptions=True)
+                except Exception as e:
+                    self._finish(job, "failed", error=str(e))
+                finally:
+                    self.running -= 1
+                    self._mean_run_s = 0.8 * self._mean_run_s + 0.2 * (time.monotonic() - job.started)
+            finally:
+                self._queue.task_done()
+                try:
+                    os.remove(job.path)
+                except OSError:
+                    pass
+
+    def _finish(self, job: Job, status: str, output: Optional[dict] = None, error: Optional[str] = None) -> None:
+        job.status, job.output, job.error, job.finished = status, output, error, time.monotonic()
+        job.done.set()
+        self._finished.append((job.finished, job.job_id))
+        telemetry.metrics.incr("service_jobs_total", status=status)
+
+    def _expire_queued(self, job: Job) -> None:
+        """Time out a job still waiting for a worker after its deadline; the worker that dequeues it skips it"""
+        if job.status == "queued" and time.monotonic() >= job.deadline:
+            self._finish(job, "timeout", error=f"Not started within {self.timeout_s:g}s")
+
+    def submit(self, filename: str, data: bytes) -> Job:
+        """Queue an upload, or raise HTTPError 429 when the queue is full"""
+        self._expire_jobs()
+        if self._queue.full():
+            raise HTTPError(HTTPStatus.TOO_MANY_REQUESTS, f"Queue is full ({self.queue_size} waiting)",
+                            {"Retry-After": str(self.retry_after())})
+        job_id = uuid.uuid4().hex
+        path = os.path.join(self._upload_dir, job_id + os.path.splitext(filename)[1].lower())
+        with open(path, "wb") as f:
+            f.write(data)
+        job = Job(filename, path, job_id, self.timeout_s)
+        self._queue.put_nowait(job)
+        self.jobs[job_id] = job
+        return job
+
+    def retry_after(self) -> int:
+        """Seconds until the queue has likely drained by one pool's worth of jobs"""
+        return max(1, math.ceil(self._mean_run_s * self._queue.qsize() / self.workers))
+
+    def _expire_jobs(self) -> None:
+        cutoff = time.monotonic() - RESULT_TTL_S
+        while self._finished and self._finished[0][0] < cutoff:
+            self.jobs.pop(self._finished.popleft()[1], None)
+
+    def health(self) -> dict:
+        return {"status": "ok", "queued": self._queue.qsize(), "running": self.running,
+                "workers": len(self._tasks), "queue_size": self.queue_size, "jobs": len(self.jobs)}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader, self.max_upload_bytes), IDLE_TIMEOUT_S)
+                except HTTPError as e:
+                    await _respond(writer, e.status, {"error": str(e)}, e.headers, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, target, headers, body = request
+                started = time.perf_counter()
+                route = urlsplit(target).path.rstrip("/") or "/"
+                try:
+                    status, payload, extra = await self._route(method, target, headers, body)
+                except HTTPError as e:
+                    status, payload, extra = e.status, {"error": str(e)}, e.headers
+                telemetry.metrics.incr("service_requests_total", status=int(status))
+                telemetry.metrics.observe("service_request_seconds", time.perf_counter() - started,
+                                          route=route if not route.startswith("/jobs/") else "/jobs/{id}")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await _respond(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    return
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        if path in ("/extract", "/jobs") and method == "POST":
+            filename, data = parse_upload(headers, body, parse_qs(url.query))
+            job = self.submit(filename, data)
+            if path == "/jobs":
+                return HTTPStatus.ACCEPTED, job.to_dict(), {"Location": f"/jobs/{job.job_id}"}
+            try:
+                # Answered at the deadline even when the job is still queued behind others
+                await asyncio.wait_for(job.done.wait(), max(0.0, job.deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                self._expire_queued(job)
+            extra = {"X-Job-Id": job.job_id}
+            if job.status == "done":
+                return HTTPStatus.OK, job.output, extra
+            if job.status in ("timeout", "running"):
+                return HTTPStatus.GATEWAY_TIMEOUT, job.to_dict(), extra
+            return HTTPStatus.INTERNAL_SERVER_ERROR, job.to_dict(), extra
+        if path.startswith("/jobs/") and method == "GET":
+            job = self.jobs.get(path[len("/jobs/"):])
+            if job is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "Unknown or expired job")
+            self._expire_queued(job)
+            return HTTPStatus.OK, job.to_dict(), {}
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, self.health(), {}
+        if path == "/metrics" and method == "GET":
+            return HTTPStatus.OK, telemetry.metrics.to_prometheus(), {}
+        if path in ("/extract", "/jobs", "/health", "/metrics") or path.startswith("/jobs/"):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not allowed on {path}")
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+
+async def _read_request(reader: asyncio.StreamReader, max_body: int) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """(method, target, lower-cased headers, body) of the next request, or None once the client hangs up"""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= 100:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "Send uploads with a Content-Length")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length > max_body:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Uploads are limited to {max_body} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+async def _respond(writer: asyncio.StreamWriter, status: int, payload, headers: Dict[str, str],
+                   keep_alive: bool) -> None:
+    if isinstance(payload, str):
+        data, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+    else:
+        data, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+    status = HTTPStatus(status)
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Type: {content_type}",
+             f"Content-Length: {len(data)}", f"Connection: {'keep-alive' if keep_alive else 'close'}",
+             *(f"{name}: {value}" for name, value in headers.items())]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data)
+    await writer.drain()
+
+
+def parse_upload(headers: Dict[str, str], body: bytes, query: Dict[str, list]) -> Tuple[str, bytes]:
+    """(file name, file bytes) of an upload sent raw or as a multipart/form-data file field"""
+    content_type = headers.get("content-type", "")
+    if content_type.lower().startswith("multipart/form-data"):
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body)
+        for part in message.iter_parts() if message.is_multipart() else ():
+            if part.get_filename():
+                filename, data = part.get_filename(), part.get_payload(decode=True) or b""
+                break
+        else:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "No file field in the multipart upload")
+    else:
+        filename = (query.get("filename") or [headers.get("x-filename", "")])[0]
+        if not os.path.splitext(filename)[1]:
+            extension = CONTENT_TYPES.get(content_type.split(";")[0].strip().lower(), "")
+            filename = (filename or "upload") + extension
+        data = body
+    filename = os.path.basename(filename.replace("\\", "/"))
+    if os.path.splitext(filename)[1].lower() not in SUPPORTED_FORMATS:
+        raise HTTPError(HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                        f"Upload a {' or '.join(SUPPORTED_FORMATS)} file (name it with ?filename= or X-Filename)")
+    if not data:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Empty upload")
+    return filename, data
+
+
+def serve():
+    """Run the extraction service until interrupted, configured through the RESUME_* environment"""
+    asyncio.run(ExtractionService().run())
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,51 @@
+"""Runtime configuration for the extraction pipeline."""
+import os
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+
+class Settings(BaseModel):
+    """LLM connection and scheduling settings, read from the environment (optionally seeded from a .env file)."""
+
+    llm_model: Optional[str] = None
+    llm_api_key: Optional[str] = None
+    llm_provider: str = "gemini"
+    llm_base_url: Optional[str] = None
+    # Models tried in order, cheapest first; the next one is only used when an answer is invalid
+    # (see main.valid_output) or the model keeps failing. Empty means llm_model alone
+    llm_cascade: List[str] = []
+    # Requests and tokens per minute allowed per model, 0 for no limit
+    llm_rpm: float = 0
+    llm_tpm: float = 0
+    llm_max_retries: int = 3
+    llm_backoff_s: float = 1.0
+    # Consecutive failures that open a model's circuit breaker, and seconds before it is probed again
+    llm_breaker_failures: int = 5
+    llm_breaker_reset_s: float = 30.0
+    # "model=prompt/completion,..." USD per million tokens, for models LiteLLM has no price for
+    llm_prices: str = ""
+
+    @classmethod
+    def from_env(cls, env_file: Optional[str] = None) -> "Settings":
+        """Load settings from env_file, $RESUME_ENV_FILE or the nearest .env, without overriding set variables"""
+        env_file = env_file or os.getenv("RESUME_ENV_FILE")
+        if env_file:
+            load_dotenv(dotenv_path=env_file)
+        else:
+            load_dotenv()
+        return cls(
+            llm_model=os.getenv("GEMINI_MODEL"),
+            llm_api_key=os.getenv("GEMINI_API_KEY"),
+            llm_provider=os.getenv("LLM_PROVIDER", "gemini"),
+            llm_base_url=os.getenv("LLM_BASE_URL"),
+            llm_cascade=[model.strip() for model in os.getenv("RESUME_LLM_CASCADE", "").split(",") if model.strip()],
+            llm_rpm=float(os.getenv("RESUME_LLM_RPM", "0")),
+            llm_tpm=float(os.getenv("RESUME_LLM_TPM", "0")),
+            llm_max_retries=int(os.getenv("RESUME_LLM_MAX_RETRIES", "3")),
+            llm_backoff_s=float(os.getenv("RESUME_LLM_BACKOFF", "1")),
+            llm_breaker_failures=int(os.getenv("RESUME_LLM_BREAKER_FAILURES", "5")),
+            llm_breaker_reset_s=float(os.getenv("RESUME_LLM_BREAKER_RESET", "30")),
+            llm_prices=os.getenv("RESUME_LLM_PRICES", ""),
+        )
@@ -0,0 +1,235 @@
+"""Pluggable output sinks for extraction results."""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+
+
+class ResultSink:
+    """Where extracted outputs go. write() may buffer; flush() makes buffered records durable.
+
+    Once records are durable the sink passes their sources (the name they were written under
+    unless write() was given one) to on_durable, so a caller can checkpoint each of them.
+    """
+
+    on_durable: Optional[Callable[[List[str]], None]] = None
+
+    def write(self, name: str, output: dict, source: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def _durable(self, sources: List[str]) -> None:
+        if sources and self.on_durable is not None:
+            self.on_durable(sources)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _fsync_dir(path: str) -> None:
+    """Flush a directory entry change such as a rename to disk; not possible, nor needed, on Windows"""
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class JsonFileSink(ResultSink):
+    """One pretty-printed <name>.json per resume, replaced atomically so readers never see a partial file.
+
+    With fsync (the default) the file's contents are synced before the rename and the directory
+    after it, so a resume is only reported durable once both would survive a power loss.
+    """
+
+    def __init__(self, output_dir: str, fsync: bool = True):
+        self.output_dir = output_dir
+        self.fsync = fsync
+        os.makedirs(output_dir, exist_ok=True)
+
+    def write(self, name: str, output: dict, source: Optional[str] = None) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, prefix=f".{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(output, f, ensure_ascii=False, indent=4)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.output_dir, name + ".json"))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        if self.fsync:
+            _fsync_dir(self.output_dir)
+        self._durable([source or name])
+
+
+class JsonlSink(ResultSink):
+    """Append-only JSON Lines file written in buffered batches.
+
+    Each flush appends whole lines with a single write() on an O_APPEND descriptor. A torn
+    trailing line left by a crash is cut off when the sink is reopened, and read_jsonl skips
+    a trailing line that is still being written.
+    """
+
+    def __init__(self, path: str, batch_size: int = 100, fsync: bool = True):
+        self.path = path
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self._buffer: List[str] = []
+        self._sources: List[str] = []
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._truncate_partial_line()
+
+    def _truncate_partial_line(self, chunk_size: int = 65536) -> None:
+        size = os.fstat(self._fd).st_size
+        end = size
+        with open(self.path, 'rb') as f:
+            # Read backwards until the last newline, however long the torn record is
+            while end > 0:
+                start = max(0, end - chunk_size)
+                f.seek(start)
+                chunk = f.read(end - start)
+                last_newline = chunk.rfind(b"\n")
+                if last_newline >= 0:
+                    end = start + last_newline + 1
+                    break
+                end = start
+        if end < size:
+            os.truncate(self.path, end)
+
+    def write(self, name: str, output: dict, source: Optional[str] = None) -> None:
+        line = json.dumps({"resume": name, "output": output}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._buffer.append(line)
+            self._sources.append(source or name)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        data = "".join(self._buffer).encode("utf-8")
+        sources = list(self._sources)
+        self._buffer.clear()
+        self._sources.clear()
+        written = 0
+        while written < len(data):
+            written += os.write(self._fd, data[written:])
+        if self.fsync:
+            os.fsync(self._fd)
+        self._durable(sources)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            os.close(self._fd)
+
+
+def read_jsonl(path: str) -> Iterator[Tuple[str, dict]]:
+    """Yield (resume, output) records, ignoring a trailing line that is not complete yet"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            record = json.loads(line)
+            yield record["resume"], record["output"]
+
+
+class SQLiteSink(ResultSink):
+    """SQLite table of results with indexed email, name and status columns, bulk-inserted per transaction"""
+
+    def __init__(self, path: str, batch_size: int = 500):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[tuple] = []
+        self._sources: List[str] = []
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " resume TEXT PRIMARY KEY,"
+            " status TEXT,"
+            " first_name TEXT,"
+            " last_name TEXT,"
+            " email_address TEXT,"
+            " payload TEXT NOT NULL,"
+            " updated_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_results_email ON results(email_address);"
+            "CREATE INDEX IF NOT EXISTS idx_results_name ON results(last_name, first_name);"
+            "CREATE INDEX IF NOT EXISTS idx_results_status ON results(status);"
+        )
+        self._conn.commit()
+
+    def write(self, name: str, output: dict, source: Optional[str] = None) -> None:
+        row = (
+            name,
+            output.get("status") or ("Fail" if "raw_text" in output else None),
+            output.get("First_Name"),
+            output.get("Last_Name"),
+            output.get("email_address"),
+            json.dumps(output, ensure_ascii=False),
+            time.time(),
+        )
+        with self._lock:
+            self._buffer.append(row)
+            self._sources.append(source or name)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        # One transaction per batch: readers see either none or all of it
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results"
+                " (resume, status, first_name, last_name, email_address, payload, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._buffer,
+            )
+        self._buffer.clear()
+        sources = list(self._sources)
+        self._sources.clear()
+        self._durable(sources)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+
+def make_sink(kind: str, output_dir: str, batch_size: int = 100) -> ResultSink:
+    """Build the sink named by kind: "json" (one file per resume), "jsonl" or "sqlite" """
+    if kind == "json":
+        return JsonFileSink(output_dir)
+    if kind == "jsonl":
+        return JsonlSink(os.path.join(output_dir, "results.jsonl"), batch_size=batch_size)
+    if kind == "sqlite":
+        return SQLiteSink(os.path.join(output_dir, "results.sqlite"), batch_size=batch_size)
+    raise ValueError(f"Unknown output sink {kind!r}; expected json, jsonl or sqlite")
@@ -0,0 +1,241 @@
+"""Canonical skill taxonomy with aliases, matched against text by an Aho-Corasick automaton."""
+import hashlib
+import json
+import os
+import re
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ph_resume_ext.compaction import split_sections
+
+DEFAULT_TAXONOMY = os.path.join(os.path.dirname(__file__), "skills_taxonomy.json")
+
+# Words, and every other non-space character on its own, so "Node.js" and "C++" keep their punctuation
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenise(text: str) -> List[str]:
+    return TOKEN_RE.findall(text)
+
+
+def normalise_alias(text: str) -> str:
+    """Lower-cased tokens joined by single spaces, so spacing differences ("Radius -7") do not matter"""
+    return " ".join(tokenise(text.lower()))
+
+
+class SkillTaxonomy:
+    """Canonical skill names and their aliases, compiled into an Aho-Corasick automaton over tokens.
+
+    Text and aliases are split into word and punctuation tokens, and transitions are taken per
+    token, so the automaton stays several times smaller than a character trie and every match is
+    word-aligned. find() scans text once, in time linear in its length plus the number of matches,
+    and keeps the leftmost-longest matches ("Amazon Web Services" wins over "Amazon"). Aliases are
+    matched case-insensitively, except those listed in case_sensitive, which must appear exactly
+    as written ("Go", "R"). A one-letter alias does not match next to a hyphen, so "C-level" and
+    "C-OB" do not mention C. Aliases listed in skills_section_only are also common words or names
+    ("Spring 2019", "Taylor Swift", "Go to market"), so find() only matches them under a skills
+    heading; skill strings given to canonical() and expand() still map through them.
+    """
+
+    source: Optional[str] = None
+
+    def __init__(self, skills: Dict[str, Iterable[str]], case_sensitive: Iterable[str] = (),
+                 skills_section_only: Iterable[str] = ()):
+        self.names: List[str] = []
+        self.aliases: Dict[str, int] = {}
+        self._vocab: Dict[str, int] = {}
+        exact = set(case_sensitive)
+        ambiguous = {" ".join(tokenise(alias)).lower() for alias in skills_section_only}
+        patterns: List[Tuple[List[int], int, Optional[Tuple[str, ...]]]] = []
+        letters, section_only = set(), set()
+        for name, aliases in skills.items():
+            skill = len(self.names)
+            self.names.append(name)
+            for alias in (name, *aliases):
+                tokens = tokenise(alias)
+                key = " ".join(tokens).lower()
+                if not key or key in self.aliases:
+                    continue
+                self.aliases[key] = skill
+                ids = [self._vocab.setdefault(token, len(self._vocab)) for token in key.split(" ")]
+                written = tuple(tokens) if alias.strip() in exact else None
+                if len(key) == 1:
+                    letters.add(len(patterns))
+                if key in ambiguous:
+                    section_only.add(len(patterns))
+                patterns.append((ids, skill, written))
+        self._build(patterns)
+        self._letters = letters
+        self._section_only = section_only
+        self._section_only_keys = sorted(ambiguous & self.aliases.keys())
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        """Load {"skills": {canonical: [aliases]}, "case_sensitive": [aliases], "skills_section_only": [aliases]}"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        taxonomy = cls(data.get("skills", {}), data.get("case_sensitive", ()), data.get("skills_section_only", ()))
+        taxonomy.source = path
+        return taxonomy
+
+    def _build(self, patterns: List[Tuple[List[int], int, Optional[Tuple[str, ...]]]]) -> None:
+        # Transitions live in one flat dict keyed on node * width + token id
+        width = max(1, len(self._vocab))
+        goto: Dict[int, int] = {}
+        children: List[List[int]] = [[]]
+        terminal = array("l", [-1])
+        for pattern_id, (ids, _, _) in enumerate(patterns):
+            node = 0
+            for token in ids:
+                edge = node * width + token
+                child = goto.get(edge)
+                if child is None:
+                    child = goto[edge] = len(children)
+                    children.append([])
+                    terminal.append(-1)
+                    children[node].append(edge)
+                node = child
+            terminal[node] = pattern_id
+
+        # Breadth-first so every node's failure target is final before its children need it
+        fail = array("l", [0]) * len(children)
+        output_link = array("l", [-1]) * len(children)
+        queue = deque(goto[edge] for edge in children[0])
+        while queue:
+            node = queue.popleft()
+            for edge in children[node]:
+                child = goto[edge]
+                token = edge % width
+                target = fail[node]
+                while target and target * width + token not in goto:
+                    target = fail[target]
+                target = goto.get(target * width + token, 0)
+                fail[child] = target
+                output_link[child] = target if terminal[target] >= 0 else output_link[target]
+                queue.append(child)
+
+        self._width = width
+        self._goto = goto
+        self._fail = fail
+        self._terminal = terminal
+        self._output_link = output_link
+        self._lengths = array("l", (len(ids) for ids, _, _ in patterns))
+        self._skills = array("l", (skill for _, skill, _ in patterns))
+        self._exact = {pattern_id: written for pattern_id, (_, _, written) in enumerate(patterns) if written}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def nodes(self) -> int:
+        return len(self._fail)
+
+    def fingerprint(self) -> str:
+        """Stable hash of the skills and aliases, for cache keys and evaluation state"""
+        digest = hashlib.sha256()
+        for key, skill in sorted(self.aliases.items()):
+            digest.update(f"{key}\t{self.names[skill]}\n".encode("utf-8"))
+        for written in sorted(self._exact.values()):
+            digest.update(f"={' '.join(written)}\n".encode("utf-8"))
+        for key in self._section_only_keys:
+            digest.update(f"~{key}\n".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def matches(self, tokens: List[str], skills_section: bool = True) -> List[Tuple[int, int, int]]:
+        """Non-overlapping (start, end, skill) token spans, leftmost-longest.
+
+        Outside a skills section (skills_section=False) the skills_section_only aliases never match.
+        """
+        vocab, width = self._vocab, self._width
+        goto, fail, terminal, output_link = self._goto, self._fail, self._terminal, self._output_link
+        lengths, exact, letters = self._lengths, self._exact, self._letters
+        section_only = () if skills_section else self._section_only
+        best: Dict[int, Tuple[int, int]] = {}
+        node = 0
+        for position, token in enumerate(tokens):
+            token_id = vocab.get(token.lower())
+            if token_id is None:
+                # No alias contains this token, so every partial match ends here
+                node = 0
+                continue
+            while node and node * width + token_id not in goto:
+                node = fail[node]
+            node = goto.get(node * width + token_id, 0)
+            found = node if terminal[node] >= 0 else output_link[node]
+            while found > 0:
+                pattern_id = terminal[found]
+                found = output_link[found]
+                start = position + 1 - lengths[pattern_id]
+                if pattern_id in exact and tuple(tokens[start:position + 1]) != exact[pattern_id]:
+                    continue
+                if pattern_id in letters and "-" in tokens[max(0, start - 1):start] + tokens[position + 1:position + 2]:
+                    continue
+                if pattern_id in section_only:
+                    continue
+                if position + 1 > best.get(start, (start, -1))[0]:
+                    best[start] = (position + 1, pattern_id)
+
+        selected = []
+        covered = 0
+        for start in sorted(best):
+            end, pattern_id = best[start]
+            if start >= covered:
+                selected.append((start, end, self._skills[pattern_id]))
+                covered = end
+        return selected
+
+    def find(self, text: str) -> List[str]:
+        """Canonical skills mentioned in text, in order of first mention"""
+        if not self._section_only:
+            return list(dict.fromkeys(self.names[skill] for _, _, skill in self.matches(tokenise(text))))
+        found = []
+        for section, lines in split_sections(text.splitlines()):
+            matches = self.matches(tokenise("\n".join(lines)), skills_section=section == "skills")
+            found.extend(self.names[skill] for _, _, skill in matches)
+        return list(dict.fromkeys(found))
+
+    def canonical(self, skill: str) -> Optional[str]:
+        """Canonical name of a skill that is exactly a known name or alias, else None"""
+        index = self.aliases.get(normalise_alias(skill))
+        return self.names[index] if index is not None else None
+
+    def expand(self, skill: str) -> List[str]:
+        """Canonical names for one extracted skill string.
+
+        An exact alias maps to its skill; a string mostly made of known skills, such as
+        "Python (NumPy, Pandas)", is split into them; anything else is kept as written.
+        """
+        known = self.canonical(skill)
+        if known is not None:
+            return [known]
+        tokens = tokenise(skill)
+        matches = self.matches(tokens)
+        words = sum(token[0].isalnum() for token in tokens)
+        covered = sum(token[0].isalnum() for start, end, _ in matches for token in tokens[start:end])
+        if matches and covered * 2 >= words:
+            return list(dict.fromkeys(self.names[index] for _, _, index in matches))
+        return [skill.strip()]
+
+    def normalise(self, skills: Iterable[str]) -> List[str]:
+        """Canonical, de-duplicated form of a list of extracted skills, keeping their order"""
+        normalised = {}
+        for skill in skills:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            for name in self.expand(skill):
+                normalised.setdefault(name.lower(), name)
+        return list(normalised.values())
+
+
+_loaded: Dict[str, SkillTaxonomy] = {}
+
+
+def load_taxonomy(path: Optional[str] = DEFAULT_TAXONOMY) -> Optional[SkillTaxonomy]:
+    """The taxonomy at path, built once per process; None when path is empty"""
+    if not path:
+        return None
+    taxonomy = _loaded.get(path)
+    if taxonomy is None:
+        taxonomy = _loaded[path] = SkillTaxonomy.from_file(path)
+    return taxonomy
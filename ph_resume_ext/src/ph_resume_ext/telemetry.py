@@ -0,0 +1,369 @@
+"""Per-stage tracing, metrics export and an opt-in profiling hook for the extraction pipeline."""
+import bisect
+import contextvars
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense, plus count and sum"""
+
+    def __init__(self, buckets=SECONDS_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile, the usual estimate from bucketed data"""
+        if not self.count:
+            return 0.0
+        target, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def copy(self) -> "Histogram":
+        histogram = Histogram(self.buckets)
+        histogram.counts, histogram.count, histogram.sum = list(self.counts), self.count, self.sum
+        return histogram
+
+
+class Metrics:
+    """Thread-safe counters and histograms, keyed by metric name and labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    def incr(self, name: str, value: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets=SECONDS_BUCKETS, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def snapshot(self, prefix: str = "") -> Tuple[dict, dict]:
+        """Copies of the counters and histograms whose names start with prefix, safe to read while recording goes on"""
+        with self._lock:
+            counters = {name: dict(series) for name, series in self.counters.items() if name.startswith(prefix)}
+            histograms = {name: {key: histogram.copy() for key, histogram in series.items()}
+                          for name, series in self.histograms.items() if name.startswith(prefix)}
+        return counters, histograms
+
+    def drain(self) -> Tuple[dict, dict]:
+        """Take the counters and histograms recorded so far and start from zero, e.g. in a worker process"""
+        with self._lock:
+            taken = (self.counters, self.histograms)
+            self.counters, self.histograms = {}, {}
+        return taken
+
+    def merge(self, counters: dict, histograms: dict) -> None:
+        """Add counters and histograms taken with drain() from another Metrics"""
+        with self._lock:
+            for name, series in counters.items():
+                mine = self.counters.setdefault(name, {})
+                for key, value in series.items():
+                    mine[key] = mine.get(key, 0) + value
+            for name, series in histograms.items():
+                mine = self.histograms.setdefault(name, {})
+                for key, other in series.items():
+                    histogram = mine.get(key)
+                    if histogram is None:
+                        histogram = mine[key] = Histogram(other.buckets)
+                    histogram.counts = [a + b for a, b in zip(histogram.counts, other.counts)]
+                    histogram.count += other.count
+                    histogram.sum += other.sum
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format, e.g. for node_exporter's textfile collector"""
+        def labels(key, extra=()):
+            pairs = [*key, *extra]
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}" if pairs else ""
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines += [f"{name}{labels(key)} {value:g}" for key, value in sorted(series.items())]
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    bounds = [f"{bound:g}" for bound in histogram.buckets] + ["+Inf"]
+                    for bound, count in zip(bounds, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{labels(key, [('le', bound)])} {cumulative}")
+                    lines.append(f"{name}_sum{labels(key)} {histogram.sum:g}")
+                    lines.append(f"{name}_count{labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in sorted(series.items())]
+                    for name, series in sorted(self.counters.items())
+                },
+                "histograms": {
+                    name: [
+                        {"labels": dict(key), "count": h.count, "sum": h.sum,
+                         "buckets": dict(zip([f"{b:g}" for b in h.buckets] + ["+Inf"], h.counts))}
+                        for key, h in sorted(series.items())
+                    ]
+                    for name, series in sorted(self.histograms.items())
+                },
+            }
+
+    def export(self, path: str) -> None:
+        """Write the metrics atomically: JSON for a .json path, Prometheus text format otherwise"""
+        if path.endswith(".json"):
+            data = json.dumps(self.to_dict(), indent=4)
+        else:
+            data = self.to_prometheus()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+class ResumeTrace:
+    """Spans, counters and outcome of one resume"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.spans: List[dict] = []
+        self.counters: Dict[str, float] = {}
+        self.outcome = "success"
+        self.depth = 0
+
+    def to_dict(self, total_s: float) -> dict:
+        return {"resume": self.name, "outcome": self.outcome, "total_s": round(total_s, 6),
+                "counters": self.counters, "spans": self.spans}
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("resume_trace", default=None)
+
+
+class Telemetry:
+    """Collects stage timings and counters for every resume, and exports them.
+
+    Every span is recorded in the resume_stage_seconds histogram; when a trace_path is set the
+    spans of each resume are also appended to it as one JSON line. With a profile_path, a
+    sample of resumes (profile_sample) runs under cProfile and the merged stats are dumped there.
+    """
+
+    def __init__(self, trace_path: Optional[str] = None, profile_path: Optional[str] = None,
+                 profile_sample: float = 1.0):
+        self.metrics = Metrics()
+        self.trace_path = trace_path
+        self.profile_path = profile_path
+        self.profile_sample = profile_sample
+        self._trace_file = None
+        self._lock = threading.Lock()
+        self._profiles: List[cProfile.Profile] = []
+
+    def configure(self, trace_path: Optional[str] = None, profile_path: Optional[str] = None,
+                  profile_sample: float = 1.0) -> None:
+        self.close()
+        self.trace_path = trace_path or None
+        self.profile_path = profile_path or None
+        self.profile_sample = profile_sample
+
+    @staticmethod
+    def current() -> Optional[ResumeTrace]:
+        return _current.get()
+
+    @contextmanager
+    def span(self, stage: str):
+        """Time a pipeline stage, attributing it to the resume being processed on this thread"""
+        trace = _current.get()
+        started = time.perf_counter()
+        if trace is not None:
+            trace.depth += 1
+        try:
+            yield
+        finally:
+            if trace is not None:
+                trace.depth -= 1
+            self.record(stage, started, time.perf_counter() - started)
+
+    def record(self, stage: str, started: float, elapsed: float) -> None:
+        """Record a stage timed elsewhere; started is a time.perf_counter() value"""
+        self.metrics.observe("resume_stage_seconds", elapsed, stage=stage)
+        trace = _current.get()
+        if trace is not None:
+            trace.spans.append({"stage": stage, "start_s": round(started - trace.started, 6),
+                                "duration_s": round(elapsed, 6), "depth": trace.depth})
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        """Add to a run-wide counter and to the current resume's counter of the same name"""
+        self.metrics.incr(f"resume_{name}_total", value, **labels)
+        trace = _current.get()
+        if trace is not None:
+            trace.counters[name] = trace.counters.get(name, 0) + value
+
+    def annotate(self, outcome: str) -> None:
+        trace = _current.get()
+        if trace is not None:
+            trace.outcome = outcome
+
+    @contextmanager
+    def collect(self, name: str):
+        """Attribute spans and counters on this thread to a fresh trace, without recording a resume"""
+        trace = ResumeTrace(name)
+        token = _current.set(trace)
+        try:
+            yield trace
+        finally:
+            _current.reset(token)
+
+    def adopt(self, trace: ResumeTrace) -> None:
+        """Add the spans, counters and outcome of a trace collected elsewhere to the current resume"""
+        current = _current.get()
+        if current is None:
+            return
+        offset = trace.started - current.started
+        for span in trace.spans:
+            current.spans.append(dict(span, start_s=round(span["start_s"] + offset, 6)))
+        for name, value in trace.counters.items():
+            current.counters[name] = current.counters.get(name, 0) + value
+        current.outcome = trace.outcome
+
+    @contextmanager
+    def resume(self, name: str):
+        """Scope for one resume: records its end-to-end time, outcome, trace line and optional profile"""
+        trace = ResumeTrace(name)
+        token = _current.set(trace)
+        profile = self._start_profile()
+        try:
+            yield trace
+        except BaseException:
+            trace.outcome = "failed"
+            raise
+        finally:
+            if profile is not None:
+                profile.disable()
+                with self._lock:
+                    self._profiles.append(profile)
+            _current.reset(token)
+            total = time.perf_counter() - trace.started
+            self.metrics.observe("resume_seconds", total, outcome=trace.outcome)
+            self.metrics.incr("resumes_total", outcome=trace.outcome)
+            for counter in ("prompt_tokens", "completion_tokens"):
+                if counter in trace.counters:
+                    self.metrics.observe("resume_llm_tokens", trace.counters[counter], TOKEN_BUCKETS,
+                                         type=counter.split("_")[0])
+            if self.trace_path:
+                self._write_trace(trace.to_dict(total))
+
+    def _start_profile(self) -> Optional[cProfile.Profile]:
+        if not self.profile_path or random.random() >= self.profile_sample:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per process; skip resumes that overlap it
+            return None
+        return profile
+
+    def _write_trace(self, record: dict) -> None:
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            if self._trace_file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.trace_path)), exist_ok=True)
+                self._trace_file = open(self.trace_path, "a", encoding="utf-8")
+            self._trace_file.write(line)
+
+    def stage_report(self) -> str:
+        """Count, total and estimated p50/p95 per stage, slowest stages first"""
+        _, histograms = self.metrics.snapshot("resume_stage_seconds")
+        stages = [(dict(key).get("stage"), h) for key, h in histograms.get("resume_stage_seconds", {}).items()]
+        lines = [f"{'stage':16} {'count':>7} {'total s':>9} {'mean ms':>9} {'p50 ms<=':>9} {'p95 ms<=':>9}"]
+        for stage, h in sorted(stages, key=lambda item: -item[1].sum):
+            lines.append(f"{stage:16} {h.count:7d} {h.sum:9.2f} {h.sum / h.count * 1000:9.1f} "
+                         f"{h.quantile(0.5) * 1000:9.0f} {h.quantile(0.95) * 1000:9.0f}")
+        return "\n".join(lines)
+
+    def profile_report(self, limit: int = 15) -> str:
+        """Dump the merged profile to profile_path and return its top functions by cumulative time"""
+        with self._lock:
+            profiles, self._profiles = self._profiles, []
+        if not profiles:
+            return ""
+        out = io.StringIO()
+        stats = pstats.Stats(profiles[0], stream=out)
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(self.profile_path)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return f"Profile of {len(profiles)} resumes written to {self.profile_path}\n{out.getvalue()}"
+
+    def close(self) -> None:
+        with self._lock:
+            if self._trace_file is not None:
+                self._trace_file.close()
+                self._trace_file = None
+
+
+def _record_tool(source, event) -> None:
+    elapsed = (event.finished_at - event.started_at).total_seconds()
+    telemetry.record(f"tool:{event.tool_name}", time.perf_counter() - elapsed, elapsed)
+
+
+def install_crewai_hooks() -> None:
+    """Count crew LLM calls and failed (retried) calls, and time agent tool runs, from crewai's event bus"""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    try:
+        from crewai.events.event_bus import crewai_event_bus
+        from crewai.events.types.llm_events import LLMCallFailedEvent, LLMCallStartedEvent
+        from crewai.events.types.tool_usage_events import ToolUsageFinishedEvent
+    except ImportError:
+        return
+    # Handlers run synchronously on the thread making the call, so the current resume is known
+    crewai_event_bus.register_handler(LLMCallStartedEvent, lambda source, event: telemetry.count("llm_requests"))
+    crewai_event_bus.register_handler(LLMCallFailedEvent, lambda source, event: telemetry.count("llm_retries"))
+    crewai_event_bus.register_handler(ToolUsageFinishedEvent, _record_tool)
+    _hooks_installed = True
+
+
+_hooks_installed = False
+
+# Shared by main.py and the tools, which have no handle on the flow
+telemetry = Telemetry()
@@ -1,8 +1,47 @@
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-from typing import Type
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Type
 import re
 
+# Control characters below 32 are dropped, except tab/newline/carriage return which carry structure
+_CONTROL_CHARS = {code: None for code in range(32) if chr(code) not in '\n\t\r'}
+
+# One pass over the text handles every whitespace rule:
+#  - a line break with the surrounding spaces/tabs/CRs becomes "\n", or "\n\n" for a paragraph break
+#    (this also strips each line, since whitespace next to a newline is consumed)
+#  - runs of spaces collapse to one space, and each run of tabs becomes one space
+# A lone "\n" is already normalised, so it is not matched at all
+_WHITESPACE_RE = re.compile(r'[ \t\r]+\n[ \t\r\n]*|\n[ \t\r\n]+| {2,}|\t+')
+
+
+def _collapse_whitespace(match: re.Match) -> str:
+    newlines = match.group().count('\n')
+    if not newlines:
+        return ' '
+    return '\n' if newlines == 1 else '\n\n'
+
+
+def clean_text(text: str) -> str:
+    """Remove non-ASCII and control characters and normalise whitespace, preserving paragraph structure."""
+    # Handle empty or None input
+    if not text or not isinstance(text, str):
+        return ""
+    # Non-ASCII characters are dropped by the codec and control characters by the translation
+    # table, each in a single C-level pass
+    text = text.encode('ascii', 'ignore').decode('ascii').translate(_CONTROL_CHARS)
+    return _WHITESPACE_RE.sub(_collapse_whitespace, text).strip()
+
+
+def clean_texts(texts: Iterable[str], max_workers: int = 1) -> List[str]:
+    """Clean many documents at once, across a process pool when max_workers > 1."""
+    texts = list(texts)
+    if max_workers <= 1 or len(texts) < 2:
+        return [clean_text(text) for text in texts]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(clean_text, texts, chunksize=max(1, len(texts) // (max_workers * 4))))
+
+
 class TextCleanerInput(BaseModel):
     """Input schema for TextCleaner Tool."""
     text: str = Field(..., description="The raw text content to be cleaned")
@@ -19,38 +58,7 @@ class TextCleanerTool(BaseTool):
 
     def _run(self, text: str) -> str:
         try:
-            # Handle empty or None input
-            if not text or not isinstance(text, str):
-                return ""
-            
-            # Remove control characters except for basic whitespace
-            # Keep newlines, tabs, and spaces for structure
-            text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\t\r')
-            
-            # Remove non-ASCII characters but preserve basic punctuation and symbols
-            # Allow ASCII printable characters (32-126) plus basic whitespace
-            text = ''.join(char for char in text if ord(char) <= 127)
-            
-            # Normalize whitespace while preserving paragraph structure
-            # Replace multiple spaces with single space
-            text = re.sub(r' +', ' ', text)
-            
-            # Replace multiple tabs with single space
-            text = re.sub(r'\t+', ' ', text)
-            
-            # Normalize line breaks - replace multiple newlines with double newline (paragraph break)
-            text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-            
-            # Remove trailing/leading whitespace from each line while preserving structure
-            lines = text.split('\n')
-            cleaned_lines = [line.strip() for line in lines]
-            text = '\n'.join(cleaned_lines)
-            
-            # Remove leading and trailing whitespace from entire text
-            text = text.strip()
-            
-            return text
-            
+            return clean_text(text)
         except Exception as e:
             # Return original text if cleaning fails
             return text if isinstance(text, str) else ""
@@ -1,7 +1,12 @@
-from docx import Document
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
+from typing import Iterator
 import json
+import zipfile
+import xml.etree.ElementTree as ET
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
 
 class ExtractTextInput(BaseModel):
     """Input schema for DocumentTool."""
@@ -14,35 +19,83 @@ class ExtractTextInput(BaseModel):
 class ExtractTextTool(BaseTool):
 
     name: str = "Extract Text from DOCX"
-    description: str = "Extracts all text from a .docx document file, including paragraphs and tables."
+    description: str = "Extracts all text from a .docx document file, including paragraphs, tables and text boxes."
 
     def _run(self, file_path: str, page_range: str = "all") -> str:
         if not file_path.lower().endswith(".docx"):
             return json.dumps({"status": "error", "message": f"Unsupported file type for {file_path}. Only .docx is supported."})
-        
+
         try:
             text = self.extract_text_from_docx(file_path)
             if not text.strip():
                 return json.dumps({"status": "error", "message": "No text extracted from document"})
-            
+
             return json.dumps({"status": "success", "file_path": file_path, "content": text})
         except Exception as e:
             return json.dumps({"status": "error", "message": f"Error extracting DOCX content: {e}"})
 
     def extract_text_from_docx(self, file_path: str) -> str:
-        doc = Document(file_path)
-        texts = []
-
-        # Extract paragraphs
-        for para in doc.paragraphs:
-            if para.text.strip():
-                texts.append(para.text.strip())
-
-        # Extract tables (row by row, cell by cell)
-        for table in doc.tables:
-            for row in table.rows:
-                row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
-                if row_text:
-                    texts.append(" | ".join(row_text))
-
-        return "\n".join(texts)
+        return "\n".join(iter_docx_text(file_path))
+
+
+def iter_docx_text(file_path: str) -> Iterator[str]:
+    """Stream text out of word/document.xml in a single pass without building the python-docx object model.
+
+    Yields one line per non-empty paragraph in document order, including paragraphs inside
+    text boxes, and one " | "-joined line per table row. mc:Fallback branches are skipped because
+    they duplicate the text of the mc:Choice branch they belong to.
+    """
+    paragraphs = []  # text fragments of each open w:p (text boxes nest paragraphs)
+    cells = []       # paragraph texts of each open w:tc
+    rows = []        # cell texts of each open w:tr
+    fallback_depth = 0
+
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as stream:
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            tag = elem.tag
+            if tag == MC_FALLBACK:
+                fallback_depth += 1 if event == "start" else -1
+                elem.clear()
+                continue
+            if fallback_depth:
+                if event == "end":
+                    elem.clear()
+                continue
+
+            if event == "start":
+                if tag == W + "p":
+                    paragraphs.append([])
+                elif tag == W + "tc":
+                    cells.append([])
+                elif tag == W + "tr":
+                    rows.append([])
+                continue
+
+            if tag == W + "t":
+                if paragraphs:
+                    paragraphs[-1].append(elem.text or "")
+            elif tag == W + "tab":
+                if paragraphs:
+                    paragraphs[-1].append("\t")
+            elif tag in (W + "br", W + "cr"):
+                if paragraphs:
+                    paragraphs[-1].append("\n")
+            elif tag == W + "p":
+                text = "".join(paragraphs.pop()).strip()
+                if text:
+                    if cells:
+                        cells[-1].append(text)
+                    else:
+                        yield text
+            elif tag == W + "tc":
+                text = "\n".join(cells.pop()).strip()
+                if rows and text:
+                    rows[-1].append(text)
+            elif tag == W + "tr":
+                row = rows.pop()
+                if row:
+                    if cells:
+                        cells[-1].append(" | ".join(row))
+                    else:
+                        yield " | ".join(row)
+            elem.clear()
@@ -1,11 +1,85 @@
-from typing import Type
+from typing import Iterable, Iterator, List, Optional, Tuple, Type
 import os
+import threading
 import PyPDF2
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+# Below this many pages the cost of handing work to other processes outweighs the gain
+PARALLEL_MIN_PAGES = 8
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by every PDFReaderTool so workers are started once per process"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != max_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=max_workers)
+            _pool_workers = max_workers
+        return _pool
+
+
+def _extract_pages(file_path: str, pages: List[int]) -> List[str]:
+    """Worker: open the PDF independently and extract a contiguous chunk of pages"""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [pdf_reader.pages[i].extract_text() or "" for i in pages]
+
+
+def parse_page_range(page_range: str, total_pages: int) -> Tuple[List[int], str]:
+    """Turn 'all', '1-5' or '3' into 0-based page indexes and the matching metadata line"""
+    if page_range == "all":
+        return list(range(total_pages)), f"Pages Read: all (1-{total_pages})\n"
+    # Handle page ranges like "1-5" or single pages like "3"
+    if "-" in page_range:
+        start, end = map(int, page_range.split("-"))
+        # Convert to 0-based indexing and ensure within bounds
+        start = max(0, start - 1)
+        end = min(total_pages, end)
+        return list(range(start, end)), f"Pages Read: {page_range} (0-indexed: {start}-{end-1})\n"
+    # Single page
+    page = int(page_range) - 1  # Convert to 0-based indexing
+    if 0 <= page < total_pages:
+        return [page], f"Pages Read: {page_range} (0-indexed: {page})\n"
+    return [], ""
+
+
+def iter_pdf_pages(file_path: str, pages: Optional[Iterable[int]] = None,
+                   max_workers: int = 1, pdf_reader: Optional[PyPDF2.PdfReader] = None) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page_index, text) in page order as soon as each page has been extracted.
+
+    With max_workers > 1 and enough pages, chunks of pages are extracted in parallel
+    across a process pool; otherwise pages are extracted in this process, from pdf_reader
+    when the caller already has the file open.
+    """
+    if pdf_reader is None:
+        with open(file_path, 'rb') as file:
+            yield from iter_pdf_pages(file_path, pages, max_workers, PyPDF2.PdfReader(file))
+        return
+    pages = list(range(len(pdf_reader.pages))) if pages is None else list(pages)
+    if max_workers <= 1 or len(pages) < PARALLEL_MIN_PAGES:
+        for i in pages:
+            yield i, pdf_reader.pages[i].extract_text() or ""
+        return
+
+    # Two chunks per worker keeps workers busy when pages differ in cost
+    chunk_size = max(1, -(-len(pages) // (max_workers * 2)))
+    chunks = [pages[i:i + chunk_size] for i in range(0, len(pages), chunk_size)]
+    pool = _get_pool(max_workers)
+    futures = [pool.submit(_extract_pages, file_path, chunk) for chunk in chunks]
+    for chunk, future in zip(chunks, futures):
+        yield from zip(chunk, future.result())
+
 
 class PDFReaderToolInput(BaseModel):
     """Input schema for PDFReaderTool."""
@@ -24,6 +98,10 @@ class PDFReaderTool(BaseTool):
         "Returns the extracted text content."
     )
     args_schema: Type[BaseModel] = PDFReaderToolInput
+    # Lean output is just the page text, without metadata and per-page diagnostics
+    lean: bool = False
+    # Pages are extracted across a process pool when more than one worker is allowed
+    max_workers: int = 1
 
     def _run(self, file_path: str, page_range: str = "all") -> str:
         """
@@ -34,8 +112,17 @@ class PDFReaderTool(BaseTool):
             page_range: Range of pages to read ('all', '1-5', '3', etc.)
 
         Returns:
-            str: Extracted text from the PDF
+            str: Extracted text from the PDF, or an error message for the agent
         """
+        try:
+            return self.read(file_path, page_range)
+        except FileNotFoundError:
+            return f"Error: File not found at {file_path}"
+        except Exception as e:
+            return f"Error reading PDF: {str(e)}"
+
+    def read(self, file_path: str, page_range: str = "all") -> str:
+        """Like _run, but raises on a missing or unreadable file instead of returning the error as text"""
         # Ensure the file exists
         if not os.path.isfile(file_path):
             # Try to find the file in the attachments directory
@@ -43,80 +130,63 @@ class PDFReaderTool(BaseTool):
             if os.path.isfile(attachment_path):
                 file_path = attachment_path
             else:
-                return f"Error: File not found at {file_path}"
-
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                total_pages = len(pdf_reader.pages)
-
-                # Gather metadata
-                metadata = f"PDF: {os.path.basename(file_path)}\n"
-                metadata += f"Total Pages: {total_pages}\n"
-
-                # Parse page range
-                pages_to_read = []
-                if page_range == "all":
-                    pages_to_read = range(total_pages)
-                    metadata += f"Pages Read: all (1-{total_pages})\n"
-                else:
-                    # Handle page ranges like "1-5" or single pages like "3"
-                    if "-" in page_range:
-                        start, end = map(int, page_range.split("-"))
-                        # Convert to 0-based indexing and ensure within bounds
-                        start = max(0, start - 1)
-                        end = min(total_pages, end)
-                        pages_to_read = range(start, end)
-                        metadata += f"Pages Read: {page_range} (0-indexed: {start}-{end-1})\n"
-                    else:
-                        # Single page
-                        page = int(page_range) - 1  # Convert to 0-based indexing
-                        if 0 <= page < total_pages:
-                            pages_to_read = [page]
-                            metadata += f"Pages Read: {page_range} (0-indexed: {page})\n"
-
-                # Add PDF document information if available
-                if pdf_reader.metadata:
-                    metadata += "\nDocument Information:\n"
-                    for key, value in pdf_reader.metadata.items():
-                        if value and str(value).strip():
-                            metadata += f"- {key}: {value}\n"
-
-                metadata += "\n--- Content Start ---\n\n"
-
-                # Extract text
-                all_text = ""
-                for i in pages_to_read:
+                raise FileNotFoundError(f"File not found at {file_path}")
+
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            total_pages = len(pdf_reader.pages)
+            pages_to_read, pages_read = parse_page_range(page_range, total_pages)
+
+            if self.lean:
+                # Pages are separated by a form feed, the conventional page break character
+                return "\n\f\n".join(
+                    page_text.strip()
+                    for _, page_text in iter_pdf_pages(file_path, pages_to_read, self.max_workers, pdf_reader)
+                    if page_text.strip()
+                )
+
+            # Gather metadata
+            metadata = f"PDF: {os.path.basename(file_path)}\n"
+            metadata += f"Total Pages: {total_pages}\n"
+            metadata += pages_read
+
+            # Add PDF document information if available
+            if pdf_reader.metadata:
+                metadata += "\nDocument Information:\n"
+                for key, value in pdf_reader.metadata.items():
+                    if value and str(value).strip():
+                        metadata += f"- {key}: {value}\n"
+
+            metadata += "\n--- Content Start ---\n\n"
+
+            # Extract text, collecting the parts so the output is joined in a single allocation
+            parts = [metadata]
+            for i, page_text in iter_pdf_pages(file_path, pages_to_read, self.max_workers, pdf_reader):
+                # Debug info for text extraction
+                page_info = f"--- Page {i+1} ---\n"
+                if not page_text or page_text.strip() == "":
                     page = pdf_reader.pages[i]
-                    page_text = page.extract_text()
-
-                    # Debug info for text extraction
-                    page_info = f"--- Page {i+1} ---\n"
-                    if not page_text or page_text.strip() == "":
-                        page_info += f"[WARNING] No text extracted from page {i+1}. This could be an image-based page or content protection.\n"
-
-                        # Add information about page objects
-                        page_info += f"Page objects: {len(page.get_contents() or [])} content streams\n"
-                        resources = page.get_resources()
-                        if resources:
-                            page_info += f"Resources: {', '.join(resources.keys())}\n"
-
-                        # Report if page has XObjects (often images)
-                        if resources and "/XObject" in resources:
-                            page_info += f"Contains XObjects (possibly images): {len(resources['/XObject'])}\n"
-                    else:
-                        text_preview = page_text[:100].replace('\n', ' ').strip()
-                        if len(page_text) > 100:
-                            text_preview += "..."
-                        page_info += f"Text preview: {text_preview}\n"
-                        page_info += f"Text length: {len(page_text)} characters\n"
-
-                    all_text += page_info + "\n"
-                    if page_text:
-                        all_text += page_text + "\n"
-                    all_text += "\n--- Page Break ---\n\n"
-
-                return metadata + all_text
+                    page_info += f"[WARNING] No text extracted from page {i+1}. This could be an image-based page or content protection.\n"
 
-        except Exception as e:
-            return f"Error reading PDF: {str(e)}"
+                    # Add information about page objects
+                    page_info += f"Page objects: {len(page.get_contents() or [])} content streams\n"
+                    resources = page.get_resources()
+                    if resources:
+                        page_info += f"Resources: {', '.join(resources.keys())}\n"
+
+                    # Report if page has XObjects (often images)
+                    if resources and "/XObject" in resources:
+                        page_info += f"Contains XObjects (possibly images): {len(resources['/XObject'])}\n"
+                else:
+                    text_preview = page_text[:100].replace('\n', ' ').strip()
+                    if len(page_text) > 100:
+                        text_preview += "..."
+                    page_info += f"Text preview: {text_preview}\n"
+                    page_info += f"Text length: {len(page_text)} characters\n"
+
+                parts.append(page_info + "\n")
+                if page_text:
+                    parts.append(page_text + "\n")
+                parts.append("\n--- Page Break ---\n\n")
+
+            return "".join(parts)
@@ -19,4 +19,44 @@ class Output_format(BaseModel):
     summary: Optional[str] = None
     work_experience: Dict[str, Any] = {}
     education: Dict[str, Any] = {}
-    certifications: Dict[str, Any] = {}
\ No newline at end of file
+    certifications: Dict[str, Any] = {}
+
+class PackedResult(Output_format):
+    """One element of a packed answer: a resume's Output_format fields under the ID it was sent with."""
+
+    resume_id: str
+
+
+class PackedOutput(BaseModel):
+    """Answer to a packed request covering several resumes."""
+
+    results: List[PackedResult] = []
+
+
+class PrefilledField(BaseModel):
+    """A field value found by the rule-based extractor, with how much it can be trusted."""
+
+    value: str
+    confidence: float = Field(..., ge=0.0, le=1.0)
+
+
+class ExtractionStats(BaseModel):
+    """Latency and token usage of the LLM stage for one resume."""
+
+    resume: str
+    engine: str
+    latency_s: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    llm_calls: int = 0
+
+
+class CompactionResult(BaseModel):
+    """Resume text after prompt compaction, with the estimated token counts before and after."""
+
+    text: str
+    tokens_before: int
+    tokens_after: int
+    sections: List[str] = []
+    truncated: bool = False
@@ -5,99 +5,82 @@ import pandas as pd
 from sklearn.metrics import precision_score, recall_score, f1_score
 from pydantic import BaseModel
 from crewai.flow import Flow, start, listen
+from ph_resume_ext.evaluation import SCORE_COLUMNS, Evaluator, format_report
+from ph_resume_ext.extraction import extract_text
+from ph_resume_ext.field_extractor import HIGH_CONFIDENCE, extract_fields
+from ph_resume_ext.main import PROCESSED_DIR, RESUME_DIR, RESUME_ROOT
+from ph_resume_ext.skills import DEFAULT_TAXONOMY, load_taxonomy
 
 class EvalState(BaseModel):
-    processed_resume_paths: list = []
-    golden_resume_paths: list = []
+    pass
 
 class ResumeEvalFlow(Flow[EvalState]):
-    processed_resume = r"C:\Users\samar\OneDrive\Documents\CrewAI\ph_resume_ext\src\ph_resume_ext\resume\processed"
-    golden_resume = r"C:\Users\samar\OneDrive\Documents\CrewAI\ph_resume_ext\src\ph_resume_ext\resume\Golden_Records"
+    processed_resume = PROCESSED_DIR
+    golden_resume = os.getenv("RESUME_GOLDEN_DIR", os.path.join(RESUME_ROOT, "Golden_Records"))
+    template_resume = RESUME_DIR
+    # A processed directory, or a results.jsonl / results.sqlite output sink
+    predictions = os.getenv("RESUME_EVAL_PREDICTIONS", PROCESSED_DIR)
+    # Only re-score pairs whose prediction or golden record changed since the last run
+    changed_only = os.getenv("RESUME_EVAL_CHANGED_ONLY", "0") == "1"
+    max_workers = int(os.getenv("RESUME_EVAL_WORKERS", str(os.cpu_count() or 1)))
+    # Skills are matched under their canonical names from this taxonomy; empty compares the raw strings
+    skills_taxonomy = os.getenv("RESUME_SKILLS_TAXONOMY", DEFAULT_TAXONOMY)
 
 
     def evaluate_field(self, pred, truth):
         return int(pred.strip().lower() == truth.strip().lower())
 
-    def evaluate_skills(self, pred, truth):
-        pred_set = set([s.lower() for s in pred])
-        truth_set = set([s.lower() for s in truth])
-        tp = len(pred_set & truth_set)
-        fp = len(pred_set - truth_set)
-        fn = len(truth_set - pred_set)
-
-        precision = tp / (tp+fp) if tp+fp else 0
-        recall = tp / (tp+fn) if tp+fn else 0
-        f1 = 2*precision*recall/(precision+recall) if precision+recall else 0
-        return precision, recall, f1
-
-
     @start()
-    def load_processed(self):
-        """Load processed resumes into state"""
-        self.state.processed_resume_paths = [
-            os.path.join(self.processed_resume, f)
-            for f in os.listdir(self.processed_resume)
-            if f.endswith(".json")
-        ]
-        return self.state.processed_resume_paths
-
-    @listen("load_processed")
-    def load_golden(self, _):
-        """Load golden resumes into state"""
-        self.state.golden_resume_paths = [
-            os.path.join(self.golden_resume, f)
-            for f in os.listdir(self.golden_resume)
-            if f.endswith(".json")
-        ]
-        return self.state.golden_resume_paths
+    def evaluate(self):
+        """Evaluate processed vs golden records; Evaluator lists and loads both directories itself"""
+        evaluator = Evaluator(
+            self.predictions,
+            self.golden_resume,
+            state_path=os.path.join(self.processed_resume, ".evaluation_state.sqlite"),
+            max_workers=self.max_workers,
+            taxonomy=load_taxonomy(self.skills_taxonomy),
+        )
+        scores, report = evaluator.run(changed_only=self.changed_only)
+        df = scores[SCORE_COLUMNS]
 
-    @listen("load_golden")
-    def evaluate(self, _):
-        """Evaluate processed vs golden records"""
-        # build golden dict
-        golden_data = {}
-        for gfile in self.state.golden_resume_paths:
-            name = os.path.splitext(os.path.basename(gfile))[0]
-            with open(gfile, "r", encoding="utf-8") as f:
-                golden_data[name] = json.load(f)
+        print("\n📊 Evaluation Results:\n", df)
+        print(format_report(report))
+        print("\nOverall F1 (skills):", df["skills_f1"].mean())
+        print("Overall F1 (skills, exact strings):", df["skills_exact_f1"].mean())
+        output_csv = os.path.join(self.processed_resume, "evaluation_results.csv")
+        df.to_csv(output_csv, index=False, encoding="utf-8")
+        return df
 
+    @listen("evaluate")
+    def evaluate_fast_path(self, _):
+        """Evaluate the rule-based contact extractor alone (no LLM) against golden records"""
+        fields = {"First_Name": "First_Name", "Last_Name": "Last_Name", "email_address": "Email_Address"}
         summary = []
 
-        for pfile in self.state.processed_resume_paths:
-            name = os.path.splitext(os.path.basename(pfile))[0]
-            with open(pfile, "r", encoding="utf-8") as f:
-                pred = json.load(f)
-
-            truth = golden_data.get(name)
-            if not truth:
+        for template in os.listdir(self.template_resume):
+            name, format_type = os.path.splitext(template)
+            golden_file = os.path.join(self.golden_resume, name + ".json")
+            if format_type.lower() not in (".pdf", ".docx") or not os.path.exists(golden_file):
                 continue
-            
-            def get_field(d, *names):
-                for name in names:
-                    for k in d.keys():
-                        if k.lower() == name.lower():
-                            return d[k]
-                return ""
-
-            name_acc = self.evaluate_field(get_field(pred, "First_Name"), get_field(truth, "First_Name"))
-            lname_acc = self.evaluate_field(get_field(pred, "Last_Name"), get_field(truth, "Last_Name"))
-            email_acc = self.evaluate_field(get_field(pred, "Email_Address", "email_address"), get_field(truth, "Email_Address", "email_address"))
-            p, r, f1 = self.evaluate_skills(get_field(pred, "Skills", "skills", []), get_field(truth, "Skills", "skills", []))
-
-            summary.append({
-                "resume": name,
-                "first_name_acc": name_acc,
-                "last_name_acc": lname_acc,
-                "email_acc": email_acc,
-                "skills_precision": p,
-                "skills_recall": r,
-                "skills_f1": f1
-            })
+            with open(golden_file, "r", encoding="utf-8") as f:
+                truth = json.load(f)
+
+            found = extract_fields(extract_text(os.path.join(self.template_resume, template)))
+            row = {"resume": name}
+            for field, golden_field in fields.items():
+                hit = found.get(field)
+                confident = hit is not None and hit.confidence >= HIGH_CONFIDENCE
+                row[f"{field}_filled"] = int(confident)
+                row[f"{field}_acc"] = self.evaluate_field(hit.value, truth.get(golden_field, "")) if confident else 0
+            summary.append(row)
 
         df = pd.DataFrame(summary)
-        print("\n📊 Evaluation Results:\n", df)
-        print("\nOverall F1 (skills):", df["skills_f1"].mean())
-        output_csv = os.path.join(self.processed_resume, "evaluation_results.csv")
+        print("\n⚡ Fast-path Results:\n", df)
+        for field in fields:
+            filled = df[f"{field}_filled"].sum()
+            precision = df[f"{field}_acc"].sum() / filled if filled else 0
+            print(f"{field}: filled {filled}/{len(df)} without the LLM, precision {precision:.2f}")
+        output_csv = os.path.join(self.processed_resume, "fast_path_results.csv")
         df.to_csv(output_csv, index=False, encoding="utf-8")
         return df
 
@@ -0,0 +1,69 @@
+import json
+
+from ph_resume_ext import cache as cache_module
+from ph_resume_ext.cache import ExtractionCache, config_version
+
+
+def output(name, padding=0):
+    return {"status": "Success", "First_Name": name, "summary": "x" * padding}
+
+
+def size_of(entry):
+    return len(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+
+def test_miss_then_hit(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite"), version="v1")
+    assert cache.get("a") is None
+    assert cache.put("a", output("Ada"))
+    assert cache.get("a") == output("Ada")
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+
+def test_invalid_output_is_not_cached(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite"), version="v1")
+    assert not cache.put("a", {"skills": "not a list"})
+    assert cache.get("a") is None
+    assert cache.total_bytes == 0
+    cache.close()
+
+
+def test_eviction_at_size_cap_drops_least_recently_used(tmp_path):
+    entry = output("Ada", padding=100)
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite"), max_bytes=3 * size_of(entry), version="v1")
+    for key in "abc":
+        cache.put(key, output("Ada", padding=100))
+    assert cache.total_bytes == 3 * size_of(entry)
+    cache.get("a")  # a is now more recently used than b
+    cache.put("d", output("Ada", padding=100))
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in "acd")
+    assert cache.total_bytes == 3 * size_of(entry) <= cache.max_bytes
+    cache.close()
+
+
+def test_running_total_follows_overwrites_and_reopening(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ExtractionCache(path, version="v1")
+    cache.put("a", output("Ada", padding=10))
+    cache.put("a", output("Ada", padding=50))
+    cache.put("b", output("Bob"))
+    expected = size_of(output("Ada", padding=50)) + size_of(output("Bob"))
+    assert cache.total_bytes == expected
+    cache.close()
+    cache = ExtractionCache(path, version="v1")
+    assert cache.total_bytes == expected
+    cache.close()
+
+
+def test_config_version_changes_with_engine_models_budget_and_prompts(monkeypatch):
+    base = config_version("taxonomy", engine="crew", models=["fake-model"])
+    assert config_version("taxonomy", engine="crew", models=["fake-model"]) == base
+    assert config_version("taxonomy", engine="direct", models=["fake-model"]) != base
+    assert config_version("taxonomy", engine="crew", models=["fake-lite", "fake-model"]) != base
+    direct = config_version("taxonomy", engine="direct", models=["fake-model"], token_budget=3000)
+    assert config_version("taxonomy", engine="direct", models=["fake-model"], token_budget=1500) != direct
+    assert config_version("taxonomy", engine="direct", models=["fake-model"], token_budget=3000, packing=True) != direct
+    monkeypatch.setattr(cache_module, "SYSTEM_PROMPT", cache_module.SYSTEM_PROMPT + " Be brief.")
+    assert config_version("taxonomy", engine="direct", models=["fake-model"], token_budget=3000) != direct
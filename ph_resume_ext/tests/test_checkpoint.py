@@ -0,0 +1,106 @@
+import json
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from ph_resume_ext.main import RESUME_DIR
+from ph_resume_ext.sinks import read_jsonl
+
+TEMPLATES = sorted(name for name in os.listdir(RESUME_DIR) if name.endswith((".pdf", ".docx")))
+COPIES = 4
+
+# Runs the flow and, when KILL_AFTER is set, dies like a killed process when it is about to write one more output
+RUN_FLOW = """
+import os
+from ph_resume_ext.main import ResumeFlow
+
+kill_after = int(os.environ.get("KILL_AFTER", "0"))
+write_output = ResumeFlow.write_output
+written = 0
+
+def dying_write_output(self, *args):
+    global written
+    if kill_after and written == kill_after:
+        os._exit(9)
+    write_output(self, *args)
+    written += 1
+
+ResumeFlow.write_output = dying_write_output
+ResumeFlow().kickoff()
+"""
+
+
+def run_flow(tmp_path, sink, kill_after=0):
+    env = dict(
+        os.environ,
+        RESUME_INPUT_DIR=str(tmp_path / "inbox"),
+        RESUME_OUTPUT_DIR=str(tmp_path / "processed"),
+        RESUME_INCREMENTAL="1",
+        RESUME_CACHE="0",
+        RESUME_MAX_WORKERS="1",
+        RESUME_OUTPUT_SINK=sink,
+        RESUME_SINK_BATCH_SIZE="4",
+        # Every template has a phone number, so no resume needs the LLM, which is never reachable here
+        RESUME_REQUIRED_FIELDS="phone_number",
+        GEMINI_MODEL="fake-model",
+        GEMINI_API_KEY="fake",
+        LLM_PROVIDER="openai",
+        LLM_BASE_URL="http://127.0.0.1:9",
+        OTEL_SDK_DISABLED="true",
+        KILL_AFTER=str(kill_after),
+    )
+    result = subprocess.run([sys.executable, "-c", RUN_FLOW], env=env, capture_output=True, text=True, timeout=300)
+    queued = re.search(r"(\d+) new, changed or unfinished resumes to process", result.stdout)
+    assert queued, result.stdout + result.stderr
+    return result.returncode, int(queued.group(1))
+
+
+def done(tmp_path):
+    with sqlite3.connect(tmp_path / "processed" / ".manifest.sqlite") as conn:
+        return {row[0] for row in conn.execute("SELECT path FROM files WHERE status = 'done'")}
+
+
+@pytest.fixture
+def inbox(tmp_path):
+    os.makedirs(tmp_path / "inbox")
+    for copy in range(COPIES):
+        for template in TEMPLATES:
+            shutil.copy(os.path.join(RESUME_DIR, template), tmp_path / "inbox" / f"{copy}-{template}")
+    return COPIES * len(TEMPLATES)
+
+
+def test_killed_json_run_only_reprocesses_unwritten_resumes(tmp_path, inbox):
+    returncode, queued = run_flow(tmp_path, "json", kill_after=7)
+    assert (returncode, queued) == (9, inbox)
+    finished = done(tmp_path)
+    # Each file was marked done as soon as it was written
+    assert len(finished) == 7
+    for name in finished:
+        with open(tmp_path / "processed" / (os.path.splitext(name)[0] + ".json"), encoding="utf-8") as f:
+            assert json.load(f)["status"] == "Success"
+
+    returncode, queued = run_flow(tmp_path, "json")
+    assert (returncode, queued) == (0, inbox - 7)
+    assert len(done(tmp_path)) == inbox
+
+
+def test_killed_jsonl_run_only_reprocesses_unflushed_resumes(tmp_path, inbox):
+    # Batches of 4: the first 8 outputs were flushed, the 9th and 10th were still buffered
+    returncode, queued = run_flow(tmp_path, "jsonl", kill_after=10)
+    assert (returncode, queued) == (9, inbox)
+    finished = done(tmp_path)
+    assert len(finished) == 8
+    flushed = [name for name, _ in read_jsonl(str(tmp_path / "processed" / "results.jsonl"))]
+    assert sorted(flushed) == sorted(os.path.splitext(name)[0] for name in finished)
+
+    returncode, queued = run_flow(tmp_path, "jsonl")
+    assert (returncode, queued) == (0, inbox - 8)
+    assert len(done(tmp_path)) == inbox
+    records = [name for name, _ in read_jsonl(str(tmp_path / "processed" / "results.jsonl"))]
+    # Nothing was written twice
+    assert sorted(records) == sorted(os.path.splitext(name)[0] for name in os.listdir(tmp_path / "inbox"))
@@ -0,0 +1,44 @@
+import os
+import random
+
+import pytest
+
+from ph_resume_ext.compaction import compact, estimate_tokens
+from ph_resume_ext.extraction import extract_text
+from ph_resume_ext.main import RESUME_DIR
+
+TEMPLATES = sorted(name for name in os.listdir(RESUME_DIR) if name.endswith((".pdf", ".docx")))
+
+
+@pytest.mark.parametrize("template", TEMPLATES)
+@pytest.mark.parametrize("budget", [0, 50, 200, 3000])
+def test_output_never_costs_more_tokens_than_input(template, budget):
+    text = extract_text(os.path.join(RESUME_DIR, template))
+    result = compact(text, budget, ["skills", "work_experience"])
+    assert result.tokens_before == estimate_tokens(text)
+    assert result.tokens_after == estimate_tokens(result.text) <= result.tokens_before
+    if budget:
+        assert result.tokens_after <= budget
+
+
+def test_random_line_soup_never_grows():
+    rng = random.Random(0)
+    words = ["Skills", "Education", "Summary", "Python", "--- Page 2 ---", "Page 1 of 2", "", "Experience", "a"]
+    for _ in range(200):
+        text = "\n".join(" ".join(rng.choices(words, k=rng.randint(1, 3))) for _ in range(rng.randint(1, 30)))
+        assert compact(text).tokens_after <= estimate_tokens(text)
+
+
+def test_one_line_sections_are_kept():
+    text = "Jane Doe, jane@example.com\nSummary\nData scientist with eight years of experience\nSkills\nPython\nSQL"
+    result = compact(text)
+    assert result.text == text
+    assert result.sections == ["contact", "summary", "skills"]
+
+
+def test_heading_without_any_content_that_fits_is_dropped():
+    text = "Jane Doe\nExperience\n" + "Led a team of five engineers building pipelines " * 20 + "\nSkills\nPython"
+    result = compact(text, token_budget=10, missing_fields=["skills"])
+    assert result.truncated
+    assert "Experience" not in result.text
+    assert result.text == "Jane Doe\nSkills\nPython"
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from ph_resume_ext.evaluation import field_metrics, score
+from ph_resume_ext.skills import SkillTaxonomy
+
+
+def frame(skills):
+    return pd.DataFrame({"first_name": ["Ada"], "last_name": ["Lovelace"], "email_address": ["ada@example.com"],
+                         "skills": [skills]}, index=pd.Index(["ada"], name="resume"))
+
+
+def test_exact_string_scores_are_reported_next_to_alias_aware_ones():
+    taxonomy = SkillTaxonomy({"AWS": ["Amazon Web Services"], "Python": [], "SQL": []})
+    scores = score(frame(["Amazon Web Services", "python", "Excel"]), frame(["AWS", "Python", "SQL"]), taxonomy)
+    row = scores.iloc[0]
+    assert (row["skills_tp"], row["skills_exact_tp"]) == (2, 1)
+    assert row["skills_f1"] == 2 / 3 and row["skills_exact_f1"] == 1 / 3
+    metrics = field_metrics(scores)
+    assert metrics["skills_exact_micro_f1"] == 1 / 3
+
+
+def test_without_a_taxonomy_both_scores_agree():
+    scores = score(frame(["AWS", "Excel"]), frame(["aws"]))
+    assert scores.iloc[0]["skills_f1"] == scores.iloc[0]["skills_exact_f1"] == 2 / 3
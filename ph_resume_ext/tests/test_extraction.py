@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+from ph_resume_ext.extraction import extract_text
+from ph_resume_ext.main import RESUME_DIR
+from ph_resume_ext.tools import pdf_reader_tool
+from ph_resume_ext.tools.pdf_reader_tool import PDFReaderTool
+
+PDF = os.path.join(RESUME_DIR, "senior-data-scientist-resume-example.pdf")
+
+
+def test_missing_or_broken_files_raise_instead_of_returning_error_text(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        extract_text(str(tmp_path / "missing.pdf"))
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    with pytest.raises(pdf_reader_tool.PyPDF2.errors.PdfReadError):
+        extract_text(str(broken))
+    # The crew's tool still answers the agent with a message
+    assert PDFReaderTool()._run(str(tmp_path / "missing.pdf")).startswith("Error: File not found")
+
+
+def test_lean_mode_parses_the_pdf_once(monkeypatch):
+    opened = []
+    reader = pdf_reader_tool.PyPDF2.PdfReader
+
+    def counting_reader(*args, **kwargs):
+        opened.append(args)
+        return reader(*args, **kwargs)
+
+    monkeypatch.setattr(pdf_reader_tool.PyPDF2, "PdfReader", counting_reader)
+    assert extract_text(PDF).strip()
+    assert len(opened) == 1
@@ -0,0 +1,62 @@
+import os
+
+from ph_resume_ext.main import RESUME_DIR, ResumeFlow
+from ph_resume_ext.type import Output_format
+
+# Its name and email address are both found with high confidence
+TEMPLATE = "elegant-ms-word-resume-template.docx"
+
+
+def flow(**state):
+    resume_flow = ResumeFlow()
+    resume_flow.state.required_fields = ["First_Name", "Last_Name", "email_address"]
+    for field, value in state.items():
+        setattr(resume_flow.state, field, value)
+    return resume_flow
+
+
+def test_the_llm_is_only_skipped_when_required_fields_are_configured(monkeypatch):
+    monkeypatch.delenv("RESUME_REQUIRED_FIELDS", raising=False)
+    resume_flow = ResumeFlow()
+    assert resume_flow.state.required_fields == []
+    calls = []
+    resume_flow.run_llm = lambda *args, **kwargs: calls.append(args) or {"status": "Success"}
+    resume_flow.extract_resume(TEMPLATE, os.path.join(RESUME_DIR, TEMPLATE))
+    assert len(calls) == 1
+    monkeypatch.setenv("RESUME_REQUIRED_FIELDS", "First_Name,Last_Name,email_address")
+    assert ResumeFlow().state.required_fields == ["First_Name", "Last_Name", "email_address"]
+
+
+def test_skip_path_writes_the_full_schema():
+    resume_flow = flow()
+    output = resume_flow.extract_resume(TEMPLATE, os.path.join(RESUME_DIR, TEMPLATE))
+    assert resume_flow.pipeline is None  # no LLM was set up
+    assert set(output) == set(Output_format.model_fields)
+    assert output["status"] == "Success"
+    assert (output["First_Name"], output["Last_Name"]) == ("Octavio", "Silva")
+    assert output["email_address"] == "osilva123@email.com"
+    assert output["location"] is None and output["summary"] is None
+
+
+def test_skills_from_the_taxonomy_fill_a_required_skills_field():
+    from ph_resume_ext.extraction import extract_text
+    from ph_resume_ext.skills import load_taxonomy
+
+    resume_flow = flow(required_fields=["First_Name", "Last_Name", "email_address", "skills"])
+    resume_flow.taxonomy = load_taxonomy()
+    output = resume_flow.extract_resume(TEMPLATE, os.path.join(RESUME_DIR, TEMPLATE))
+    assert resume_flow.pipeline is None
+    expected = resume_flow.taxonomy.find(extract_text(os.path.join(RESUME_DIR, TEMPLATE)))
+    assert expected and output["skills"] == expected
+
+
+def test_doc_files_are_converted_to_pdf(monkeypatch):
+    from ph_resume_ext import main
+
+    pdf = os.path.join(RESUME_DIR, "senior-data-scientist-resume-example.pdf")
+    converted = []
+    monkeypatch.setattr(main, "convert_to_pdf", lambda path: converted.append(path) or pdf)
+    resume_flow = flow()
+    output = resume_flow.extract_resume("resume.doc", os.path.join(RESUME_DIR, "resume.doc"))
+    assert converted == [os.path.join(RESUME_DIR, "resume.doc")]
+    assert output["status"] == "Success" and output["First_Name"]
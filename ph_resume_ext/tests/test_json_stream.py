@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from ph_resume_ext.json_stream import JSONStreamParser, parse_json, repair_json
+
+
+def test_valid_object_is_not_repaired():
+    assert parse_json('{"a": 1, "b": [1, 2]}') == ({"a": 1, "b": [1, 2]}, False)
+
+
+def test_fences_and_prose_are_skipped():
+    answer = 'Final Answer:\n```json\n{"First_Name": "Ada", "note": "a } in a string"}\n```\nHope this helps!'
+    assert parse_json(answer) == ({"First_Name": "Ada", "note": "a } in a string"}, False)
+
+
+@pytest.mark.parametrize("malformed, expected", [
+    ("{'First_Name': 'Ada', 'skills': ['Python',]}", {"First_Name": "Ada", "skills": ["Python"]}),
+    ('{First_Name: "Ada", status: None, ok: True}', {"First_Name": "Ada", "status": None, "ok": True}),
+    ('{"a": 1, // trailing comment\n "b": /* inline */ 2,}', {"a": 1, "b": 2}),
+    ('{“name”: “Ada”}', {"name": "Ada"}),
+    ('{"summary": "line one\nline two"}', {"summary": "line one\nline two"}),
+    ('{"score": NaN}', {"score": None}),
+    ("{'salary': 1e5, 'rate': -2.5E-3, years: +3, gpa: .5, rank: 1.}",
+     {"salary": 100000.0, "rate": -0.0025, "years": 3, "gpa": 0.5, "rank": 1.0}),
+])
+def test_common_mistakes_are_repaired(malformed, expected):
+    assert parse_json(malformed) == (expected, True)
+
+
+@pytest.mark.parametrize("truncated, expected", [
+    ('{"First_Name": "Ada", "skills": ["Python", "SQ', {"First_Name": "Ada", "skills": ["Python", "SQ"]}),
+    ('{"First_Name": "Ada", "Last_', {"First_Name": "Ada"}),
+    ('{"First_Name": "Ada", "Last_Name":', {"First_Name": "Ada", "Last_Name": None}),
+    ('{"education": {"degree": "BSc",', {"education": {"degree": "BSc"}}),
+])
+def test_truncated_output_is_closed(truncated, expected):
+    assert parse_json(truncated) == (expected, True)
+
+
+@pytest.mark.parametrize("answer", ["", "Sorry, I cannot help with that.", "[1, 2, 3]", None])
+def test_no_object_raises_value_error(answer):
+    with pytest.raises(ValueError):
+        parse_json(answer)
+
+
+def test_repaired_text_is_valid_json():
+    assert json.loads(repair_json("{'a': {'b': [True, False, undefined")) == {"a": {"b": [True, False, None]}}
+
+
+def test_stream_parser_completes_on_the_closing_brace_across_chunks():
+    parser = JSONStreamParser()
+    chunks = ['```json\n{"a": "x\\', '"}", "b": [{"c": 1}', "]}", "\n``` trailing prose"]
+    assert [parser.feed(chunk) for chunk in chunks] == [False, False, True, True]
+    assert json.loads(parser.text) == {"a": 'x"}', "b": [{"c": 1}]}
+    assert parser.raw == "".join(chunks)
@@ -0,0 +1,181 @@
+import time
+
+import pytest
+
+from ph_resume_ext.llm_scheduler import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, LLMScheduler,
+                                         TokenBucket, parse_prices, retriable, retry_after)
+
+USAGE = {"prompt_tokens": 10, "completion_tokens": 5}
+
+
+class APIError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.litellm_response_headers = headers or {}
+
+
+def scheduler(**options):
+    options = dict(dict(max_retries=2, backoff_s=0.001, backoff_max_s=0.001, breaker_failures=3,
+                        breaker_reset_s=0.05), **options)
+    return LLMScheduler(options.pop("models", ["cheap", "strong"]), **options)
+
+
+def failing(*errors):
+    """A request that raises each error in turn, then answers"""
+    calls = []
+
+    def request():
+        calls.append(time.monotonic())
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "answer", dict(USAGE)
+    return request, calls
+
+
+def test_token_bucket_allows_a_burst_then_spaces_requests():
+    bucket = TokenBucket(per_minute=600)  # 10 a second, a burst of 10
+    assert [bucket.reserve(1) for _ in range(10)] == [0.0] * 10
+    assert bucket.reserve(1) == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve(1) == pytest.approx(0.2, abs=0.01)
+    assert TokenBucket(per_minute=0).reserve(1000) == 0.0
+
+
+def test_token_bucket_adjust_returns_units():
+    bucket = TokenBucket(per_minute=60)
+    bucket.reserve(1)
+    bucket.adjust(-1)
+    assert bucket.reserve(1) == 0.0
+
+
+def test_breaker_opens_after_consecutive_failures_and_recovers_after_a_probe():
+    breaker = CircuitBreaker(failures=2, reset_s=0.05)
+    breaker.failure()
+    breaker.success()
+    breaker.failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.failure()
+    assert breaker.state == OPEN and not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # only one probe at a time
+    breaker.failure()
+    assert breaker.state == OPEN and not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_retriable_errors():
+    assert retriable(APIError(503)) and retriable(APIError(429)) and retriable(TimeoutError())
+    assert not retriable(APIError(400)) and not retriable(ValueError())
+    assert retry_after(APIError(429, {"retry-after": "2"})) == 2.0
+    assert retry_after(APIError(429, {"retry-after": "soon"})) == 0.0
+
+
+def test_call_retries_retriable_errors():
+    request, calls = failing(APIError(503), APIError(500))
+    assert scheduler().call("cheap", request, 10) == ("answer", USAGE)
+    assert len(calls) == 3
+
+
+def test_call_raises_after_the_last_retry_and_does_not_retry_client_errors():
+    request, calls = failing(*[APIError(503)] * 3)
+    with pytest.raises(APIError):
+        scheduler().call("cheap", request)
+    assert len(calls) == 3
+    request, calls = failing(APIError(400))
+    with pytest.raises(APIError):
+        scheduler().call("cheap", request)
+    assert len(calls) == 1
+
+
+def test_call_waits_for_retry_after():
+    request, calls = failing(APIError(429, {"retry-after": "0.2"}))
+    scheduler().call("cheap", request)
+    assert calls[1] - calls[0] >= 0.2
+
+
+def test_breaker_opens_on_server_errors_but_not_on_rate_limits():
+    llm = scheduler(max_retries=0)
+    for _ in range(5):
+        with pytest.raises(APIError):
+            llm.call("cheap", failing(APIError(429))[0])
+    assert llm.route("cheap").breaker.state == CLOSED
+    for _ in range(3):
+        with pytest.raises(APIError):
+            llm.call("cheap", failing(APIError(503))[0])
+    request, calls = failing()
+    with pytest.raises(CircuitOpenError):
+        llm.call("cheap", request)
+    assert calls == []
+    # Other models have breakers of their own
+    assert llm.call("strong", request)[0] == "answer"
+    time.sleep(0.06)
+    assert llm.call("cheap", request)[0] == "answer"
+    assert llm.route("cheap").breaker.state == CLOSED
+
+
+def test_cascade_escalates_on_invalid_answers_and_sums_usage():
+    answers = {"cheap": "not json", "strong": "{}"}
+    answer, usage, model = scheduler().cascade(lambda model: (answers[model], dict(USAGE)), lambda raw: raw == "{}")
+    assert (answer, model) == ("{}", "strong")
+    assert usage == {"prompt_tokens": 20, "completion_tokens": 10}
+
+
+def test_cascade_escalates_on_failure_and_raises_when_every_model_fails():
+    def run(model):
+        if model == "cheap":
+            raise CircuitOpenError("open")
+        return "{}", dict(USAGE)
+    assert scheduler().cascade(run, bool)[2] == "strong"
+
+    def broken(model):
+        raise APIError(503)
+    with pytest.raises(APIError):
+        scheduler().cascade(broken, bool)
+
+
+def test_cascade_returns_the_last_answer_when_none_validates():
+    assert scheduler().cascade(lambda model: (model, {}), lambda raw: False)[:3:2] == ("strong", "strong")
+
+
+def test_cost_uses_configured_prices():
+    llm = scheduler(prices=parse_prices("cheap=0.1/0.4, strong=3"))
+    assert llm.cost("cheap", 1_000_000, 1_000_000) == pytest.approx(0.5)
+    assert llm.cost("strong", 1_000_000, 0) == pytest.approx(3.0)
+
+
+def test_report_lists_each_model():
+    llm = scheduler(models=["report-model"])
+    llm.call("report-model", failing(APIError(503))[0], 10)
+    row = next(line for line in llm.report().splitlines() if line.startswith("report-model "))
+    # A failed attempt, then a successful retry
+    assert row.split()[1:4] == ["2", "50.0%", "1"]
+
+
+@pytest.mark.parametrize("raw", [
+    "{}",
+    '{"status": "Success"}',
+    '{"status": "Fail", "First_Name": "Ada", "Last_Name": "Lovelace"}',
+    '{"status": "Success", "First_Name": "Ada", "skills": ["Python"]}',
+    '{"name": "Ada Lovelace"}',
+    "[1, 2]",
+])
+def test_schema_valid_answers_without_content_are_not_accepted(raw):
+    from ph_resume_ext.main import valid_output
+
+    assert not valid_output(raw, ["First_Name", "Last_Name"])
+
+
+def test_cascade_escalates_past_an_empty_answer():
+    from ph_resume_ext.main import valid_output
+
+    answers = {"cheap": '{"status": "Success"}',
+               "strong": '{"status": "Success", "First_Name": "Ada", "Last_Name": "Lovelace"}'}
+    answer, _, model = scheduler().cascade(lambda model: (answers[model], {}),
+                                           lambda raw: valid_output(raw, ["First_Name", "Last_Name"]))
+    assert model == "strong"
+    # Fields the fast path already filled are not required of the LLM
+    assert valid_output('{"skills": ["Python"]}', [])
@@ -0,0 +1,96 @@
+import json
+import threading
+
+from ph_resume_ext.direct_extractor import DirectExtractor
+from ph_resume_ext.packing import RequestPacker, parse_packed, split_usage
+
+USAGE = {"prompt_tokens": 900, "completion_tokens": 300}
+
+
+class CannedExtractor(DirectExtractor):
+    """Answers packed requests without an LLM: a resume whose text says "drop" is left out, "bad" is invalid"""
+
+    def __init__(self, fail=False):
+        super().__init__(model="fake-model")
+        self.fail = fail
+        self.packs = []
+
+    def extract_packed(self, prompts):
+        self.packs.append(sorted(prompts))
+        if self.fail:
+            raise ConnectionError("connection reset")
+        results = []
+        for resume_id, prompt in prompts.items():
+            name = prompt.rsplit("\n", 1)[-1]
+            if name == "drop":
+                continue
+            skills = "not a list" if name == "bad" else ["Python"]
+            results.append({"resume_id": resume_id, "status": "Success", "First_Name": name, "skills": skills})
+        return json.dumps({"results": results}), dict(USAGE)
+
+
+def extract_all(packer, names):
+    results = {}
+
+    def run(name):
+        results[name] = packer.extract(name)
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+def test_missing_and_invalid_elements_are_retried_alone():
+    packer = RequestPacker(CannedExtractor(), max_resumes=4, max_wait_s=5)
+    results = extract_all(packer, ["Ada", "drop", "bad", "Bob"])
+    assert results["drop"] is None and results["bad"] is None
+    assert results["Ada"][0]["First_Name"] == "Ada" and results["Bob"][0]["First_Name"] == "Bob"
+    assert (packer.requests, packer.packed, packer.answered, packer.retried) == (1, 4, 2, 2)
+
+
+def test_token_usage_is_split_without_losing_any():
+    packer = RequestPacker(CannedExtractor(), max_resumes=3, max_wait_s=5)
+    results = extract_all(packer, ["Ada", "Bob", "Cy"])
+    usages = [usage for _, usage in results.values()]
+    assert sum(u["prompt_tokens"] for u in usages) == USAGE["prompt_tokens"]
+    assert sum(u["completion_tokens"] for u in usages) == USAGE["completion_tokens"]
+    assert sum(u["llm_calls"] for u in usages) == 1
+
+
+def test_failed_pack_sends_every_resume_alone():
+    packer = RequestPacker(CannedExtractor(fail=True), max_resumes=2, max_wait_s=5)
+    assert extract_all(packer, ["Ada", "Bob"]) == {"Ada": None, "Bob": None}
+    assert packer.retried == 2
+
+
+def test_resume_left_alone_after_the_wait_is_not_packed():
+    extractor = CannedExtractor()
+    packer = RequestPacker(extractor, max_resumes=4, max_wait_s=0.01)
+    assert packer.extract("Ada") is None
+    assert packer.alone == 1 and extractor.packs == []
+
+
+def test_token_budget_closes_a_pack():
+    extractor = CannedExtractor()
+    packer = RequestPacker(extractor, token_budget=1, max_resumes=8, max_wait_s=5)
+    assert packer.extract("Ada") is None  # over budget on its own, so alone at once
+    assert packer.alone == 1
+
+
+def test_parse_packed_recovers_fenced_and_malformed_answers():
+    answer = '```json\n{"results": [{"resume_id": "R1", "status": "Success", "First_Name": "Ada",},]}\n```'
+    assert parse_packed(answer)["R1"]["First_Name"] == "Ada"
+    assert parse_packed("no JSON here") == {}
+    assert parse_packed('{"results": "nope"}') == {}
+    # A bare array and elements without an ID
+    assert list(parse_packed('[{"resume_id": 2, "status": "Success"}, {"status": "Success"}]')) == ["2"]
+
+
+def test_split_usage_counts_the_request_once():
+    parts = split_usage({"prompt_tokens": 10, "completion_tokens": 5}, [1, 1, 1], [0, 0, 0])
+    assert [p["prompt_tokens"] for p in parts] == [4, 3, 3]
+    assert sum(p["completion_tokens"] for p in parts) == 5
+    assert [p["llm_calls"] for p in parts] == [1, 0, 0]
@@ -0,0 +1,23 @@
+import re
+
+from crewai import LLM
+
+from ph_resume_ext.crews.resume_crew_pr.resume_crew import ResumeCrew
+
+INPUTS = {
+    "file_path": "resume.pdf",
+    "prefilled_fields": '{"email_address": "jane@example.com"}',
+    "missing_fields": "First_Name, Last_Name, skills",
+    "skill_candidates": "Python, Apache Spark, AWS",
+}
+
+
+def test_every_crew_task_renders_and_sees_the_skill_candidates():
+    crew = ResumeCrew(llm=LLM(model="openai/fake-model", api_key="fake")).crew()
+    descriptions = []
+    for task in crew.tasks:
+        task.interpolate_inputs_and_add_conversation_history(INPUTS)
+        descriptions.append(task.description)
+    assert descriptions
+    assert not any(re.search(r"\{\w+\}", description) for description in descriptions)
+    assert any(INPUTS["skill_candidates"] in description for description in descriptions)
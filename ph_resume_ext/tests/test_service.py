@@ -0,0 +1,99 @@
+import asyncio
+import json
+import threading
+import time
+
+from ph_resume_ext.main import ResumeFlow
+from ph_resume_ext.service import ExtractionService
+
+
+class SlowFlow(ResumeFlow):
+    """Takes `delay` seconds per resume without an LLM, and records which uploads were extracted"""
+
+    delay = 0.0
+
+    def prepare(self):
+        self.extracted = []
+        self.release = threading.Event()
+
+    def finish(self):
+        pass
+
+    def extract_tracked(self, resume_name, file_path):
+        self.extracted.append(resume_name)
+        self.release.wait(self.delay)
+        return {"status": "Success", "First_Name": resume_name}
+
+
+async def post(port, path, filename):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"%PDF-1.4 fake"
+    writer.write((f"POST {path}?filename={filename} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def run_service(scenario, **options):
+    async def main():
+        service = ExtractionService(SlowFlow(), host="127.0.0.1", port=0, **options)
+        await service.start()
+        try:
+            return await scenario(service)
+        finally:
+            service.flow.release.set()
+            await service.shutdown()
+    return asyncio.run(main())
+
+
+def test_extract_returns_the_output():
+    async def scenario(service):
+        return await post(service.port, "/extract", "a.pdf")
+
+    status, payload = run_service(scenario, workers=1, queue_size=2, timeout_s=5)
+    assert (status, payload["First_Name"]) == (200, "a.pdf")
+
+
+def test_request_queued_past_its_deadline_gets_504_on_time_and_is_skipped():
+    SlowFlow.delay = 3.0
+
+    async def scenario(service):
+        first = asyncio.create_task(post(service.port, "/extract", "first.pdf"))
+        await asyncio.sleep(0.1)
+        started = time.monotonic()
+        status, payload = await post(service.port, "/extract", "second.pdf")
+        waited = time.monotonic() - started
+        service.flow.release.set()
+        await first
+        # Let the worker reach the expired job
+        await asyncio.wait_for(service._queue.join(), 5)
+        return status, payload, waited, service.flow.extracted
+
+    try:
+        status, payload, waited, extracted = run_service(scenario, workers=1, queue_size=2, timeout_s=0.5)
+    finally:
+        SlowFlow.delay = 0.0
+    assert status == 504
+    assert payload["status"] == "timeout"
+    assert waited < 1.5  # not the 3s the worker stays busy
+    assert extracted == ["first.pdf"]
+
+
+def test_full_queue_answers_429():
+    SlowFlow.delay = 3.0
+
+    async def scenario(service):
+        running = await post(service.port, "/jobs", "running.pdf")
+        await asyncio.sleep(0.1)
+        queued = await post(service.port, "/jobs", "queued.pdf")
+        return running[0], queued[0], await post(service.port, "/jobs", "overflow.pdf")
+
+    try:
+        running, queued, (status, payload) = run_service(scenario, workers=1, queue_size=1, timeout_s=5)
+    finally:
+        SlowFlow.delay = 0.0
+    assert (running, queued, status) == (202, 202, 429)
+    assert "Queue is full" in payload["error"]
@@ -0,0 +1,74 @@
+import json
+import os
+import stat
+
+from ph_resume_ext.sinks import JsonFileSink, JsonlSink, SQLiteSink, read_jsonl
+
+
+def test_torn_line_longer_than_a_chunk_is_cut_at_the_last_newline(tmp_path):
+    path = tmp_path / "results.jsonl"
+    complete = [json.dumps({"resume": f"r{i}", "output": {"status": "Success"}}) + "\n" for i in range(3)]
+    torn = '{"resume": "big", "output": {"summary": "' + "x" * 200000
+    path.write_text("".join(complete) + torn, encoding="utf-8")
+    JsonlSink(str(path), fsync=False).close()
+    assert path.read_text(encoding="utf-8") == "".join(complete)
+
+
+def test_file_of_only_a_torn_line_is_emptied(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text('{"resume": "r0", "out' + "x" * 100, encoding="utf-8")
+    JsonlSink(str(path), fsync=False).close()
+    assert os.path.getsize(path) == 0
+
+
+def test_jsonl_reports_sources_once_flushed(tmp_path):
+    durable = []
+    sink = JsonlSink(str(tmp_path / "results.jsonl"), batch_size=2, fsync=False)
+    sink.on_durable = durable.extend
+    sink.write("a", {"status": "Success"}, "a.pdf")
+    assert durable == []
+    sink.write("b", {"status": "Success"})
+    assert durable == ["a.pdf", "b"]
+    sink.write("c", {"status": "Success"}, "c.docx")
+    sink.close()
+    assert durable == ["a.pdf", "b", "c.docx"]
+    assert [name for name, _ in read_jsonl(str(tmp_path / "results.jsonl"))] == ["a", "b", "c"]
+
+
+def test_sqlite_reports_sources_once_committed(tmp_path):
+    durable = []
+    sink = SQLiteSink(str(tmp_path / "results.sqlite"), batch_size=2)
+    sink.on_durable = durable.extend
+    sink.write("a", {"status": "Success"}, "a.pdf")
+    assert durable == []
+    sink.close()
+    assert durable == ["a.pdf"]
+
+
+def test_json_reports_each_file_as_it_is_replaced(tmp_path):
+    durable = []
+    sink = JsonFileSink(str(tmp_path))
+    sink.on_durable = durable.extend
+    sink.write("a", {"status": "Success"}, "a.pdf")
+    assert durable == ["a.pdf"]
+    assert json.loads((tmp_path / "a.json").read_text(encoding="utf-8")) == {"status": "Success"}
+
+
+def test_json_syncs_the_file_and_its_directory_before_reporting_durable(tmp_path, monkeypatch):
+    events = []
+    real_fsync, real_replace = os.fsync, os.replace
+
+    def fsync(fd):
+        events.append("fsync dir" if stat.S_ISDIR(os.fstat(fd).st_mode) else "fsync file")
+        real_fsync(fd)
+
+    def replace(src, dst):
+        events.append("replace")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    monkeypatch.setattr(os, "replace", replace)
+    sink = JsonFileSink(str(tmp_path))
+    sink.on_durable = lambda sources: events.append("durable")
+    sink.write("a", {"status": "Success"})
+    assert events == ["fsync file", "replace", "fsync dir", "durable"]
@@ -0,0 +1,53 @@
+import pytest
+
+from ph_resume_ext.skills import load_taxonomy
+
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return load_taxonomy()
+
+
+def test_aliases_map_to_canonical_names(taxonomy):
+    assert taxonomy.find("Deployed on Amazon Web Services with Python and SQL") == ["AWS", "Python", "SQL"]
+    assert taxonomy.normalise(["Amazon Web Services (AWS)", "python"]) == ["AWS", "Python"]
+
+
+def test_one_letter_skills(taxonomy):
+    assert taxonomy.find("Languages: C, C++ and R.") == ["C", "C++", "R"]
+    assert taxonomy.find("Wrote embedded C") == ["C"]
+
+
+@pytest.mark.parametrize("text", [
+    "Reported to the C-level executives",
+    "Ran the C-OB process",
+    "Led the Series-C fundraising",
+])
+def test_one_letter_alias_next_to_a_hyphen_is_not_a_skill(taxonomy, text):
+    assert "C" not in taxonomy.find(text)
+
+
+def test_case_sensitive_alias_must_match_as_written(taxonomy):
+    assert "R" not in taxonomy.find("r and go are letters here")
+    assert "Go" in taxonomy.find("Technical Skills\nPython, Go")
+
+
+@pytest.mark.parametrize("text", [
+    "CURRICULUM VITAE / CV",
+    "Spring 2019",
+    "An Epic journey",
+    "Go to market",
+    "Taylor Swift",
+    "Express delivery",
+    "Node manager",
+    "Forecasting revenue",
+    "Collaboration with Segmentation team",
+])
+def test_common_words_are_not_skills_outside_a_skills_section(taxonomy, text):
+    assert taxonomy.find(text) == []
+
+
+def test_common_word_skills_match_under_a_skills_heading(taxonomy):
+    text = "Experience\nShipped the Spring 2019 release\nSkills\nGo, Swift, Spring, Node"
+    assert taxonomy.find(text) == ["Go", "Swift", "Spring Boot", "Node.js"]
+    assert taxonomy.normalise(["Node", "Go"]) == ["Node.js", "Go"]
@@ -0,0 +1,28 @@
+import threading
+
+from ph_resume_ext.telemetry import Telemetry
+
+
+def test_stage_report_reads_a_snapshot_while_stages_are_recorded():
+    telemetry = Telemetry()
+    telemetry.record("llm_call", 0.0, 0.5)
+    telemetry.record("llm_call", 0.0, 1.5)
+    telemetry.record("write_output", 0.0, 0.01)
+    stop = threading.Event()
+
+    def record():
+        while not stop.is_set():
+            telemetry.record("fast_path", 0.0, 0.001)
+
+    writer = threading.Thread(target=record)
+    writer.start()
+    try:
+        for _ in range(50):
+            report = telemetry.stage_report()
+    finally:
+        stop.set()
+        writer.join()
+    rows = {row.split()[0]: row.split()[1:3] for row in report.splitlines()[1:]}
+    assert rows["llm_call"] == ["2", "2.00"]
+    assert rows["write_output"] == ["1", "0.01"]
+    assert "fast_path" in rows